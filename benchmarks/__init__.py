@@ -0,0 +1,5 @@
+"""Microbenchmarks for the server's hot paths. Each module can be run on its own, for
+example:
+
+    python -m benchmarks.telnet_parser
+"""
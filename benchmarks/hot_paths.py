@@ -0,0 +1,538 @@
+"""Times the server's hot paths in-process, against synthetic worlds of a fixed size,
+with no network involved. Each case reports the best time per operation, out of a
+number of runs.
+
+The results are printed as JSON, or saved to a file, so a run can be kept as a
+baseline and later runs compared against it.
+
+    python -m benchmarks.hot_paths --output baseline.json
+    python -m benchmarks.hot_paths --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from dataclasses import dataclass
+from timeit import Timer
+from typing import Any, Callable, Dict, List, Optional
+
+from peewee import SqliteDatabase
+
+from cibo.actions import Action
+from cibo.actions.commands import ACTIONS
+from cibo.actions.commands._processor_ import CommandProcessor
+from cibo.comms._interface_ import CommsInterface
+from cibo.comms.region import Region
+from cibo.comms.room import Room
+from cibo.entities._interface_ import EntityInterface
+from cibo.events.spawn import SpawnEvent
+from cibo.models.client import Client, ClientLoginState
+from cibo.models.data.item import Item
+from cibo.models.data.npc import Npc
+from cibo.models.data.player import Player
+from cibo.models.message import Message, MessageRoute
+from cibo.models.prompt import Prompt
+from cibo.server_config import ServerConfig
+from cibo.telnet import TelnetServer
+from cibo.utils.telnet_parser import TelnetParser
+
+# the world sizes the room and door lookups are timed at. Every other case uses the
+# smallest of them
+SIZES = [10_000, 100_000]
+
+# rooms are laid out in a grid this many rooms wide, grouped into sectors and regions
+GRID_WIDTH = 100
+SECTOR_COUNT = 100
+REGION_COUNT = 10
+
+ITEM_COUNT = 1_000
+NPC_COUNT = 100
+SPAWN_COUNT = 200
+
+# how many clients the messages are fanned out to. Everyone is crowded into the one
+# room for the room messages, and spread out over the world for the region messages
+CLIENT_COUNT = 1_000
+
+# how many lookups are made with each run of a lookup case
+LOOKUP_COUNT = 100
+
+ADJECTIVES = ["rusty", "shiny", "metal", "wooden", "broken", "tiny", "heavy", "old"]
+NOUNS = ["fork", "spoon", "key", "lamp", "coin", "book", "rope", "knife"]
+
+PASTE_INPUT = b"say The quick brown fox jumps over the lazy dog.\r\n" * 80
+IAC_HEAVY_INPUT = (b"\xff\xfb\x1f\xff\xfa\x1f\x00\x50\x00\x18\xff\xf0n\r\n" * 4) * 80
+
+
+@dataclass
+class Case:
+    """A single hot path to be timed."""
+
+    name: str
+    run: Callable[[], Any]
+
+    # how many operations each run makes, so the time can be reported per operation
+    ops: int = 1
+
+    # called before each batch of runs, to undo whatever the runs built up
+    reset: Optional[Callable[[], None]] = None
+
+
+class Noop(Action):
+    """An action that does nothing, so command dispatch can be timed on its own. It's
+    registered after every other action, which makes it the slowest to find.
+    """
+
+    def aliases(self) -> List[str]:
+        return ["noop"]
+
+    def required_args(self) -> List[str]:
+        return []
+
+    def process(
+        self, _client: Client, _command: Optional[str], _args: List[str]
+    ) -> None:
+        pass
+
+
+def write_entities(directory: str, name: str, entities: List[dict]) -> None:
+    """Write the entities to a JSON file, in the same layout as the config files, and
+    point the server at it.
+
+    Args:
+        directory (str): The directory to write to.
+        name (str): The entity type, e.g. "rooms".
+        entities (List[dict]): The entities in raw dict format.
+    """
+
+    path = os.path.join(directory, f"{name}.json")
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({name: entities}, file)
+
+    # the entity files are opened relative to the working directory
+    os.environ[f"{name.upper()}_PATH"] = os.path.relpath(path)
+
+
+def room_exits(id_: int, size: int) -> List[Dict[str, Any]]:
+    """The exits out of a room, to its neighbours in the grid.
+
+    Args:
+        id_ (int): The room ID.
+        size (int): How many rooms there are.
+
+    Returns:
+        List[Dict[str, Any]]: The exits in raw dict format.
+    """
+
+    column = (id_ - 1) % GRID_WIDTH
+    neighbours = {
+        "n": id_ - GRID_WIDTH,
+        "s": id_ + GRID_WIDTH,
+        "e": id_ + 1 if column < GRID_WIDTH - 1 else 0,
+        "w": id_ - 1 if column > 0 else 0,
+    }
+
+    return [
+        {"direction": direction, "id": neighbour}
+        for direction, neighbour in neighbours.items()
+        if 1 <= neighbour <= size
+    ]
+
+
+def build_world(directory: str, size: int) -> EntityInterface:
+    """Build a synthetic world of the given size, with a door between each room and
+    the next.
+
+    Args:
+        directory (str): The directory to write the entity files to.
+        size (int): How many rooms and doors there are.
+
+    Returns:
+        EntityInterface: The world.
+    """
+
+    write_entities(
+        directory,
+        "regions",
+        [
+            {"id": id_, "name": f"Region {id_}", "description": "", "flags": []}
+            for id_ in range(1, REGION_COUNT + 1)
+        ],
+    )
+    write_entities(
+        directory,
+        "sectors",
+        [
+            {
+                "id": id_,
+                "name": f"Sector {id_}",
+                "description": "",
+                "region_id": (id_ - 1) % REGION_COUNT + 1,
+                "flags": [],
+            }
+            for id_ in range(1, SECTOR_COUNT + 1)
+        ],
+    )
+    write_entities(
+        directory,
+        "rooms",
+        [
+            {
+                "id": id_,
+                "name": f"Room {id_}",
+                "description": {"normal": "A featureless, synthetic room."},
+                "exits": room_exits(id_, size),
+                "sector_id": (id_ - 1) % SECTOR_COUNT + 1,
+                "flags": [],
+            }
+            for id_ in range(1, size + 1)
+        ],
+    )
+    write_entities(
+        directory,
+        "doors",
+        [
+            {"name": f"door {id_}", "room_ids": [id_, id_ + 1], "flags": ["closed"]}
+            for id_ in range(1, size)
+        ],
+    )
+    write_entities(
+        directory,
+        "items",
+        [
+            {
+                "id": id_,
+                "name": f"a {ADJECTIVES[id_ % len(ADJECTIVES)]} "
+                f"{NOUNS[id_ // len(ADJECTIVES) % len(NOUNS)]}",
+                "description": {"room": "lies here.", "look": "It's synthetic."},
+                "is_stationary": False,
+            }
+            for id_ in range(1, ITEM_COUNT + 1)
+        ],
+    )
+    write_entities(
+        directory,
+        "npcs",
+        [
+            {
+                "id": id_,
+                "name": f"a synthetic villager {id_}",
+                "description": {"room": "stands here.", "look": "It's synthetic."},
+            }
+            for id_ in range(1, NPC_COUNT + 1)
+        ],
+    )
+    write_entities(
+        directory,
+        "spawns",
+        [
+            {
+                "type": "npc" if id_ % 4 == 0 else "item",
+                "entity_id": id_ % (NPC_COUNT if id_ % 4 == 0 else ITEM_COUNT) + 1,
+                "room_id": id_ % size + 1,
+                "amount": 2,
+            }
+            for id_ in range(1, SPAWN_COUNT + 1)
+        ],
+    )
+
+    return EntityInterface()
+
+
+def create_clients(telnet: TelnetServer, rooms: int) -> List[Client]:
+    """Connect fake clients to the server, logged in and spread out over the rooms.
+    Nothing is ever flushed, so they don't need a real socket.
+
+    Args:
+        telnet (TelnetServer): The server.
+        rooms (int): How many rooms to spread the clients over.
+
+    Returns:
+        List[Client]: The clients.
+    """
+
+    clients = [
+        Client(
+            socket=None,
+            address="127.0.0.1",
+            encoding="utf-8",
+            last_activity=0.0,
+            login_state=ClientLoginState.LOGGED_IN,
+            registration=Player(),
+            player=Player(
+                name=f"bot{number}", current_room_id=number * rooms // CLIENT_COUNT + 1
+            ),
+        )
+        for number in range(CLIENT_COUNT)
+    ]
+
+    telnet.get_connected_clients().extend(clients)
+
+    return clients
+
+
+def create_database() -> None:
+    """Point the data models at a fresh in-memory database."""
+
+    database = SqliteDatabase(":memory:")
+    database.bind([Player, Item, Npc])
+    database.connect()
+    database.create_tables([Player, Item, Npc])
+
+
+def lookup_cases(entities: EntityInterface, size: int) -> List[Case]:
+    """The room and door lookups, against a world of the given size.
+
+    Args:
+        entities (EntityInterface): The world.
+        size (int): How many rooms and doors there are.
+
+    Returns:
+        List[Case]: The cases.
+    """
+
+    # the same IDs every run, spread over the whole world
+    ids = random.Random(size).sample(range(1, size), LOOKUP_COUNT)
+
+    def get_rooms() -> None:
+        for id_ in ids:
+            entities.rooms.get_by_id(id_)
+
+    def get_doors() -> None:
+        for id_ in ids:
+            entities.doors.get_by_room_ids(id_ + 1, id_)
+
+    return [
+        Case(f"rooms.get_by_id[{size}]", get_rooms, LOOKUP_COUNT),
+        Case(f"doors.get_by_room_ids[{size}]", get_doors, LOOKUP_COUNT),
+    ]
+
+
+def world_cases(entities: EntityInterface, size: int) -> List[Case]:
+    """Every case other than the lookups, which only need the one world.
+
+    Args:
+        entities (EntityInterface): The world.
+        size (int): How many rooms there are.
+
+    Returns:
+        List[Case]: The cases.
+    """
+
+    telnet = TelnetServer(port=0)
+    comms = CommsInterface(telnet, entities)
+    server_config = ServerConfig(telnet, entities, comms)
+
+    crowded_telnet = TelnetServer(port=0)
+
+    clients = create_clients(telnet, size)
+    crowded_clients = create_clients(crowded_telnet, 1)
+
+    def reset_outboxes() -> None:
+        for client in clients + crowded_clients:
+            client.outbox.data.clear()
+            client.prompt_pending = False
+
+    processor = CommandProcessor(server_config, ACTIONS + [Noop])
+    items = [entities.items.get_by_id(id_) for id_ in range(1, ITEM_COUNT + 1)]
+    room_route = MessageRoute(Message("Someone waves."), ids=[1])
+    region_route = MessageRoute(Message("Thunder rumbles."), ids=[1])
+
+    create_database()
+    spawner = SpawnEvent(server_config, "event-spawn")
+
+    # the first run fills the world, after which it only tops it up, as it would
+    # every time it runs on a live server
+    spawner.process()
+
+    parsers = {"paste": PASTE_INPUT, "iac_heavy": IAC_HEAVY_INPUT}
+
+    return [
+        Case(
+            "command_processor.process",
+            lambda: processor.process(clients[0], "noop"),
+        ),
+        Case(
+            "entity_interface.get_by_name",
+            lambda: entities.get_by_name(items, "20.fork"),
+        ),
+        Case("message.__str__", lambda: str(Message("You pick up a rusty fork."))),
+        Case("prompt.__str__", lambda: str(Prompt("> "))),
+        Case(
+            "comms.room.send",
+            lambda: Room(crowded_telnet, entities).send(room_route),
+            CLIENT_COUNT,
+            reset_outboxes,
+        ),
+        Case(
+            "comms.region.send",
+            lambda: Region(telnet, entities).send(region_route),
+            CLIENT_COUNT,
+            reset_outboxes,
+        ),
+        *[
+            Case(
+                f"telnet_parser.feed[{name}]",
+                lambda data=data: TelnetParser(max_lines=len(data)).feed(data),
+            )
+            for name, data in parsers.items()
+        ],
+        Case("spawn_event.process", spawner.process, SPAWN_COUNT),
+    ]
+
+
+def measure(case: Case, repeat: int) -> float:
+    """Measure the best time per operation, out of a number of batches of runs.
+
+    Args:
+        case (Case): The case.
+        repeat (int): How many batches to take the best of.
+
+    Returns:
+        float: The time per operation, in microseconds.
+    """
+
+    timer = Timer(case.run, case.reset or "pass")
+    number, _elapsed = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    return best / case.ops * 1_000_000
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Any]:
+    """Run every case.
+
+    Args:
+        sizes (List[int]): The world sizes to time the lookups at.
+        repeat (int): How many batches of runs to take the best of.
+
+    Returns:
+        Dict[str, Any]: The results, ready to be written out as JSON.
+    """
+
+    results: Dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as directory:
+        for size in sorted(sizes, reverse=True):
+            entities = build_world(directory, size)
+            cases = lookup_cases(entities, size)
+
+            # the rest only need timing once, in the smallest world
+            if size == min(sizes):
+                cases += world_cases(entities, size)
+
+            for case in cases:
+                results[case.name] = measure(case, repeat)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "unit": "us/op",
+        "results": dict(sorted(results.items())),
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print how each case compares to the baseline.
+
+    Args:
+        results (Dict[str, Any]): The results of this run.
+        baseline (Dict[str, Any]): The results of an earlier run.
+        threshold (float): How much slower a case can get, as a percentage, before
+            it's called out as a regression.
+
+    Returns:
+        List[str]: The cases that regressed.
+    """
+
+    regressions = []
+
+    print(f"{'case':<36} {'baseline':>12} {'current':>12}", file=sys.stderr)
+
+    for name, current in results["results"].items():
+        previous = baseline["results"].get(name)
+
+        if previous is None:
+            print(f"{name:<36} {'':>12} {current:>12.3f}   (new)", file=sys.stderr)
+            continue
+
+        change = (current - previous) / previous * 100
+        flag = ""
+
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+
+        print(
+            f"{name:<36} {previous:>12.3f} {current:>12.3f} {change:>+8.1f}%  {flag}",
+            file=sys.stderr,
+        )
+
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: The arguments.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Time the server's hot paths, against synthetic worlds."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="the world sizes to time the room and door lookups at",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="how many runs to take the best of"
+    )
+    parser.add_argument(
+        "--output", help="save the results to this file, instead of printing them"
+    )
+    parser.add_argument("--baseline", help="compare the results to a saved run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="the percentage slowdown that counts as a regression",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks, then save or print the results. Exits with an error if any
+    case regressed against the baseline.
+    """
+
+    arguments = parse_arguments()
+    results = run(arguments.sizes, arguments.repeat)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    else:
+        print(json.dumps(results, indent=2))
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+        if compare(results, baseline, arguments.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Counts the memory allocations made while receiving and parsing client input,
+comparing the original `recv` path against `recv_into` with a preallocated buffer.
+Each path receives the same 10,000 inputs over a local socket pair, either one input
+per read or as paste-sized reads.
+
+The allocations are counted from a tracemalloc snapshot taken before and after the
+inputs are received. Everything a read hands back, and the data it was read into, is
+held on to until the second snapshot, so every allocation it made is counted rather
+than only those still alive at the end. Temporary objects the parser creates and
+frees on its own aren't counted, but they're the same for both paths.
+
+    python -m benchmarks.receive_path
+"""
+
+import socket
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from cibo.utils.telnet_parser import TelnetParser
+
+INPUT = b"say The quick brown fox jumps over the lazy dog.\r\n"
+INPUT_COUNT = 10_000
+
+# how many inputs arrive in each read, for each workload. A paste of 80 inputs
+# nearly fills a single 4096 byte read
+WORKLOADS = {"single": 1, "paste": 80}
+
+# receives a read's worth of input, holding on to anything it allocated the data in
+Receiver = Callable[[socket.socket, TelnetParser, List[Any]], List[str]]
+
+
+def receive_with_recv(
+    receiver: socket.socket, parser: TelnetParser, kept: List[Any]
+) -> List[str]:
+    """Receive input the original way, with a new bytes object for every read.
+
+    Args:
+        receiver (socket.socket): The socket the input arrives on.
+        parser (TelnetParser): The client's parser.
+        kept (List[Any]): Holds on to the data read, so its allocation is counted.
+
+    Returns:
+        List[str]: The lines received.
+    """
+
+    data = receiver.recv(4096)
+    kept.append(data)
+
+    return parser.feed(data)
+
+
+def create_receive_with_recv_into() -> Receiver:
+    """Create a receiver that reads into a single buffer, allocated ahead of time.
+
+    Returns:
+        Receiver: The receiver.
+    """
+
+    buffer = bytearray(4096)
+
+    # the buffer is allocated once, and reused for every read, so there's nothing
+    # to hold on to
+    def receive_with_recv_into(
+        receiver: socket.socket, parser: TelnetParser, _kept: List[Any]
+    ) -> List[str]:
+        return parser.feed(buffer, receiver.recv_into(buffer))
+
+    return receive_with_recv_into
+
+
+def measure(receive: Receiver, inputs_per_read: int) -> Dict[str, float]:
+    """Count the memory allocations made while receiving all of the inputs.
+
+    Args:
+        receive (Receiver): The receiver.
+        inputs_per_read (int): How many inputs arrive in each read.
+
+    Returns:
+        Dict[str, float]: The number of allocations and the KiB allocated, per 10k
+            inputs, and the time taken in milliseconds.
+    """
+
+    sender, receiver = socket.socketpair()
+    parser = TelnetParser(max_lines=inputs_per_read)
+    data = INPUT * inputs_per_read
+    kept: List[Any] = []
+
+    # the snapshots only count what's allocated by the reads, not by tracemalloc
+    trace_filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(trace_filters)
+    started = time.perf_counter()
+
+    for _ in range(INPUT_COUNT // inputs_per_read):
+        sender.sendall(data)
+        kept.append(receive(receiver, parser, kept))
+
+    elapsed = time.perf_counter() - started
+    after = tracemalloc.take_snapshot().filter_traces(trace_filters)
+    tracemalloc.stop()
+
+    sender.close()
+    receiver.close()
+
+    received = sum(len(lines) for lines in kept if isinstance(lines, list))
+    assert received == INPUT_COUNT // inputs_per_read * inputs_per_read
+
+    differences = after.compare_to(before, "lineno")
+    scale = 10_000 / received
+
+    return {
+        "allocations": sum(stat.count_diff for stat in differences) * scale,
+        "allocated_kib": sum(stat.size_diff for stat in differences) / 1024 * scale,
+        "elapsed_ms": elapsed * 1000,
+    }
+
+
+def run() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run the benchmark for each workload, with both receive paths.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: The measurements, by workload and
+            receive path.
+    """
+
+    return {
+        name: {
+            "recv": measure(receive_with_recv, inputs_per_read),
+            "recv_into": measure(create_receive_with_recv_into(), inputs_per_read),
+        }
+        for name, inputs_per_read in WORKLOADS.items()
+    }
+
+
+if __name__ == "__main__":
+    print(f"{INPUT_COUNT} inputs of {len(INPUT)} bytes, allocations per 10k inputs")
+
+    for workload_name, paths in run().items():
+        for path_name, results in paths.items():
+            print(
+                f"{workload_name:<8} {path_name:<10} "
+                f"{results['allocations']:>8.0f} allocations   "
+                f"{results['allocated_kib']:>9.1f} KiB   "
+                f"{results['elapsed_ms']:>8.1f} ms"
+            )
@@ -0,0 +1,581 @@
+"""Drives a swarm of simulated players against a server over Telnet, and reports how
+quickly the server responds to their commands. Useful for sizing hardware, and for
+catching regressions in the telnet server, the command processor, and the comms.
+
+By default a server is started in a process of its own, with a fresh database of
+players for the bots to log in as, and the server's CPU use is reported alongside.
+Pass --port to aim the swarm at a server that's already running instead, in which
+case the bots register their players through the game itself.
+
+Each bot has a single command in flight at a time. A command's round trip lasts
+from sending it until the prompt that follows its response, with anything other
+bots caused to be sent in the meantime left out.
+
+    python -m benchmarks.swarm --bots 100 --duration 30
+    python -m benchmarks.swarm --mix walk=5,look=2,say=2,get=1,drop=1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROMPT = "\r\n> "
+
+# the Telnet options the server offers, and the colors and styles in its messages,
+# neither of which the bots need
+TELNET_SEQUENCE = re.compile(rb"\xff[\xfb-\xfe].|\xff\xfa.*?\xff\xf0", re.DOTALL)
+ANSI_SEQUENCE = re.compile(r"\x1b\[[0-9;]*m")
+
+# messages about other players start with their name, e.g. "bot0002 arrives."
+BOT_NAME = re.compile(r"bot\d+")
+
+PASSWORD = "swarm_password"
+
+# short enough that what's said is never wrapped onto a second line
+PHRASES = ["hello!", "anyone around?", "nice weather today", "which way is north?"]
+
+# how long a bot waits on a response, before giving up on it
+RESPONSE_TIMEOUT = 10.0
+
+
+@dataclass
+class SwarmStats:
+    """The round trips recorded by the whole swarm."""
+
+    # the round trip times of each kind of command, in seconds
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+
+    # commands that never got a response
+    timeouts: int = 0
+
+    # the server's CPU time while the swarm ran, in seconds, if it's known
+    server_cpu: Optional[float] = None
+
+    def record(self, behavior: str, latency: float) -> None:
+        """Record a command's round trip.
+
+        Args:
+            behavior (str): The kind of command.
+            latency (float): The round trip time, in seconds.
+        """
+
+        self.latencies.setdefault(behavior, []).append(latency)
+
+
+class Bot:
+    """A simulated player, connected to the server over Telnet.
+
+    Args:
+        name (str): The player name.
+        rooms (Dict[int, Dict[str, int]]): The exits from each room, by direction.
+        rng (random.Random): Where the bot's choices come from.
+    """
+
+    def __init__(
+        self, name: str, rooms: Dict[int, Dict[str, int]], rng: random.Random
+    ) -> None:
+        self.name = name
+        self.room = 1
+
+        self._rooms = rooms
+        self._rng = rng
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+
+        self._received = ""
+        self._response: Optional[asyncio.Future] = None
+
+        # the room the bot is heading to, if its last command was a move
+        self._destination: Optional[int] = None
+
+    async def connect(self, host: str, port: int) -> None:
+        """Connect to the server, and wait for the welcome to arrive.
+
+        Args:
+            host (str): The server's address.
+            port (int): The server's port.
+        """
+
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._response = asyncio.get_running_loop().create_future()
+        self._read_task = asyncio.create_task(self._read())
+
+        await asyncio.wait_for(self._response, RESPONSE_TIMEOUT)
+
+    async def register(self) -> None:
+        """Register the bot's player, through the game itself."""
+
+        await self.command(f"register {self.name} {PASSWORD}")
+        await self.command("finalize")
+
+    async def log_in(self) -> None:
+        """Log in as the bot's player, who starts out in the first room."""
+
+        await self.command(f"login {self.name} {PASSWORD}")
+
+        self.room = 1
+
+    async def command(self, line: str) -> Optional[str]:
+        """Send a command, and wait for the response.
+
+        Args:
+            line (str): The command.
+
+        Returns:
+            Optional[str]: The response, or None if it never arrived.
+        """
+
+        if not self._writer:
+            return None
+
+        self._response = asyncio.get_running_loop().create_future()
+        self._writer.write(f"{line}\r\n".encode())
+
+        try:
+            response: str = await asyncio.wait_for(self._response, RESPONSE_TIMEOUT)
+
+        except asyncio.TimeoutError:
+            return None
+
+        if self._destination is not None and "You head" in response:
+            self.room = self._destination
+
+        self._destination = None
+
+        return response
+
+    def walk(self) -> str:
+        """Pick one of the current room's exits to walk through.
+
+        Returns:
+            str: The move command.
+        """
+
+        exits = self._rooms.get(self.room)
+
+        if not exits:
+            return "look"
+
+        direction = self._rng.choice(sorted(exits))
+        self._destination = exits[direction]
+
+        return direction
+
+    async def close(self) -> None:
+        """Disconnect from the server."""
+
+        if self._read_task:
+            self._read_task.cancel()
+
+        if self._writer:
+            self._writer.close()
+
+    async def _read(self) -> None:
+        """Read everything the server sends, handing each response over to the
+        command waiting on it.
+        """
+
+        if not self._reader:
+            return
+
+        while data := await self._reader.read(65536):
+            data = TELNET_SEQUENCE.sub(b"", data)
+            self._received += ANSI_SEQUENCE.sub("", data.decode("utf-8", "replace"))
+
+            # everything up to a prompt was sent in the same update
+            while PROMPT in self._received:
+                sent, self._received = self._received.split(PROMPT, 1)
+
+                if self._is_response(sent) and self._response:
+                    if not self._response.done():
+                        self._response.set_result(sent)
+
+    def _is_response(self, sent: str) -> bool:
+        """Check if what was sent includes a response to the bot's own command,
+        rather than only messages about other players.
+
+        Args:
+            sent (str): Everything sent ahead of a prompt.
+
+        Returns:
+            bool: Is there a response or not.
+        """
+
+        for line in sent.splitlines():
+            line = line.strip()
+            name = BOT_NAME.match(line)
+
+            if line and (not name or name.group() == self.name):
+                return True
+
+        return False
+
+
+BEHAVIORS: Dict[str, Callable[[Bot, random.Random], str]] = {
+    "walk": lambda bot, _rng: bot.walk(),
+    "look": lambda _bot, _rng: "look",
+    "say": lambda _bot, rng: f"say {rng.choice(PHRASES)}",
+    "get": lambda _bot, _rng: "get fork",
+    "drop": lambda _bot, _rng: "drop fork",
+}
+
+
+def load_rooms() -> Dict[int, Dict[str, int]]:
+    """Load the room graph the server is using, to walk around.
+
+    Returns:
+        Dict[int, Dict[str, int]]: The exits from each room, by direction.
+    """
+
+    path = os.getenv("ROOMS_PATH", "/cibo/config/rooms.json")
+
+    with open(f"{Path.cwd()}/{path}", encoding="utf-8") as file:
+        rooms = json.load(file)["rooms"]
+
+    return {
+        room["id"]: {exit_["direction"]: exit_["id"] for exit_ in room["exits"]}
+        for room in rooms
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse a behavior mix, e.g. "walk=4,look=2,say=1".
+
+    Args:
+        mix (str): The behaviors, and how often each is picked relative to the rest.
+
+    Returns:
+        Dict[str, int]: The weight of each behavior.
+    """
+
+    weights = {}
+
+    for entry in mix.split(","):
+        behavior, weight = entry.split("=")
+
+        if behavior not in BEHAVIORS:
+            raise argparse.ArgumentTypeError(f"unknown behavior: {behavior}")
+
+        weights[behavior] = int(weight)
+
+    return weights
+
+
+def create_players(names: List[str]) -> None:
+    """Create a player for each bot, carrying a fork to get and drop. The passwords
+    are hashed cheaply, so logging in doesn't hold up the game loop.
+
+    Args:
+        names (List[str]): The bots to create players for.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    # the database path is read as the models are imported, so they're only imported
+    # once it's been set
+    from passlib.hash import bcrypt
+
+    from cibo.models.data.item import Item
+    from cibo.models.data.player import Player
+
+    password = bcrypt.using(rounds=4).hash(PASSWORD)
+
+    for name in names:
+        player = Player.create(name=name, password=password, current_room_id=1)
+        Item.create(item_id=1, player=player)
+
+
+def serve(connection: Connection, names: List[str], backend: str) -> None:
+    """Run a server for the swarm, in a process of its own, with a player already
+    created for each bot.
+
+    Once the server is running its port is sent back, and after that the process'
+    CPU time whenever it's asked for, until it's told to stop.
+
+    Args:
+        connection (Connection): The swarm's end of the pipe.
+        names (List[str]): The bots to create players for.
+        backend (str): Which telnet server to run, "threaded" or "async".
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from cibo.async_telnet import AsyncTelnetServer
+    from cibo.comms._interface_ import CommsInterface
+    from cibo.entities._interface_ import EntityInterface
+    from cibo.server import Server
+    from cibo.server_config import ServerConfig
+    from cibo.telnet import TelnetServer
+    from cibo.telnet_config import TelnetConfig
+
+    # the whole swarm connects from the same address, all at once
+    config = TelnetConfig(address_connect_rate=0, connect_rate=0, idle_timeout=0)
+    telnet = (
+        AsyncTelnetServer(0, config) if backend == "async" else TelnetServer(0, config)
+    )
+    entity_interface = EntityInterface()
+    server = Server(
+        ServerConfig(telnet, entity_interface, CommsInterface(telnet, entity_interface))
+    )
+
+    server.create_db()
+    create_players(names)
+    server.start()
+
+    while not server.is_running:
+        time.sleep(0.01)
+
+    connection.send(telnet.port)
+
+    while connection.recv() != "stop":
+        connection.send(time.process_time())
+
+    server.stop()
+    connection.send("stopped")
+
+
+async def run_bot(
+    bot: Bot, weights: Dict[str, int], deadline: float, think: float, stats: SwarmStats
+) -> None:
+    """Keep the bot busy with commands from the behavior mix, until the deadline.
+
+    Args:
+        bot (Bot): The bot.
+        weights (Dict[str, int]): How often each behavior is picked.
+        deadline (float): When to stop, on the monotonic clock.
+        think (float): The average pause between commands, in seconds.
+        stats (SwarmStats): Where the round trips are recorded.
+    """
+
+    rng = random.Random(bot.name)
+    behaviors = list(weights)
+
+    while time.monotonic() < deadline:
+        behavior = rng.choices(behaviors, [weights[name] for name in behaviors])[0]
+        line = BEHAVIORS[behavior](bot, rng)
+
+        started = time.perf_counter()
+
+        if await bot.command(line) is None:
+            stats.timeouts += 1
+        else:
+            stats.record(behavior, time.perf_counter() - started)
+
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+
+
+async def swarm(
+    arguments: argparse.Namespace,
+    port: int,
+    server_connection: Optional[Connection] = None,
+) -> SwarmStats:
+    """Connect and log in every bot, then run them all until the time is up.
+
+    Args:
+        arguments (argparse.Namespace): The command line arguments.
+        port (int): The server's port.
+        server_connection (Optional[Connection], optional): The pipe to the
+            server's process, if the swarm started it. Defaults to None.
+
+    Returns:
+        SwarmStats: The round trips recorded.
+    """
+
+    rooms = load_rooms()
+    bots = [
+        Bot(name, rooms, random.Random(name))
+        for name in bot_names(arguments.bots, arguments.prefix)
+    ]
+
+    # connect a batch at a time, the way a crowd turns up after a restart
+    for start in range(0, len(bots), 50):
+        batch = bots[start : start + 50]
+
+        await asyncio.gather(*[bot.connect(arguments.host, port) for bot in batch])
+
+        if arguments.port:
+            await asyncio.gather(*[bot.register() for bot in batch])
+
+        await asyncio.gather(*[bot.log_in() for bot in batch])
+
+    stats = SwarmStats()
+    deadline = time.monotonic() + arguments.duration
+
+    # only the server's CPU time while the bots are busy is counted
+    if server_connection:
+        server_connection.send("cpu")
+        stats.server_cpu = -server_connection.recv()
+
+    await asyncio.gather(
+        *[run_bot(bot, arguments.mix, deadline, arguments.think, stats) for bot in bots]
+    )
+
+    if server_connection:
+        server_connection.send("cpu")
+        stats.server_cpu += server_connection.recv()
+
+    await asyncio.gather(*[bot.close() for bot in bots])
+
+    return stats
+
+
+def bot_names(count: int, prefix: str) -> List[str]:
+    """Name the bots. Player names are limited to 15 characters.
+
+    Args:
+        count (int): How many bots there are.
+        prefix (str): Digits to set this swarm's bots apart from any earlier one's.
+
+    Returns:
+        List[str]: The names.
+    """
+
+    return [f"bot{prefix}{number:04d}" for number in range(count)]
+
+
+def percentile(latencies: List[float], percent: float) -> float:
+    """Find the latency that the given percent of round trips were quicker than.
+
+    Args:
+        latencies (List[float]): The round trip times, sorted.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The latency, in seconds.
+    """
+
+    if not latencies:
+        return 0.0
+
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+def report(arguments: argparse.Namespace, stats: SwarmStats) -> None:
+    """Print the results.
+
+    Args:
+        arguments (argparse.Namespace): The command line arguments.
+        stats (SwarmStats): The round trips recorded.
+    """
+
+    every_latency = sorted(
+        latency for latencies in stats.latencies.values() for latency in latencies
+    )
+
+    print(f"{arguments.bots} bots for {arguments.duration:.0f}s")
+    print(
+        f"{len(every_latency)} commands, {len(every_latency) / arguments.duration:.1f}"
+        f"/s, {stats.timeouts} timed out"
+    )
+
+    print(f"{'':<8} {'count':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    for name, latencies in [("all", every_latency)] + sorted(stats.latencies.items()):
+        latencies = sorted(latencies)
+
+        print(
+            f"{name:<8} {len(latencies):>8} "
+            + " ".join(
+                f"{percentile(latencies, percent) * 1000:>8.2f}"
+                for percent in (50, 95, 99)
+            )
+        )
+
+    if stats.server_cpu is not None:
+        print(
+            f"server CPU {stats.server_cpu / arguments.duration * 100:.1f}% "
+            "of one core"
+        )
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Returns:
+        argparse.Namespace: The arguments.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--bots", type=int, default=50, help="how many bots to run")
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="seconds to run the swarm for"
+    )
+    parser.add_argument(
+        "--think",
+        type=float,
+        default=0.5,
+        help="average seconds each bot pauses between commands",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="walk=4,look=2,say=2,get=1,drop=1",
+        help="how often each behavior is picked, e.g. walk=4,look=2,say=2",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="the server's address")
+    parser.add_argument(
+        "--port", type=int, help="use a running server, rather than starting one"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["threaded", "async"],
+        default="threaded",
+        help="which telnet server to start",
+    )
+    parser.add_argument(
+        "--prefix",
+        default="",
+        help="digits added to the bot names, so they don't clash with earlier runs",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the swarm, against a server of its own unless given a port."""
+
+    arguments = parse_arguments()
+
+    if arguments.port:
+        report(arguments, asyncio.run(swarm(arguments, arguments.port)))
+        return
+
+    # a fresh interpreter, so the server's models pick up the new database path
+    context = get_context("spawn")
+    connection, server_connection = context.Pipe()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_PATH"] = f"{directory}/swarm.db"
+
+        process = context.Process(
+            target=serve,
+            args=(
+                server_connection,
+                bot_names(arguments.bots, arguments.prefix),
+                arguments.backend,
+            ),
+        )
+        process.start()
+
+        stats = asyncio.run(swarm(arguments, connection.recv(), connection))
+
+        connection.send("stop")
+        connection.recv()
+        process.join()
+
+    report(arguments, stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Compares the throughput of the byte-level TelnetParser against the original
+character-by-character parser it replaced, on paste-sized and IAC-heavy inputs. The
+TelnetParser's numbers include splitting the input into lines, which the original
+parser never did.
+
+    python -m benchmarks.telnet_parser
+"""
+
+from timeit import Timer
+from typing import Any, Callable, Dict, List
+
+from cibo.utils.telnet_parser import TelnetParser
+
+# a large paste of plain text, such as a player pasting a block of commands
+PASTE_INPUT = b"say The quick brown fox jumps over the lazy dog.\r\n" * 80
+
+# negotiation replies interleaved with short commands, as sent by a chatty client
+IAC_HEAVY_INPUT = (b"\xff\xfb\x1f\xff\xfa\x1f\x00\x50\x00\x18\xff\xf0n\r\n" * 4) * 80
+
+
+class LegacyParser:
+    """The original parser, which decoded the data before walking it a character at a
+    time. Kept here only to be benchmarked against.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+
+    def feed(self, data: bytes) -> str:
+        """Parse the data, stripping out any Telnet messages.
+
+        Args:
+            data (bytes): The raw data.
+
+        Returns:
+            str: The text contained in the data.
+        """
+
+        state = 1
+
+        for char in data.decode("utf-8", "replace"):
+            if state == 1:
+                if ord(char) == 255:
+                    state = 2
+                elif char == "\x08":
+                    self.buffer = self.buffer[:-1]
+                else:
+                    self.buffer += char
+
+            elif state == 2:
+                if ord(char) == 250:
+                    state = 3
+                elif ord(char) in (251, 252, 253, 254):
+                    state = 2
+                else:
+                    state = 1
+
+            elif state == 3:
+                if ord(char) == 240:
+                    state = 1
+
+        message = self.buffer
+        self.buffer = ""
+        return message
+
+
+def feed_and_negotiate(parser: TelnetParser) -> Callable[[bytes], List[str]]:
+    """Wrap the parser's feed, so the negotiations are taken after each read, as the
+    server does. Otherwise they'd pile up over the whole benchmark.
+
+    Args:
+        parser (TelnetParser): The parser.
+
+    Returns:
+        Callable[[bytes], List[str]]: The wrapped feed method.
+    """
+
+    def feed(data: bytes) -> List[str]:
+        lines = parser.feed(data)
+
+        parser.take_negotiations()
+        parser.take_subnegotiations()
+
+        return lines
+
+    return feed
+
+
+def measure(feed: Callable[[bytes], Any], data: bytes, repeat: int = 5) -> float:
+    """Measure how many megabytes per second the parser can get through.
+
+    Args:
+        feed (Callable[[bytes], Any]): The parser's feed method.
+        data (bytes): The input to parse.
+        repeat (int, optional): How many runs to take the best of. Defaults to 5.
+
+    Returns:
+        float: The throughput, in MB/s.
+    """
+
+    timer = Timer(lambda: feed(data))
+    number, _elapsed = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    return len(data) / best / 1_000_000
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    """Run the benchmark for each input, with both parsers.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Throughput in MB/s, by input and parser.
+    """
+
+    inputs = {"paste": PASTE_INPUT, "iac_heavy": IAC_HEAVY_INPUT}
+
+    return {
+        name: {
+            "legacy": measure(LegacyParser().feed, data),
+            "telnet_parser": measure(
+                feed_and_negotiate(TelnetParser(max_lines=len(data))), data
+            ),
+        }
+        for name, data in inputs.items()
+    }
+
+
+if __name__ == "__main__":
+    for input_name, results in run().items():
+        speedup = results["telnet_parser"] / results["legacy"]
+
+        print(
+            f"{input_name:<10} legacy {results['legacy']:>8.2f} MB/s   "
+            f"telnet_parser {results['telnet_parser']:>8.2f} MB/s   "
+            f"({speedup:.1f}x)"
+        )
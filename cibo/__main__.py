@@ -4,28 +4,161 @@ the server is started and stopped from the commandline, and not while a loop is
 running.
 """
 
+from multiprocessing.synchronize import Event
 from os import getenv
+from signal import SIG_IGN, SIGINT, signal
 from time import sleep
 
+from cibo.async_telnet import AsyncTelnetServer
 from cibo.comms._interface_ import CommsInterface
+from cibo.copyover import Copyover
 from cibo.entities._interface_ import EntityInterface
 from cibo.server import Server
 from cibo.server_config import ServerConfig
+from cibo.supervisor import Supervisor
 from cibo.telnet import TelnetServer
+from cibo.telnet_config import TelnetConfig
+
+
+def create_server(reuse_port: bool = False) -> Server:
+    """Create a server, configured from the environment.
+
+    Args:
+        reuse_port (bool, optional): Share the port with other worker processes.
+            Defaults to False.
+
+    Returns:
+        Server: The server, ready to be started.
+    """
+
+    port = int(getenv("SERVER_PORT", "51234"))
+    telnet_config = TelnetConfig(
+        listen_backlog=int(getenv("SERVER_LISTEN_BACKLOG", "128")),
+        address_connect_rate=float(getenv("SERVER_ADDRESS_CONNECT_RATE", "0.5")),
+        address_connect_burst=int(getenv("SERVER_ADDRESS_CONNECT_BURST", "5")),
+        connect_rate=float(getenv("SERVER_CONNECT_RATE", "50")),
+        connect_burst=int(getenv("SERVER_CONNECT_BURST", "200")),
+        reuse_port=reuse_port,
+        idle_timeout=float(getenv("SERVER_IDLE_TIMEOUT", "1800")),
+        link_dead_timeout=float(getenv("SERVER_LINK_DEAD_TIMEOUT", "60")),
+    )
 
-if __name__ == "__main__":
-    telnet = TelnetServer(port=int(getenv("SERVER_PORT", "51234")))
+    websocket_port = getenv("SERVER_WEBSOCKET_PORT")
+
+    # the asyncio backend is opt-in, while it's still the new kid on the block. It
+    # doesn't serve WebSocket clients yet
+    telnet = (
+        AsyncTelnetServer(port=port, config=telnet_config)
+        if getenv("SERVER_ASYNC", "false") == "true"
+        else TelnetServer(
+            port=port,
+            config=telnet_config,
+            websocket_port=int(websocket_port) if websocket_port else None,
+        )
+    )
     entity_interface = EntityInterface()
     comms_interface = CommsInterface(telnet, entity_interface)
 
-    server_config = ServerConfig(telnet, entity_interface, comms_interface)
-    server = Server(server_config)
+    # workers would all be after the same metrics port and trace file, so only a
+    # server running on its own serves metrics or writes traces
+    metrics_port = None if reuse_port else getenv("SERVER_METRICS_PORT")
+    trace_path = None if reuse_port else getenv("SERVER_TRACE_PATH")
+
+    server_config = ServerConfig(
+        telnet,
+        entity_interface,
+        comms_interface,
+        pulse_rate=float(getenv("SERVER_PULSE_RATE", "10")),
+        admins=[name for name in getenv("SERVER_ADMINS", "").split(",") if name],
+        metrics_port=int(metrics_port) if metrics_port else None,
+        trace_path=trace_path or None,
+        trace_sample_rate=float(getenv("SERVER_TRACE_SAMPLE_RATE", "0.01")),
+    )
+
+    return Server(server_config)
+
+
+def resume_copyover(copyover_server: Server) -> None:
+    """If this process was started by a copyover, start the server straight away,
+    picking up the clients where they left off.
+
+    Args:
+        copyover_server (Server): The server, not yet started.
+    """
+
+    copyover = Copyover.pending()
+
+    if copyover:
+        copyover_server.start(copyover.load())
+        print("Copyover complete.")
+
+
+def run_worker(stop_event: Event) -> None:
+    """Run the server in a worker process, until the supervisor asks it to stop.
+
+    Args:
+        stop_event (Event): Set once the worker should shut down.
+    """
+
+    # Ctrl+C reaches every process in the group. The supervisor handles it, and
+    # sets the stop event, so the worker can save its players and shut down cleanly
+    signal(SIGINT, SIG_IGN)
+
+    worker_server = create_server(reuse_port=True)
+    worker_server.start()
+
+    try:
+        stop_event.wait()
+
+    finally:
+        worker_server.stop()
+
+
+def run_supervisor(workers: int) -> None:
+    """Run the server across several worker processes, restarting any that stop,
+    until interrupted.
+
+    Args:
+        workers (int): How many worker processes to run.
+    """
+
+    # the workers can't make use of a database without its tables, so they're
+    # created before any worker is started
+    create_server().create_db()
+
+    supervisor = Supervisor(workers, run_worker)
+    supervisor.start()
+
+    print(f"Started {workers} workers. Press Ctrl+C to stop them.")
+
+    try:
+        supervisor.watch()
+
+    except KeyboardInterrupt:
+        pass
+
+    supervisor.stop()
+    print("Stopped workers.")
+
+
+if __name__ == "__main__":
+    worker_count = int(getenv("SERVER_WORKERS", "1"))
+
+    # each worker runs its own world, so this is meant for separate realms or shards
+    if worker_count > 1:
+        run_supervisor(worker_count)
+        raise SystemExit
+
+    server = create_server()
+
+    resume_copyover(server)
 
     print(
         "Accepted commands:\n\n"
         "create_db    create the necessary db and tables\n"
         "start        start the server\n"
-        "stop         stop the server (currently broken, can't be started again)\n"
+        "stop         stop the server\n"
+        "copyover     reload the server's code, without dropping any connections\n"
         "exit         stop the server if running, and exit this program\n"
     )
 
@@ -56,6 +189,13 @@ if __name__ == "__main__":
             if not server.is_running:
                 print("Server is not running.")
 
+        if user_input == "copyover":
+            if server.is_running:
+                print("Starting copyover...")
+                server.copyover(Copyover(getenv("COPYOVER_PATH", "cibo_copyover.json")))
+
+            print("Copyover is only supported while the threaded server is running.")
+
         if user_input == "exit":
             if server.is_running:
                 server.stop()
@@ -15,6 +15,7 @@ from cibo.actions.commands.open import Open
 from cibo.actions.commands.quit import Quit
 from cibo.actions.commands.register import Register
 from cibo.actions.commands.say import Say
+from cibo.actions.commands.stats import Stats
 
 ACTIONS = [
     Close,
@@ -31,4 +32,5 @@ ACTIONS = [
     Quit,
     Register,
     Say,
+    Stats,
 ]
@@ -9,6 +9,7 @@ from cibo.actions import Action
 from cibo.exceptions import CommandMissingArguments, CommandUnrecognized
 from cibo.models.client import Client
 from cibo.server_config import ServerConfig
+from cibo.utils.tracer import tracer
 
 
 @dataclass
@@ -92,7 +93,8 @@ class CommandProcessor:
         # in that case, we want to drop the blank string and just return an empty list
         split_args = args.split(" ") if args else []
 
-        action = self._get_command_action(command)
+        with tracer.span("command lookup"):
+            action = self._get_command_action(command)
 
         if action is None:
             raise CommandUnrecognized(command)
@@ -100,7 +102,10 @@ class CommandProcessor:
         action_instance = action(self._server_config)
 
         try:
-            action_instance.process(client, command, split_args)
+            # timed by action class, so every alias of a command counts towards it
+            with self._server_config.latency_stats.measure(action.__name__):
+                with tracer.span(action.__name__):
+                    action_instance.process(client, command, split_args)
 
         # an IndexError means that the client's command was missing an argument index
         # that this specific action requires
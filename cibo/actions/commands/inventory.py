@@ -1,6 +1,6 @@
 """Display the itemized contents of the player inventory."""
 
-from typing import List
+from typing import Any, Dict, List
 
 from cibo.actions import Action
 from cibo.exceptions import ClientNotLoggedIn
@@ -38,6 +38,20 @@ class Inventory(Action):
             else self._empty_inventory_message
         )
 
+    def _inventory_data(self, client: Client) -> Dict[str, Any]:
+        """The contents of the player inventory, for clients that show it themselves."""
+
+        return {
+            "location": "inv",
+            "items": [
+                {
+                    "id": item_data.id_,
+                    "name": self.items.get_by_id(item_data.item_id).name,
+                }
+                for item_data in client.player.inventory
+            ],
+        }
+
     def process(self, client: Client, _command: str, args: List[str]) -> None:
         try:
             if not client.is_logged_in:
@@ -50,3 +64,10 @@ class Inventory(Action):
             self.comms.send_to_client(
                 MessageRoute(self._inventory_message(client), client=client)
             )
+
+            # the data takes looking up every item, so it's only built for clients
+            # who'll be sent it
+            if client.gmcp_enabled:
+                self.comms.send_data(
+                    client, "Char.Items.List", self._inventory_data(client)
+                )
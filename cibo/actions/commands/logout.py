@@ -1,6 +1,5 @@
 """Log out of the current player session."""
 
-from time import sleep
 from typing import List, Tuple
 
 from cibo.actions import Action
@@ -34,9 +33,7 @@ class Logout(Action):
             ),
         )
 
-    def process(
-        self, client: Client, command: str, args: List[str], sleep_time: int = 1
-    ) -> None:
+    def process(self, client: Client, command: str, args: List[str]) -> None:
         try:
             if not client.is_logged_in:
                 raise ClientNotLoggedIn
@@ -57,8 +54,6 @@ class Logout(Action):
                 MessageRoute(logging_out_message[1], ids=[player_room]),
             )
 
-            sleep(sleep_time)
-
             # process the connection action, so the client knows they can now register
             # or login again
             Connect(self._server_config).process(client, command, args)
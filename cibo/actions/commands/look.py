@@ -167,3 +167,6 @@ class Look(Action):
                     self._room_description_message(client, room), client=client
                 )
             )
+
+            if client.gmcp_enabled:
+                self.comms.send_data(client, "Room.Info", room.get_info())
@@ -1,6 +1,5 @@
 """Quits the game and disconnects the client."""
 
-from time import sleep
 from typing import List, Optional, Tuple
 
 from cibo.actions import Action
@@ -33,9 +32,7 @@ class Quit(Action):
             ),
         )
 
-    def process(
-        self, client: Client, _command: str, _args: List[str], sleep_time: int = 1
-    ) -> None:
+    def process(self, client: Client, _command: str, _args: List[str]) -> None:
         try:
             if client.is_logged_in:
                 raise ClientIsLoggedIn
@@ -61,5 +58,4 @@ class Quit(Action):
                 )
             )
 
-            sleep(sleep_time)
             client.disconnect()
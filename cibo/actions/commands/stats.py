@@ -0,0 +1,88 @@
+"""Shows admins how long each action and event has been taking to process, or starts
+the stats over with a new window.
+"""
+
+from typing import List, Optional
+
+from rich.table import Table
+
+from cibo.actions import Action
+from cibo.exceptions import CommandUnrecognized
+from cibo.models.client import Client
+from cibo.models.message import Message, MessageRoute
+from cibo.utils.latency_stats import LatencyStats
+
+
+class Stats(Action):
+    """Shows admins how long each action and event has been taking to process, or
+    starts the stats over with a new window.
+    """
+
+    def aliases(self) -> List[str]:
+        return ["stats"]
+
+    def required_args(self) -> List[str]:
+        return []
+
+    @property
+    def _latency_stats(self) -> LatencyStats:
+        return self._server_config.latency_stats
+
+    def _stats_message(self) -> Message:
+        """The latency of each action and event, slowest first."""
+
+        table = Table(
+            title=f"Latency over the last {self._latency_stats.window:.0f}s (ms)",
+            title_justify="left",
+        )
+
+        for column in ["name", "count", "errors", "p50", "p95", "p99", "max"]:
+            table.add_column(column, justify="left" if column == "name" else "right")
+
+        histograms = sorted(
+            self._latency_stats.histograms.items(),
+            key=lambda item: item[1].percentile(95),
+            reverse=True,
+        )
+
+        for name, histogram in histograms:
+            table.add_row(
+                name,
+                str(histogram.count),
+                str(histogram.errors),
+                *[
+                    f"{seconds * 1000:.2f}"
+                    for seconds in (
+                        histogram.percentile(50),
+                        histogram.percentile(95),
+                        histogram.percentile(99),
+                        histogram.max,
+                    )
+                ],
+            )
+
+        return Message(table)
+
+    @property
+    def _reset_message(self) -> Message:
+        """The stats were started over."""
+
+        return Message("The stats have been reset.")
+
+    def process(self, client: Client, command: Optional[str], args: List[str]) -> None:
+        # as far as anyone else is concerned, the command doesn't exist
+        if (
+            not client.is_logged_in
+            or client.player.name not in self._server_config.admins
+        ):
+            raise CommandUnrecognized(str(command))
+
+        if args and args[0] == "reset":
+            self._latency_stats.reset()
+
+            self.comms.send_to_client(MessageRoute(self._reset_message, client=client))
+
+        else:
+            self.comms.send_to_client(
+                MessageRoute(self._stats_message(), client=client)
+            )
@@ -0,0 +1,240 @@
+"""An event-driven Telnet server, built on asyncio streams. Sends the same `blinker`
+signals as the threaded TelnetServer, so events are processed identically no matter
+which backend is in use.
+
+Rather than polling sockets in a loop, each connection is serviced by its own
+coroutine that wakes only when data actually arrives. The commands clients send are
+run by a single dispatcher, which takes turns between them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from cibo.models.client import ClientLoginState, StreamClient
+from cibo.models.data.player import Player
+from cibo.models.event import EventPayload
+from cibo.telnet import TelnetServer
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.admission import Admission
+from cibo.utils.loop_stats import LoopPhase
+from cibo.utils.tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTelnetServer(TelnetServer):
+    """A Telnet server, driven by an asyncio event loop.
+
+    Once started within a running event loop, the server will listen for clients
+    connecting using Telnet. Messages can then be sent to and from multiple connected
+    clients.
+
+    Args:
+        port (int): Port the server will listen to.
+        config (Optional[TelnetConfig], optional): Settings that control how clients
+            are treated. Defaults to None, which uses the default settings.
+    """
+
+    def __init__(self, port: int, config: Optional[TelnetConfig] = None) -> None:
+        super().__init__(port, config)
+
+        self._server: Optional[asyncio.Server] = None
+        self._idle_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+        # set whenever a client queues commands, to wake the dispatcher
+        self._commands_queued = asyncio.Event()
+
+    def listen(self) -> None:
+        """Configure the socket and begin listening. Connections won't be accepted
+        until the server is started within an event loop.
+        """
+
+        self._acceptor.listen()
+
+    async def start(self) -> None:
+        """Start accepting connections on the running event loop."""
+
+        if not self._acceptor.socket:
+            self.listen()
+
+        # the event belongs to the first event loop that waits on it, so each start
+        # gets a fresh one
+        self._commands_queued = asyncio.Event()
+
+        # the event loop drains the listen backlog itself, accepting up to the
+        # backlog's worth of connections each time the socket is ready
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            sock=self._acceptor.socket,
+            backlog=self._config.listen_backlog,
+        )
+
+        self._dispatch_task = asyncio.create_task(self._dispatch_commands())
+
+        if self._config.idle_timeout:
+            self._idle_task = asyncio.create_task(self._watch_idle())
+
+    def update(self, timeout: float = 0) -> None:
+        """Connections are serviced by the event loop as soon as data arrives, so
+        there is nothing to poll for.
+
+        Args:
+            timeout (float, optional): Unused. Defaults to 0.
+        """
+
+        pass
+
+    def flush(self) -> None:
+        """Hand each client's queued output over to their stream, which sends it as
+        soon as the client's socket is ready.
+        """
+
+        for client in self._clients:
+            if client.is_output_pending:
+                with tracer.finish(client, "stream write"):
+                    client.flush()
+
+    def shutdown(self) -> None:
+        """Closes down the server, disconnecting all clients and closing the listen
+        socket. The server can be started again afterwards, with 'start'.
+        """
+
+        for client in self._clients:
+            client.disconnect()
+
+        for task in [self._dispatch_task, self._idle_task]:
+            if task:
+                task.cancel()
+
+        if self._server:
+            self._server.close()
+
+        # the listen socket was closed along with the server, so a fresh one is
+        # needed to start again
+        self._acceptor.close()
+
+    async def wait_closed(self) -> None:
+        """Wait until the server and all client connections have been closed."""
+
+        if self._server:
+            await self._server.wait_closed()
+
+        # give each connection coroutine the chance to process its disconnect
+        while self._clients:
+            await asyncio.sleep(0)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Services a single client connection, from connect until disconnect.
+
+        Args:
+            reader (asyncio.StreamReader): The stream the client's input arrives on.
+            writer (asyncio.StreamWriter): The stream used to send to the client.
+        """
+
+        address = writer.get_extra_info("peername")[0]
+        self._acceptor.record(1)
+
+        # turn the connection away before any client is set up for it
+        if not self._acceptor.admission.admit(address):
+            writer.write(Admission.REJECTION_BANNER)
+            writer.close()
+            return
+
+        self._acceptor.configure(writer.get_extra_info("socket"))
+
+        new_client = StreamClient(
+            socket=writer.get_extra_info("socket"),
+            address=address,
+            encoding=self._encoding,
+            last_activity=time.time(),
+            login_state=ClientLoginState.PRE_LOGIN,
+            registration=Player(),
+            player=Player(),
+            parser=self._create_parser(),
+            outbox=self._create_outbox(),
+            commands=self._create_command_queue(),
+            writer=writer,
+        )
+
+        self._clients.append(new_client)
+        self._idle_deadlines.add(new_client)
+
+        self._offer_options(new_client)
+        self._connect_signal.send(self, payload=EventPayload(new_client))
+        self.flush()
+
+        try:
+            # an empty read means the client closed the connection on their end
+            while raw_data := await reader.read(4096):
+                self._traffic_stats.bytes_received += len(raw_data)
+
+                lines = new_client.parser.feed(raw_data)
+                self._negotiate_options(new_client)
+                self._queue_input(new_client, lines)
+                self._commands_queued.set()
+
+                # send any warning about dropped commands straight away
+                new_client.flush()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self._clients.remove(new_client)
+            self._idle_deadlines.remove(new_client)
+            self._scheduler.remove(new_client)
+            tracer.close(new_client)
+            self._disconnect_signal.send(self, payload=EventPayload(new_client))
+
+            writer.close()
+
+    async def _dispatch_commands(self) -> None:
+        """Run the commands clients have queued, a few from each client at a time.
+        Between each batch the other connections get the chance to read, so their
+        commands join the next batch rather than waiting behind a backlog.
+        """
+
+        while True:
+            await self._commands_queued.wait()
+            self._commands_queued.clear()
+
+            while self._scheduler:
+                # each command is already guarded, but anything else escaping the
+                # batch would end this task, and no client's input would run again
+                try:
+                    with self._loop_stats.measure(LoopPhase.INPUT):
+                        self._process_commands()
+
+                    # send everything the commands produced, for every client, in
+                    # one go
+                    with self._loop_stats.measure(LoopPhase.FLUSH):
+                        self.flush()
+
+                except Exception:
+                    logger.exception("Error dispatching commands")
+
+                await asyncio.sleep(0)
+
+    async def _watch_idle(self) -> None:
+        """Disconnect clients as their idle deadline passes. The stream closing ends
+        their connection coroutine, which cleans up after them.
+        """
+
+        while True:
+            for client in self._idle_deadlines.pop_expired(time.time()):
+                client.disconnect()
+
+            # nothing can expire before the earliest deadline, since new clients
+            # always get a later one
+            next_deadline = self._idle_deadlines.next_deadline
+
+            await asyncio.sleep(
+                self._config.idle_timeout
+                if next_deadline is None
+                else max(0.0, next_deadline - time.time())
+            )
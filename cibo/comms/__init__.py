@@ -24,11 +24,13 @@ class Comm(ABC):
         self._entities = entity_interface
 
     @abstractmethod
-    def _format(self, message: Message) -> str:  # pytest: no cover
+    def _format(self, message: Message, terminal_width: int) -> str:  # pytest: no cover
         """Formats the message, returning it as a string.
 
         Args:
             message (Message): The message object to format.
+            terminal_width (int): The width of the recipient's terminal. The message
+                is only rendered once for each width.
 
         Returns:
             str: The formatted and stringified message.
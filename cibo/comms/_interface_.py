@@ -3,7 +3,7 @@ Different comms types will target different clients, depending on the routing
 supplied.
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from cibo.comms.private import Private
 from cibo.comms.region import Region
@@ -47,6 +47,19 @@ class CommsInterface:
 
         client.send_prompt()
 
+    def send_data(self, client: Client, package: str, data: Any) -> None:
+        """Sends structured data to the specified client, out-of-band. Only clients
+        who've agreed to GMCP receive it, everyone else gets the same information from
+        the messages they're sent.
+
+        Args:
+            client (Client): The client to send to.
+            package (str): What the data is, e.g. "Room.Info".
+            data (Any): The data, which must serialize to JSON.
+        """
+
+        client.send_gmcp(package, data)
+
     def send_to_client(self, message: MessageRoute) -> None:
         """Sends a private message, to a specific client.
 
@@ -8,12 +8,14 @@ from cibo.models.message import Message, MessageRoute
 class Private(Comm):
     """Sends a private message, to a specific client."""
 
-    def _format(self, message: Message) -> str:
-        return f"\n{message}"
+    def _format(self, message: Message, terminal_width: int) -> str:
+        return f"\n{message.render(terminal_width)}"
 
     def send(self, message: MessageRoute) -> None:
         if message.client:
-            message.client.send_message(self._format(message.message))
+            message.client.send_message(
+                self._format(message.message, message.client.terminal_width)
+            )
 
             if message.send_prompt:
                 message.client.send_prompt()
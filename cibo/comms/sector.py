@@ -9,8 +9,8 @@ class Sector(Comm):
     """Sends a message to clients whose player is currently located within the
     supplied sector ID(s)."""
 
-    def _format(self, message: Message) -> str:
-        return f"\r{message}"
+    def _format(self, message: Message, terminal_width: int) -> str:
+        return f"\r{message.render(terminal_width)}"
 
     def send(self, message: MessageRoute) -> None:
         for client in self._telnet.get_connected_clients():
@@ -21,7 +21,10 @@ class Sector(Comm):
                     room.sector.id_ in message.ids
                     and client not in message.ignored_clients
                 ):
-                    client.send_message(self._format(message.message))
+                    client.send_message(
+                        self._format(message.message, client.terminal_width),
+                        low_priority=True,
+                    )
 
                     if message.send_prompt:
-                        client.send_prompt()
+                        client.send_prompt(low_priority=True)
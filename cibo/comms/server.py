@@ -11,13 +11,16 @@ class Server(Comm):
     player session.
     """
 
-    def _format(self, message: Message) -> str:
-        return f"\r{message}"
+    def _format(self, message: Message, terminal_width: int) -> str:
+        return f"\r{message.render(terminal_width)}"
 
     def send(self, message: MessageRoute) -> None:
         for client in self._telnet.get_connected_clients():
             if client.is_logged_in and client not in message.ignored_clients:
-                client.send_message(self._format(message.message))
+                client.send_message(
+                    self._format(message.message, client.terminal_width),
+                    low_priority=True,
+                )
 
                 if message.send_prompt:
-                    client.send_prompt()
+                    client.send_prompt(low_priority=True)
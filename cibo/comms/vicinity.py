@@ -24,7 +24,9 @@ class Vicinity(Comm):
         self._private = Private(telnet, entity_interface)
         self._room = Room(telnet, entity_interface)
 
-    def _format(self, _message: Message) -> str:  # pytest: no cover
+    def _format(
+        self, _message: Message, _terminal_width: int
+    ) -> str:  # pytest: no cover
         return str()
 
     def send(
@@ -0,0 +1,207 @@
+"""Reloads the server's code without dropping any connections, known to MUDs as a
+"copyover". Each client's session is written to a handoff file, and the process is
+replaced with a fresh interpreter that inherits their sockets. The new server reads
+the handoff file back, and carries on serving the same clients.
+
+Players who are logged in stay logged in, and anything they'd typed or were still to
+be sent carries over too.
+"""
+
+import json
+import os
+import sys
+from base64 import b64decode, b64encode
+from dataclasses import asdict, dataclass, field
+from typing import List, NoReturn, Optional
+
+from cibo.models.client import Client
+from cibo.models.data.player import Player
+from cibo.models.websocket_client import WebSocketClient
+
+
+@dataclass
+class ClientHandoff:
+    """A client's session, as it's handed off to the new server."""
+
+    fileno: int
+    address: str
+
+    # the player the client is logged in as, if any. The player is saved before the
+    # handoff, and loaded again afterwards
+    player_id: Optional[int]
+
+    terminal_width: int
+    gmcp_enabled: bool = False
+
+    # a WebSocket client, and whether their handshake was done. Frames that haven't
+    # finished arriving, and the fragments of a message that hasn't, are handed off
+    # as well. Bytes are base64 encoded
+    websocket: bool = False
+    websocket_open: bool = False
+    unfinished_frames: str = ""
+    unfinished_message: str = ""
+    unfinished_message_is_text: bool = False
+
+    # input that hasn't made it into a command yet, commands that are still waiting
+    # to be run, and output still waiting to be sent. Bytes are base64 encoded
+    unfinished_input: str = ""
+    commands: List[str] = field(default_factory=list)
+    output: str = ""
+
+    @classmethod
+    def from_client(cls, client: Client) -> "ClientHandoff":
+        """Capture the client's session. Their socket is handed off along with it, so
+        the client can't be used afterwards.
+
+        Args:
+            client (Client): The client.
+
+        Returns:
+            ClientHandoff: The session.
+        """
+
+        # a new process can't pick up where the compressor left off, so the stream
+        # is ended here and started again afterwards
+        client.outbox.stop_compression()
+
+        unfinished_frames, unfinished_message, unfinished_message_is_text = (
+            (client.frames.buffer, *client.frames.unfinished_message)
+            if isinstance(client, WebSocketClient)
+            else (b"", b"", False)
+        )
+
+        commands = []
+
+        while client.commands:
+            commands.append(client.commands.pop())
+
+        # the socket is left open for the new process to inherit
+        client.socket.set_inheritable(True)
+
+        return cls(
+            fileno=client.socket.detach(),
+            address=client.address,
+            player_id=client.player.id_ if client.is_logged_in else None,
+            terminal_width=client.terminal_width,
+            gmcp_enabled=client.gmcp_enabled,
+            websocket=isinstance(client, WebSocketClient),
+            websocket_open=isinstance(client, WebSocketClient) and client.is_open,
+            unfinished_frames=b64encode(unfinished_frames).decode("ascii"),
+            unfinished_message=b64encode(unfinished_message).decode("ascii"),
+            unfinished_message_is_text=unfinished_message_is_text,
+            unfinished_input=b64encode(client.parser.buffer.data).decode("ascii"),
+            commands=commands,
+            # the output hasn't been sent yet, the new server sends it
+            output=b64encode(client.outbox.take(count_sent=False)).decode("ascii"),
+        )
+
+    def restore_to(self, client: Client) -> None:
+        """Restore the session to the client that now holds it.
+
+        Args:
+            client (Client): The client, newly created by the new server.
+        """
+
+        player = (
+            Player.get_or_none(Player.id_ == self.player_id)
+            if self.player_id is not None
+            else None
+        )
+
+        if player:
+            client.log_in(player)
+
+        client.terminal_width = self.terminal_width
+        client.gmcp_enabled = self.gmcp_enabled
+
+        for command in self.commands:
+            client.commands.push(command)
+
+        if isinstance(client, WebSocketClient):
+            client.frames.is_open = self.websocket_open
+            client.frames.buffer += b64decode(self.unfinished_frames)
+            client.frames.unfinished_message = (
+                b64decode(self.unfinished_message),
+                self.unfinished_message_is_text,
+            )
+
+        client.parser.buffer.data += b64decode(self.unfinished_input)
+
+        client.send_data(b64decode(self.output))
+
+
+@dataclass
+class Handoff:
+    """Everything the new server needs, to carry on from the old one."""
+
+    listen_fileno: Optional[int]
+    websocket_listen_fileno: Optional[int]
+    clients: List[ClientHandoff]
+
+
+class Copyover:
+    """Writes and reads the handoff file, and replaces the running process with a
+    fresh one.
+
+    Args:
+        path (str): Where the handoff file is written.
+    """
+
+    # set in the new process's environment, so it knows to pick up the handoff
+    ENVIRONMENT_VARIABLE = "CIBO_COPYOVER_PATH"
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    @classmethod
+    def pending(cls) -> Optional["Copyover"]:
+        """Check if this process was started by a copyover.
+
+        Returns:
+            Optional[Copyover]: The copyover to pick up, or None if there isn't one.
+        """
+
+        path = os.environ.pop(cls.ENVIRONMENT_VARIABLE, None)
+
+        return cls(path) if path else None
+
+    def save(self, handoff: Handoff) -> None:
+        """Write the handoff file.
+
+        Args:
+            handoff (Handoff): The handoff.
+        """
+
+        with open(self._path, "w", encoding="utf-8") as handoff_file:
+            json.dump(asdict(handoff), handoff_file)
+
+    def load(self) -> Handoff:
+        """Read the handoff file, and remove it so it can't be picked up twice.
+
+        Returns:
+            Handoff: The handoff.
+        """
+
+        with open(self._path, encoding="utf-8") as handoff_file:
+            data = json.load(handoff_file)
+
+        os.remove(self._path)
+
+        return Handoff(
+            listen_fileno=data["listen_fileno"],
+            websocket_listen_fileno=data["websocket_listen_fileno"],
+            clients=[ClientHandoff(**client) for client in data["clients"]],
+        )
+
+    def execute(self) -> NoReturn:  # pytest: no cover
+        """Replace the running process with a fresh interpreter, started the same way
+        this one was. The sockets handed off are inherited by it.
+        """
+
+        os.environ[self.ENVIRONMENT_VARIABLE] = self._path
+
+        # anything still buffered would be lost along with the process
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
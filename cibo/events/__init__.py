@@ -13,6 +13,7 @@ from blinker import signal
 
 from cibo.models.event import EventPayload
 from cibo.server_config import ServerConfig
+from cibo.utils.tracer import tracer
 
 
 class Event(ABC):
@@ -32,7 +33,20 @@ class Event(ABC):
 
         self.signal_name = signal_name
         self._signal = signal(self.signal_name)
-        self._signal.connect(self.process)
+        self._signal.connect(self.receive)
+
+    def receive(self, sender: Any, payload: Optional[EventPayload] = None) -> None:
+        """Processes the event when its signal is sent, timing how long it takes.
+
+        Args:
+            sender (Any): Whatever sent the signal.
+            payload (Optional[EventPayload], optional): The event payload, if there
+                is one. Defaults to None.
+        """
+
+        with self._server_config.latency_stats.measure(self.signal_name):
+            with tracer.span(self.signal_name):
+                self.process(sender, payload)
 
     @abstractmethod
     def process(
@@ -0,0 +1,374 @@
+"""Serves the server's metrics over HTTP, in the Prometheus text format, so they can be
+scraped alongside everything else we monitor.
+
+The endpoint runs on a thread of its own, using the standard library's http.server.
+A scrape only reads the stats the game loop already keeps, so it never holds the loop
+up. The numbers can be a moment out of step with each other, which is close enough
+for monitoring.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from cibo.models.client import ClientLoginState
+from cibo.models.data import database
+from cibo.models.message import render_stats
+from cibo.server_config import ServerConfig
+from cibo.utils.latency_stats import BUCKETS
+from cibo.utils.loop_stats import PhaseStats
+from cibo.utils.tick_clock import TickStats
+
+# a sample's name suffix, labels, and value
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Metrics:
+    """Collects the server's stats, and renders them in the Prometheus text format.
+
+    Args:
+        server_config (ServerConfig): The server configuration object.
+        tick_stats (TickStats): How well the ticks are keeping to their schedule.
+    """
+
+    def __init__(self, server_config: ServerConfig, tick_stats: TickStats) -> None:
+        self._server_config = server_config
+        self._telnet = server_config.telnet
+        self._tick_stats = tick_stats
+
+        self._lines: List[str] = []
+
+    def render(self) -> str:
+        """Render every metric, ready to be scraped.
+
+        Returns:
+            str: The metrics, in the Prometheus text format.
+        """
+
+        self._lines = []
+
+        self._render_clients()
+        self._render_traffic()
+        self._render_loop()
+        self._render_ticks()
+        self._render_latency()
+
+        self._add_summary(
+            "cibo_db_query_seconds",
+            "Queries run against the database.",
+            database.query_stats,
+        )
+        self._add_summary(
+            "cibo_render_seconds",
+            "Messages rendered, not counting those already cached.",
+            render_stats,
+        )
+
+        return "\n".join(self._lines) + "\n"
+
+    def _add(self, name: str, type_: str, help_: str, samples: List[Sample]) -> None:
+        """Add a metric, along with its help and type.
+
+        Args:
+            name (str): The metric name.
+            type_ (str): The metric type, e.g. "counter".
+            help_ (str): What the metric measures.
+            samples (List[Sample]): The metric's samples.
+        """
+
+        self._lines.append(f"# HELP {name} {help_}")
+        self._lines.append(f"# TYPE {name} {type_}")
+
+        for suffix, labels, value in samples:
+            formatted_labels = ",".join(
+                f'{label}="{self._escape(label_value)}"'
+                for label, label_value in labels.items()
+            )
+
+            if formatted_labels:
+                formatted_labels = f"{{{formatted_labels}}}"
+
+            self._lines.append(f"{name}{suffix}{formatted_labels} {value}")
+
+    def _add_summary(self, name: str, help_: str, stats: PhaseStats) -> None:
+        """Add a summary of how many times something ran, and the total time it took.
+
+        Args:
+            name (str): The metric name.
+            help_ (str): What the metric measures.
+            stats (PhaseStats): The stats to summarize.
+        """
+
+        self._add(
+            name,
+            "summary",
+            help_,
+            [("_sum", {}, stats.total), ("_count", {}, stats.count)],
+        )
+
+    def _escape(self, label_value: str) -> str:
+        """Escape a label value, so it can be quoted.
+
+        Args:
+            label_value (str): The label value.
+
+        Returns:
+            str: The escaped label value.
+        """
+
+        return (
+            label_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+
+    def _render_clients(self) -> None:
+        """The connected clients, and how much they have waiting on the server."""
+
+        # the game loop may add or remove a client while we're counting
+        clients = list(self._telnet.get_connected_clients())
+
+        self._add(
+            "cibo_clients",
+            "gauge",
+            "Clients connected, by login state.",
+            [
+                (
+                    "",
+                    {"state": state.name.lower()},
+                    sum(client.login_state is state for client in clients),
+                )
+                for state in ClientLoginState
+            ],
+        )
+        self._add(
+            "cibo_queued_commands",
+            "gauge",
+            "Commands waiting to be run, across every client.",
+            [("", {}, sum(len(client.commands) for client in clients))],
+        )
+        self._add(
+            "cibo_queued_output_bytes",
+            "gauge",
+            "Output waiting to be sent, across every client.",
+            [("", {}, sum(len(client.outbox) for client in clients))],
+        )
+        self._add(
+            "cibo_pending_timers",
+            "gauge",
+            "Timers waiting to run.",
+            [("", {}, len(self._server_config.timers))],
+        )
+
+    def _render_traffic(self) -> None:
+        """The input and output that's passed between the server and its clients."""
+
+        traffic_stats = self._telnet.traffic_stats
+
+        self._add(
+            "cibo_inputs_total",
+            "counter",
+            "Lines of input run as commands.",
+            [("", {}, traffic_stats.inputs)],
+        )
+        self._add(
+            "cibo_dropped_lines_total",
+            "counter",
+            "Lines of input dropped, for arriving too many at once.",
+            [("", {}, traffic_stats.dropped_lines)],
+        )
+        self._add(
+            "cibo_received_bytes_total",
+            "counter",
+            "Bytes read from the clients.",
+            [("", {}, traffic_stats.bytes_received)],
+        )
+        self._add(
+            "cibo_sent_bytes_total",
+            "counter",
+            "Bytes sent to the clients.",
+            [("", {}, traffic_stats.bytes_sent)],
+        )
+
+    def _render_loop(self) -> None:
+        """How long each phase of the game loop has been taking."""
+
+        phases = self._telnet.loop_stats.phases
+
+        self._add(
+            "cibo_loop_phase_seconds",
+            "summary",
+            "Time spent in each phase of the game loop.",
+            [
+                sample
+                for phase, stats in phases.items()
+                for sample in (
+                    ("_sum", {"phase": phase.value}, stats.total),
+                    ("_count", {"phase": phase.value}, stats.count),
+                )
+            ],
+        )
+        self._add(
+            "cibo_loop_phase_max_seconds",
+            "gauge",
+            "The longest a single run of each phase of the game loop has taken.",
+            [
+                ("", {"phase": phase.value}, stats.max)
+                for phase, stats in phases.items()
+            ],
+        )
+
+    def _render_ticks(self) -> None:
+        """How well the ticks are keeping to their schedule."""
+
+        counters = {
+            "cibo_ticks_total": ("Ticks run.", self._tick_stats.ticks),
+            "cibo_caught_up_ticks_total": (
+                "Ticks run back to back, to catch up.",
+                self._tick_stats.caught_up_ticks,
+            ),
+            "cibo_skipped_ticks_total": (
+                "Ticks skipped, after falling too far behind.",
+                self._tick_stats.skipped_ticks,
+            ),
+            "cibo_tick_overruns_total": (
+                "Ticks that took longer than the time between ticks.",
+                self._tick_stats.overruns,
+            ),
+        }
+
+        for name, (help_, value) in counters.items():
+            self._add(name, "counter", help_, [("", {}, value)])
+
+        self._add(
+            "cibo_tick_lag_seconds",
+            "gauge",
+            "How late the most recent ticks were.",
+            [("", {}, self._tick_stats.lag)],
+        )
+
+    def _render_latency(self) -> None:
+        """How long each action and event takes to process. Resetting the stats
+        resets these too, which Prometheus treats the same as a restart.
+        """
+
+        histograms = list(self._server_config.latency_stats.histograms.items())
+        samples: List[Sample] = []
+
+        for name, histogram in histograms:
+            cumulative = 0
+
+            for bound, count in zip([*BUCKETS, "+Inf"], histogram.counts):
+                cumulative += count
+                samples.append(
+                    ("_bucket", {"name": name, "le": str(bound)}, cumulative)
+                )
+
+            samples.append(("_sum", {"name": name}, histogram.total))
+            samples.append(("_count", {"name": name}, histogram.count))
+
+        self._add(
+            "cibo_process_seconds",
+            "histogram",
+            "Time taken to process each action and event.",
+            samples,
+        )
+        self._add(
+            "cibo_process_errors_total",
+            "counter",
+            "Actions and events that raised an error.",
+            [("", {"name": name}, histogram.errors) for name, histogram in histograms],
+        )
+
+
+class MetricsHTTPServer(ThreadingHTTPServer):
+    """An HTTP server, that holds on to the metrics it serves.
+
+    Args:
+        address (Tuple[str, int]): The address and port to listen on.
+        metrics (Metrics): The metrics to serve.
+    """
+
+    def __init__(self, address: Tuple[str, int], metrics: Metrics) -> None:
+        super().__init__(address, MetricsHandler)
+
+        self.metrics = metrics
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Answers scrapes of the metrics endpoint."""
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Respond with the metrics, if they're what was asked for."""
+
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = cast(MetricsHTTPServer, self.server).metrics.render().encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        # scrapes happen every few seconds, so logging each one is just noise
+        pass
+
+
+class MetricsServer:
+    """Serves the metrics over HTTP, on a thread of its own.
+
+    Args:
+        port (int): Port the endpoint will listen to. Zero lets the OS pick.
+        metrics (Metrics): The metrics to serve.
+        address (str, optional): The address the endpoint will listen on. Defaults
+            to "127.0.0.1", so it's only reachable locally.
+    """
+
+    def __init__(self, port: int, metrics: Metrics, address: str = "127.0.0.1") -> None:
+        self._port = port
+        self._address = address
+        self._metrics = metrics
+
+        self._http_server: Optional[MetricsHTTPServer] = None
+        self._thread: Optional[Thread] = None
+
+    @property
+    def port(self) -> int:
+        """The port the endpoint is listening to.
+
+        Returns:
+            int: The port number.
+        """
+
+        if self._http_server:
+            return self._http_server.server_address[1]
+
+        return self._port
+
+    def start(self) -> None:
+        """Start listening, and answering scrapes in the background."""
+
+        if self._http_server:
+            return
+
+        self._http_server = MetricsHTTPServer(
+            (self._address, self._port), self._metrics
+        )
+
+        # a scrape that's underway shouldn't keep the process alive
+        self._thread = Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop listening, and wait for the background thread to finish."""
+
+        if self._http_server and self._thread:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._thread.join()
+
+        self._http_server = None
+        self._thread = None
@@ -4,11 +4,18 @@ out interactions between the user and the server.
 """
 
 import socket as socket_
-from dataclasses import dataclass
+from asyncio import StreamWriter
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Any, Callable, Optional
 
 from cibo.models.data.player import Player
 from cibo.models.prompt import Prompt
+from cibo.utils.command_queue import CommandQueue
+from cibo.utils.outbox import Outbox
+from cibo.utils.telnet_message import TelnetMessage
+from cibo.utils.telnet_parser import TelnetParser
+from cibo.utils.tracer import tracer
 
 
 class ClientLoginState(int, Enum):
@@ -22,14 +29,36 @@ class ClientLoginState(int, Enum):
 class Client:
     """Represents a client connected to the server."""
 
+    # how many columns are left unused, at the edge of the client's terminal
+    TERMINAL_MARGIN = 4
+
+    # the narrowest and widest output we'll render, however big the terminal is
+    MIN_TERMINAL_WIDTH = 20
+    MAX_TERMINAL_WIDTH = 250
+
     socket: socket_.socket
     address: str
     encoding: str
-    buffer: str
-    last_check: float
+    last_activity: float
     login_state: ClientLoginState
     registration: Player
     player: Player
+    parser: TelnetParser = field(
+        default_factory=TelnetParser, repr=False, compare=False
+    )
+    outbox: Outbox = field(default_factory=Outbox, repr=False, compare=False)
+    commands: CommandQueue = field(
+        default_factory=CommandQueue, repr=False, compare=False
+    )
+    terminal_width: int = field(default=76, compare=False)
+    gmcp_enabled: bool = field(default=False, compare=False)
+    on_disconnect: Optional[Callable[["Client"], None]] = field(
+        default=None, repr=False, compare=False
+    )
+    prompt_pending: bool = field(default=False, init=False, repr=False, compare=False)
+    prompt_low_priority: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
 
     @property
     def is_logged_in(self) -> bool:
@@ -59,35 +88,181 @@ class Client:
             Prompt: The prompt object.
         """
 
-        return Prompt("> ")
+        return Prompt("> ", terminal_width=self.terminal_width)
+
+    @property
+    def handed_off(self) -> int:
+        """How much output has left the outbox, but is still waiting to be sent to the
+        client. A socket client's output stays in the outbox until it's sent.
+
+        Returns:
+            int: The number of bytes waiting.
+        """
+
+        return 0
+
+    @property
+    def backlog(self) -> int:
+        """How much output is waiting to be sent to the client.
+
+        Returns:
+            int: The number of bytes waiting.
+        """
+
+        return len(self.outbox) + self.handed_off
+
+    @property
+    def is_output_pending(self) -> bool:
+        """Check if the client has any output waiting to be flushed.
+
+        Returns:
+            bool: Is there output waiting or not.
+        """
+
+        return self.prompt_pending or bool(self.outbox)
 
-    def send_message(self, message: str) -> None:
-        """Sends the message text to the client. The text will be printed out in
-        the client's terminal.
+    def send_message(self, message: str, low_priority: bool = False) -> None:
+        """Queues the message text to be sent to the client, the next time their
+        socket is ready. The text will be printed out in the client's terminal.
 
         Args:
             message (str): The body text of the message.
+            low_priority (bool, optional): If the message can be dropped, when the
+                client is too far behind on reading. Defaults to False.
         """
 
-        try:
-            self.socket.sendall(bytearray(message, self.encoding))
+        with tracer.span("send_message"):
+            self.send_data(bytearray(message, self.encoding), low_priority)
 
-        # a socket error will be raised if the client has already disconnected,
-        # in which case we want to silently fail
-        except socket_.error:
-            return
+    def send_data(self, data: bytes, low_priority: bool = False) -> None:
+        """Queues raw data to be sent to the client, such as Telnet messages that
+        can't be encoded as text.
+
+        Args:
+            data (bytes): The data.
+            low_priority (bool, optional): If the data can be dropped, when the
+                client is too far behind on reading. Defaults to False.
+        """
+
+        if not self.outbox.queue(data, low_priority, self.handed_off):
+            # the client has fallen too far behind, so there's no point in trying to
+            # send them what's already queued
+            self.outbox.clear()
+            self.disconnect()
+
+    def send_prompt(self, low_priority: bool = False) -> None:
+        """Sends the prompt text to the client. The prompt is held back until the
+        output is flushed, so it always follows everything else sent in the same
+        cycle, and is only sent once no matter how many times it was asked for.
+
+        Args:
+            low_priority (bool, optional): If the prompt can be dropped, when the
+                client is too far behind on reading. Defaults to False.
+        """
+
+        # the prompt can only be dropped if every prompt it stands in for could be
+        if self.prompt_pending:
+            self.prompt_low_priority = self.prompt_low_priority and low_priority
+        else:
+            self.prompt_low_priority = low_priority
+
+        self.prompt_pending = True
+
+    def send_gmcp(self, package: str, data: Any) -> None:
+        """Sends structured data to the client out-of-band, if they've agreed to GMCP.
+        Their client can then draw maps and status bars from it, without scraping the
+        text.
+
+        Args:
+            package (str): What the data is, e.g. "Room.Info".
+            data (Any): The data, which must serialize to JSON.
+        """
+
+        if self.gmcp_enabled:
+            self.send_data(TelnetMessage.gmcp(package, data))
+
+    def negotiate(self, command: int, option: int) -> None:
+        """Act on a Telnet option negotiation sent by the client.
+
+        Args:
+            command (int): The negotiation command code.
+            option (int): The option code.
+        """
+
+        # the client has agreed to MCCP2, so everything we send from here on is
+        # compressed
+        if (
+            command == TelnetMessage.CommandCode.DO
+            and option == TelnetMessage.OptionCode.COMPRESS2
+        ):
+            self.outbox.start_compression(
+                TelnetMessage.subnegotiation(TelnetMessage.OptionCode.COMPRESS2)
+            )
+
+        # the client has agreed to, or turned down, structured data over GMCP
+        if option == TelnetMessage.OptionCode.GMCP:
+            self.gmcp_enabled = command == TelnetMessage.CommandCode.DO
+
+    def subnegotiate(self, option: int, data: bytes) -> None:
+        """Act on a Telnet subnegotiation sent by the client.
+
+        Args:
+            option (int): The option code.
+            data (bytes): The option data.
+        """
+
+        # the client's terminal size, sent as a 16-bit width then a 16-bit height.
+        # The margin leaves room for the terminal's own scrollbar and borders
+        if option == TelnetMessage.OptionCode.WINDOW_SIZE and len(data) >= 4:
+            columns = min(int.from_bytes(data[:2], "big"), self.MAX_TERMINAL_WIDTH)
+
+            if columns:
+                self.terminal_width = max(
+                    columns - self.TERMINAL_MARGIN, self.MIN_TERMINAL_WIDTH
+                )
+
+    def flush(self) -> None:
+        """Sends as much of the queued output as the client's socket will take,
+        without waiting.
 
-    def send_prompt(self) -> None:
-        """Sends the prompt text to the client."""
+        Raises:
+            OSError: The client has disconnected.
+        """
+
+        self._queue_prompt()
 
-        self.send_message(str(self.prompt))
+        if self.outbox:
+            self.outbox.write_to(self.socket)
 
     def disconnect(self) -> None:
         """Disconnect the client from the server."""
 
-        self.socket.shutdown(socket_.SHUT_RDWR)
+        # there's no one left to prompt for input, or to run commands for
+        self.prompt_pending = False
+        self.commands.clear()
+
+        # make a last attempt at sending anything that's queued, like a goodbye. If
+        # the client already dropped the connection on their end, just close it
+        try:
+            self.flush()
+            self.socket.shutdown(socket_.SHUT_RDWR)
+
+        except socket_.error:
+            pass
+
         self.socket.close()
 
+        # let the server know, so it can clean up after the client
+        if self.on_disconnect:
+            self.on_disconnect(self)
+
+    def _queue_prompt(self) -> None:
+        """Queue the pending prompt, behind the rest of the client's output."""
+
+        if self.prompt_pending:
+            self.prompt_pending = False
+            self.send_message(str(self.prompt), self.prompt_low_priority)
+
     def log_out(self) -> None:
         """Log the client out of their current player session."""
 
@@ -106,3 +281,49 @@ class Client:
 
         self.player = player
         self.login_state = ClientLoginState.LOGGED_IN
+
+
+@dataclass
+class StreamClient(Client):
+    """Represents a client connected to the server through an asyncio stream, rather
+    than a raw socket.
+    """
+
+    writer: StreamWriter = field(kw_only=True)
+
+    @property
+    def handed_off(self) -> int:
+        """How much output the stream is still holding on to, waiting to be sent to
+        the client.
+
+        Returns:
+            int: The number of bytes waiting.
+        """
+
+        return self.writer.transport.get_write_buffer_size()
+
+    def flush(self) -> None:
+        """Hands the queued output over to the stream, which sends it as soon as the
+        client's socket is ready.
+        """
+
+        self._queue_prompt()
+
+        # writing to a stream that is already closing is a no-op, same as sending to
+        # a disconnected socket
+        data = self.outbox.take()
+
+        if data and not self.writer.is_closing():
+            self.writer.write(data)
+
+    def disconnect(self) -> None:
+        """Disconnect the client from the server. The stream finishes sending anything
+        that's queued before it closes.
+        """
+
+        # there's no one left to prompt for input, or to run commands for
+        self.prompt_pending = False
+        self.commands.clear()
+
+        self.flush()
+        self.writer.close()
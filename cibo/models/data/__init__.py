@@ -1,12 +1,44 @@
 """Data models and schemas that are used to represent and validate a database object."""
 
+import time
 from os import getenv
-from typing import Any
+from typing import Any, Optional
 
 from marshmallow import Schema
 from peewee import Model as Model_
 from peewee import SqliteDatabase
 
+from cibo.utils.loop_stats import PhaseStats
+from cibo.utils.tracer import tracer
+
+
+# peewee leaves sequences unimplemented for SQLite, which doesn't have them
+class Database(SqliteDatabase):  # pylint: disable=abstract-method
+    """A SQLite database, that keeps count of the queries run against it and how long
+    they take.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.query_stats = PhaseStats()
+
+    def execute_sql(
+        self, sql: str, params: Optional[Any] = None, commit: Optional[Any] = None
+    ) -> Any:
+        start = time.perf_counter()
+
+        try:
+            with tracer.span("query", sql=sql):
+                return super().execute_sql(sql, params, commit)
+
+        finally:
+            self.query_stats.record(time.perf_counter() - start)
+
+
+# the database every data model is stored in
+database = Database(getenv("DATABASE_PATH"))
+
 
 class Model(Model_):
     """Base model for inheritance by other data models."""
@@ -14,7 +46,7 @@ class Model(Model_):
     class Meta:
         """Meta class that specifies the database."""
 
-        database = SqliteDatabase(getenv("DATABASE_PATH"))
+        database = database
 
     def validate(self, schema: type[Schema]) -> Any:
         """Validate the model instance's attributes against the provided schema.
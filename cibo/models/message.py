@@ -12,8 +12,9 @@ cibo's message formatter, visit:
     https://rich.readthedocs.io/en/stable/
 """
 
+import time
 from dataclasses import KW_ONLY, dataclass, field
-from typing import List, Literal, Optional, Union
+from typing import Dict, List, Literal, Optional, Union
 
 from rich.columns import Columns
 from rich.console import Console
@@ -25,6 +26,12 @@ from rich.table import Table
 from rich.tree import Tree
 
 from cibo.models.client import Client
+from cibo.utils.loop_stats import PhaseStats
+from cibo.utils.tracer import tracer
+
+# how many messages and prompts have been rendered, and how long rendering them took.
+# Renders that were already cached aren't counted
+render_stats = PhaseStats()
 
 
 @dataclass
@@ -38,18 +45,44 @@ class Message:
     highlight: bool = False
     terminal_width: int = 76
 
+    # each width the message has been rendered at, so a message sent to many clients
+    # is only rendered once per terminal width
+    _renders: Dict[int, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def __str__(self) -> str:
-        formatter = Console(
-            width=self.terminal_width, style=self.style, highlight=self.highlight
-        )
+        return self.render(self.terminal_width)
+
+    def render(self, terminal_width: int) -> str:
+        """Render the message to fit a terminal of the given width.
+
+        Args:
+            terminal_width (int): How many columns the message can take up.
+
+        Returns:
+            str: The rendered message.
+        """
+
+        if terminal_width not in self._renders:
+            start = time.perf_counter()
+
+            with tracer.span("render", terminal_width=terminal_width):
+                formatter = Console(
+                    width=terminal_width, style=self.style, highlight=self.highlight
+                )
+
+                with formatter.capture() as capture:
+                    padded_message = Padding(self.body, (0, 2))
+                    formatter.print(
+                        padded_message, end="", overflow="fold", justify=self.justify
+                    )
+
+                self._renders[terminal_width] = capture.get()
 
-        with formatter.capture() as capture:
-            padded_message = Padding(self.body, (0, 2))
-            formatter.print(
-                padded_message, end="", overflow="fold", justify=self.justify
-            )
+            render_stats.record(time.perf_counter() - start)
 
-        return capture.get()
+        return self._renders[terminal_width]
 
 
 @dataclass
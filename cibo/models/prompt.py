@@ -13,6 +13,7 @@ cibo's message formatter, visit:
 """
 
 from dataclasses import KW_ONLY, dataclass
+from functools import lru_cache
 
 from rich.console import Console
 
@@ -29,9 +30,25 @@ class Prompt:
         return f"\r\n{prompt}"
 
     def __str__(self) -> str:
-        formatter = Console(width=self.terminal_width)
+        return self._format(self._render(self.body, self.terminal_width))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _render(body: str, terminal_width: int) -> str:
+        """Render the prompt body. Every client shares the same few prompts, so each
+        is only rendered once per terminal width.
+
+        Args:
+            body (str): The prompt body.
+            terminal_width (int): How many columns the prompt can take up.
+
+        Returns:
+            str: The rendered prompt body.
+        """
+
+        formatter = Console(width=terminal_width)
 
         with formatter.capture() as capture:
-            formatter.print(self.body, end="", overflow="fold")
+            formatter.print(body, end="", overflow="fold")
 
-        return self._format(capture.get())
+        return capture.get()
@@ -3,7 +3,7 @@ occupy as well as navigate through.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from cibo.exceptions import ExitNotFound
 from cibo.models.description import RoomDescription
@@ -42,6 +42,21 @@ class Room:
 
         return sorted([exit_.direction.name.lower() for exit_ in self.exits])
 
+    def get_info(self) -> Dict[str, Any]:
+        """A compact summary of the room, for clients that draw their own map.
+
+        Returns:
+            Dict[str, Any]: The room's number, name, area, and the rooms each exit
+                leads to, keyed by their direction.
+        """
+
+        return {
+            "num": self.id_,
+            "name": self.name,
+            "area": self.sector.name,
+            "exits": {exit_.direction.value: exit_.id_ for exit_ in self.exits},
+        }
+
     def get_formatted_exits(self) -> str:
         """Formats the exits into a pretty, stylized string.
 
@@ -0,0 +1,82 @@
+"""A client connected from a web browser, over a WebSocket rather than Telnet. Once
+their messages are unwrapped, they're handled exactly like any other client's input.
+"""
+
+from dataclasses import dataclass, field
+
+from cibo.models.client import Client
+from cibo.utils.websocket_message import WebSocketMessage
+from cibo.utils.websocket_parser import WebSocketParser
+
+
+@dataclass
+class WebSocketClient(Client):
+    """Represents a client connected to the server from a web browser, over a
+    WebSocket.
+    """
+
+    frames: WebSocketParser = field(
+        default_factory=WebSocketParser, repr=False, compare=False
+    )
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the client has finished their opening handshake.
+
+        Returns:
+            bool: Is the WebSocket open or not.
+        """
+
+        return self.frames.is_open
+
+    def send_message(self, message: str, low_priority: bool = False) -> None:
+        """Queues the message text to be sent to the client, in its own frame.
+
+        Args:
+            message (str): The body text of the message.
+            low_priority (bool, optional): If the message can be dropped, when the
+                client is too far behind on reading. Defaults to False.
+        """
+
+        self.send_data(
+            WebSocketMessage.frame(
+                WebSocketMessage.OpCode.TEXT, message.encode(self.encoding)
+            ),
+            low_priority,
+        )
+
+    def receive(self, data: bytes) -> bytes:
+        """Unwrap the data the client sent, answering anything in it that needs an
+        answer, like their handshake or a ping.
+
+        Args:
+            data (bytes): The raw data, as it was read from the socket.
+
+        Returns:
+            bytes: The text of the messages the client sent.
+        """
+
+        text = self.frames.feed(data)
+        replies = self.frames.take_replies()
+
+        if replies:
+            self.send_data(replies)
+
+        # the client closed the WebSocket, or broke the protocol
+        if self.frames.is_closed:
+            self.disconnect()
+
+        return text
+
+    def disconnect(self) -> None:
+        """Disconnect the client from the server, letting them know why first."""
+
+        # the close frame goes out even if the client has fallen behind, since it's
+        # the last thing they'll be sent
+        if self.frames.is_open and not self.frames.is_closed:
+            self.frames.is_closed = True
+            self.outbox.queue(
+                WebSocketMessage.close(WebSocketMessage.CloseCode.GOING_AWAY)
+            )
+
+        super().disconnect()
@@ -2,20 +2,28 @@
 well as methods to control the server state.
 """
 
-import concurrent.futures
+import asyncio
+import logging
 from enum import Enum
-from os import getenv
 from threading import Thread
-from time import sleep
+from typing import Optional
 
 from blinker import signal
-from peewee import SqliteDatabase
 
+from cibo.async_telnet import AsyncTelnetServer
+from cibo.copyover import Copyover, Handoff
 from cibo.events._interface_ import EventInterface
+from cibo.metrics import Metrics, MetricsServer
+from cibo.models.data import database
 from cibo.models.data.item import Item
 from cibo.models.data.npc import Npc
 from cibo.models.data.player import Player
 from cibo.server_config import ServerConfig
+from cibo.utils.loop_stats import LoopPhase, LoopStats
+from cibo.utils.tick_clock import TickClock, TickStats
+from cibo.utils.tracer import tracer
+
+logger = logging.getLogger(__name__)
 
 
 class Server:
@@ -23,6 +31,9 @@ class Server:
     When a new event is received upon update, it calls upon the event processor to
     determine event type and then carry out the event logic.
 
+    If configured with an AsyncTelnetServer, the server and its ticks are instead
+    driven by an asyncio event loop, running within the main thread.
+
     Args:
         server_config (ServerConfig): The server configuration object.
     """
@@ -35,18 +46,40 @@ class Server:
         SHUTTING_DOWN = 3
         STOPPED = 4
 
+    # the longest the main loop will wait on the network, before carrying out its
+    # periodic housekeeping
+    POLL_TIMEOUT = 0.5
+
     def __init__(self, server_config: ServerConfig) -> None:
-        self._database = SqliteDatabase(getenv("DATABASE_PATH", "cibo_database.db"))
+        # the same database the data models are stored in
+        self._database = database
 
         self._telnet = server_config.telnet
 
         self._event_interface = EventInterface(server_config)
 
-        self._tick_thread = Thread(target=self._start_tick_timers)
-        self._main_thread = Thread(target=self._start_server)
+        # the ticks are kept to a fixed timestep, however long each one takes
+        self._tick_clock = TickClock(server_config.pulse_rate)
+
+        self._main_thread: Optional[Thread] = None
+
+        # the metrics endpoint is opt-in, and runs on a thread of its own
+        self._metrics_server: Optional[MetricsServer] = None
+
+        if server_config.metrics_port is not None:
+            self._metrics_server = MetricsServer(
+                server_config.metrics_port,
+                Metrics(server_config, self._tick_clock.stats),
+            )
+
+        self._trace_path = server_config.trace_path
+        self._trace_sample_rate = server_config.trace_sample_rate
 
         self._status = self.Status.STOPPED
 
+        # the sockets handed off by a copyover, to pick up in place of listening
+        self._handoff: Optional[Handoff] = None
+
     @property
     def is_running(self) -> bool:
         """Check if the server is active and listening.
@@ -57,13 +90,51 @@ class Server:
 
         return self._status is self.Status.RUNNING
 
-    def _start_tick_timers(self) -> None:
-        """Start the tick timers, that carry out scheduled actions."""
+    @property
+    def tick_stats(self) -> TickStats:
+        """How well the ticks are keeping to their schedule.
 
-        while self.is_running:
-            signal("event-tick").send()
+        Returns:
+            TickStats: The tick stats.
+        """
 
-            sleep(1)
+        return self._tick_clock.stats
+
+    @property
+    def loop_stats(self) -> LoopStats:
+        """How long each phase of the game loop has been taking.
+
+        Returns:
+            LoopStats: The loop stats.
+        """
+
+        return self._telnet.loop_stats
+
+    def _run_ticks(self) -> None:
+        """Send the tick event for every tick that's due, then send the output they
+        produced. If the loop fell behind, the ticks it missed are run back to back.
+        """
+
+        due = self._tick_clock.take_due()
+
+        if not due:
+            return
+
+        with self.loop_stats.measure(LoopPhase.TICKS) as phase:
+            for _ in range(due):
+                # an error in one tick is logged, rather than ending the game loop
+                try:
+                    signal("event-tick").send()
+
+                except Exception:
+                    logger.exception("Error running tick")
+
+        self._tick_clock.record(phase.last / due)
+
+        # the output the ticks produced goes out now, rather than waiting on the next
+        # update, which could be most of a pulse away
+        with self.loop_stats.measure(LoopPhase.FLUSH):
+            self._telnet.flush()
 
     def _start_server(self) -> None:
         """Start the telnet server and begin listening for events. Process any new
@@ -71,46 +142,148 @@ class Server:
         """
 
         self._status = self.Status.STARTING_UP
-        self._telnet.listen()
+
+        if self._handoff:
+            self._telnet.restore(self._handoff)
+        else:
+            self._telnet.listen()
+
         self._status = self.Status.RUNNING
 
         signal("event-spawn").send()
+        self._telnet.flush()
 
-        self._tick_thread.start()
+        # the ticks run on this same thread, between updates, so nothing else ever
+        # touches the clients while an update is handling them
+        self._tick_clock.start()
 
         while self.is_running:
-            client_count = len(self._telnet.get_connected_clients())
+            self._run_ticks()
 
-            # we use the client count to determine the max number of workers, so that
-            # we always scale up and down according to capacity
-            executor = concurrent.futures.ThreadPoolExecutor(
-                client_count if client_count else 1
+            # the update blocks until a socket is ready or the next tick is due, so
+            # input is handled as soon as it arrives rather than on a fixed interval
+            self._telnet.update(
+                timeout=min(self.POLL_TIMEOUT, self._tick_clock.time_until_tick())
             )
-            executor.submit(self._telnet.update)
 
-            sleep(0.05)
+    def _start_async_server(self) -> None:
+        """Start the asyncio event loop, and run the async telnet server within it."""
+
+        asyncio.run(self._run_async_server())
+
+    async def _run_async_server(self) -> None:
+        """Start the async telnet server, then drive the ticks from the event loop
+        until the server is stopped. Events are processed as soon as the event loop
+        receives them.
+        """
+
+        if not isinstance(self._telnet, AsyncTelnetServer):  # pytest: no cover
+            return
+
+        self._status = self.Status.STARTING_UP
+        await self._telnet.start()
+        self._status = self.Status.RUNNING
+
+        signal("event-spawn").send()
+        self._telnet.flush()
+
+        self._tick_clock.start()
+
+        while self.is_running:
+            self._run_ticks()
+
+            await asyncio.sleep(self._tick_clock.time_until_tick())
+
+        self._telnet.shutdown()
+        await self._telnet.wait_closed()
 
     def create_db(self) -> None:
-        """Create the sqlite DB and necessary tables."""
+        """Create the sqlite DB and necessary tables, if they don't already exist."""
 
-        self._database.connect()
-        self._database.create_tables([Player, Item, Npc])
+        # the connection is only held while the tables are created, so it's never
+        # shared with a worker process forked afterwards
+        with self._database.connection_context():
+            self._database.create_tables([Player, Item, Npc])
 
-    def start(self) -> None:
-        """Create a thread and start the server."""
+    def start(self, handoff: Optional[Handoff] = None) -> None:
+        """Create a thread and start the server.
+
+        Args:
+            handoff (Optional[Handoff], optional): Sockets handed off by a copyover,
+                to carry on serving. Defaults to None, which listens for new clients.
+        """
 
         if self._status is self.Status.STOPPED:
+            self._handoff = handoff
+
+            # a thread can only be started once, so each start gets a fresh one
+            self._main_thread = Thread(
+                target=self._start_async_server
+                if isinstance(self._telnet, AsyncTelnetServer)
+                else self._start_server
+            )
             self._main_thread.start()
 
+            if self._metrics_server:
+                self._metrics_server.start()
+
+            if self._trace_path:
+                tracer.start(self._trace_path, self._trace_sample_rate)
+
     def stop(self) -> None:
         """Stop the currently running server and end the thread."""
 
         if self.is_running and self._main_thread:
             self._status = self.Status.SHUTTING_DOWN
 
-            self._tick_thread.join()
-
-            self._telnet.shutdown()
+            # let the main loop finish its current update before the sockets are
+            # closed out from under it. The async server shuts itself down, from
+            # within its own event loop
             self._main_thread.join()
 
+            # the async server's clients are saved as their connections close
+            if not isinstance(self._telnet, AsyncTelnetServer):
+                self._save_players()
+                self._telnet.shutdown()
+
+            if self._metrics_server:
+                self._metrics_server.stop()
+
+            tracer.stop()
+
             self._status = self.Status.STOPPED
+
+    def copyover(self, copyover: Copyover) -> None:
+        """Reload the server's code without dropping any connections. The process is
+        replaced with a fresh one, which picks up the clients where they left off.
+        Only the selector-based telnet server supports it.
+
+        Args:
+            copyover (Copyover): Where to write the handoff file.
+        """
+
+        if not self.is_running or isinstance(self._telnet, AsyncTelnetServer):
+            return
+
+        self._status = self.Status.SHUTTING_DOWN
+
+        # let the main loop finish its current update, so no client is halfway
+        # through being handled
+        if self._main_thread:
+            self._main_thread.join()
+
+        self._save_players()
+
+        # the process is about to be replaced, so whatever's been traced is written
+        # out first
+        tracer.stop()
+
+        copyover.save(self._telnet.hand_off())
+        copyover.execute()
+
+    def _save_players(self) -> None:
+        """Save every logged in player, before their connection is let go of."""
+
+        for client in self._telnet.get_connected_clients():
+            if client.is_logged_in:
+                client.player.save()
@@ -2,11 +2,14 @@
 server needs to function, and to process actions and events.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 from cibo.comms._interface_ import CommsInterface
 from cibo.entities._interface_ import EntityInterface
 from cibo.telnet import TelnetServer
+from cibo.utils.latency_stats import LatencyStats
+from cibo.utils.timing_wheel import TimingWheel
 
 
 @dataclass
@@ -18,3 +21,29 @@ class ServerConfig:
     telnet: TelnetServer
     entity_interface: EntityInterface
     comms_interface: CommsInterface
+
+    # how many times a second the tick event is sent
+    pulse_rate: float = 10.0
+
+    # the names of the players allowed to use the admin commands
+    admins: List[str] = field(default_factory=list)
+
+    # the port to serve metrics on, for Prometheus to scrape. None leaves it off
+    metrics_port: Optional[int] = None
+
+    # the file to write traces to, and the fraction of inputs to trace. No path
+    # leaves tracing off
+    trace_path: Optional[str] = None
+    trace_sample_rate: float = 0.01
+
+    # the timers for anything that happens later, or over and over. The wheel moves
+    # on by one tick with each tick event
+    timers: TimingWheel = field(init=False, repr=False)
+
+    # how long each action and event takes to process
+    latency_stats: LatencyStats = field(
+        default_factory=LatencyStats, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self.timers = TimingWheel(tick_interval=1 / self.pulse_rate)
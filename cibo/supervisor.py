@@ -0,0 +1,173 @@
+"""Runs the server across several worker processes, to make use of more than one CPU
+core. Each worker binds the same port with SO_REUSEPORT, and the kernel spreads new
+connections across them.
+
+Every worker runs its own world. Players connected to different workers can't see each
+other, so this suits separate realms or test shards, rather than one shared world.
+"""
+
+import multiprocessing
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+from time import monotonic, sleep
+from typing import Callable, List, Optional
+
+
+class Supervisor:
+    """Starts the worker processes, keeps an eye on them, and restarts any that stop
+    unexpectedly.
+
+    A worker that keeps stopping soon after it's started is restarted less and less
+    often, so a worker that can't start doesn't tie up the CPU.
+
+    Args:
+        workers (int): How many worker processes to run.
+        target (Callable[[Event], None]): Runs a single worker. It's passed an event,
+            that is set once the worker should shut down.
+        restart_delay (float, optional): Seconds to wait before restarting a worker
+            that stopped. Doubles each time it stops again soon after, up to
+            MAX_RESTART_DELAY. Defaults to 1.0.
+    """
+
+    # how long to wait on a worker to shut down cleanly, before it's terminated
+    STOP_TIMEOUT = 10.0
+
+    # the longest a stopped worker waits to be restarted. A worker that stays up for
+    # at least this long starts over with the shortest delay, if it stops
+    MAX_RESTART_DELAY = 60.0
+
+    def __init__(
+        self,
+        workers: int,
+        target: Callable[[Event], None],
+        restart_delay: float = 1.0,
+    ) -> None:
+        self._target = target
+        self._restart_delay = restart_delay
+
+        self._context = multiprocessing.get_context()
+        self._stop_event = self._context.Event()
+        self._workers: List[Optional[BaseProcess]] = [None] * workers
+
+        # when each worker was last started, how many times in a row it's stopped
+        # soon after, and when it's due to be restarted if it's stopped
+        self._started_at = [0.0] * workers
+        self._failures = [0] * workers
+        self._restart_at: List[Optional[float]] = [None] * workers
+
+        self.restarts = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the workers have been started, and not yet stopped.
+
+        Returns:
+            bool: Are the workers running or not.
+        """
+
+        return any(self._workers) and not self._stop_event.is_set()
+
+    def start(self) -> None:
+        """Start each of the worker processes."""
+
+        self._stop_event.clear()
+
+        for index in range(len(self._workers)):
+            self._start_worker(index)
+
+    def monitor(self) -> None:
+        """Restart any worker that has stopped, once its restart delay has passed,
+        while the workers should be running.
+        """
+
+        if not self.is_running:
+            return
+
+        now = monotonic()
+
+        for index, worker in enumerate(self._workers):
+            if not worker or worker.is_alive():
+                continue
+
+            restart_at = self._restart_at[index]
+
+            if restart_at is None:
+                worker.join()
+
+                restart_at = now + self._next_restart_delay(index, now)
+                self._restart_at[index] = restart_at
+
+            if now >= restart_at:
+                self._start_worker(index)
+                self.restarts += 1
+
+    def _next_restart_delay(self, index: int, now: float) -> float:
+        """Work out how long to wait before restarting a worker that's just stopped.
+
+        Args:
+            index (int): The worker's slot.
+            now (float): The current time, from the monotonic clock.
+
+        Returns:
+            float: The delay, in seconds.
+        """
+
+        if now - self._started_at[index] >= self.MAX_RESTART_DELAY:
+            self._failures[index] = 0
+
+        delay: float = min(
+            self._restart_delay * 2 ** self._failures[index], self.MAX_RESTART_DELAY
+        )
+        self._failures[index] += 1
+
+        return delay
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Keep monitoring the workers until they're stopped.
+
+        Args:
+            interval (float, optional): Seconds between each check. Defaults to 1.0.
+        """
+
+        while self.is_running:
+            self.monitor()
+
+            sleep(interval)
+
+    def stop(self) -> None:
+        """Ask each worker to shut down, and wait for them to do so. Any worker that
+        takes too long is terminated.
+        """
+
+        self._stop_event.set()
+
+        for index, worker in enumerate(self._workers):
+            if not worker:
+                continue
+
+            worker.join(self.STOP_TIMEOUT)
+
+            if worker.is_alive():  # pytest: no cover
+                worker.terminate()
+                worker.join()
+
+            self._workers[index] = None
+
+    def _start_worker(self, index: int) -> None:
+        """Start a worker process, in the given slot.
+
+        Args:
+            index (int): The worker's slot.
+        """
+
+        worker = self._context.Process(
+            target=self._target,
+            args=(self._stop_event,),
+            name=f"cibo-worker-{index}",
+            daemon=True,
+        )
+        worker.start()
+
+        self._workers[index] = worker
+        self._started_at[index] = monotonic()
+        self._restart_at[index] = None
@@ -8,17 +8,33 @@ https://github.com/OliverLSanz/python-telnetserver/blob/master/telnetserver
 Further modified and expanded upon as needed, to accommodate the cibo project.
 """
 
+import logging
+import selectors
 import socket
 import time
-from enum import Enum
-from select import select
-from typing import List, Optional
+from typing import List, Optional, Tuple, Type
 
 from blinker import signal
 
+from cibo.copyover import ClientHandoff, Handoff
 from cibo.models.client import Client, ClientLoginState
 from cibo.models.data.player import Player
 from cibo.models.event import EventPayload
+from cibo.models.websocket_client import WebSocketClient
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.acceptor import AcceptStats, Acceptor
+from cibo.utils.admission import AdmissionStats
+from cibo.utils.command_queue import CommandOverflow, CommandQueue
+from cibo.utils.command_scheduler import CommandScheduler
+from cibo.utils.idle_deadlines import IdleDeadlines
+from cibo.utils.loop_stats import LoopPhase, LoopStats
+from cibo.utils.outbox import Outbox
+from cibo.utils.telnet_message import TelnetMessage
+from cibo.utils.telnet_parser import TelnetParser
+from cibo.utils.tracer import tracer
+from cibo.utils.traffic_stats import TrafficStats
+
+logger = logging.getLogger(__name__)
 
 
 class TelnetServer:
@@ -28,37 +44,65 @@ class TelnetServer:
     can then be sent to and from multiple connected clients.
 
     The 'update' method should be called in a loop to keep the server running, as well
-    as send event signals.
+    as send event signals. Sockets are registered once with a selector (epoll on
+    Linux), so each update only wakes for the sockets that are actually ready.
+
+    Output sent to a client is queued, and written out without blocking at the end of
+    each update, in a single write per client. A client who is slow to read never
+    holds up everyone else.
+
+    Input is queued per client, and each update runs a few commands from every client
+    in turn. A client who floods the server with input only ever delays their own
+    commands.
+
+    Browser clients can connect over a WebSocket, on a port of their own. Their
+    sessions are handled alongside everyone else's, and send the same signals.
+
+    Dead connections are found by TCP keepalive, rather than by writing to every
+    client. Clients who stop sending input are disconnected once their idle deadline
+    passes, and only those clients are ever looked at.
 
     Args:
         port (int): Port the server will listen to.
+        config (Optional[TelnetConfig], optional): Settings that control how clients
+            are treated. Defaults to None, which uses the default settings.
+        websocket_port (Optional[int], optional): Port the server will listen to for
+            WebSocket clients. Defaults to None, which doesn't listen for them.
     """
 
-    class ReadState(int, Enum):
-        """Different states we can be in while reading data from client."""
+    # the most bytes read from a client's socket at once
+    RECEIVE_BUFFER_SIZE = 4096
+
+    # sent to a client whose commands were ignored, because they sent too many at once
+    # or had too many waiting
+    COMMANDS_DROPPED_WARNING = (
+        "\r\nYou're sending commands too quickly, so some of them were ignored.\r\n"
+    )
+
+    def __init__(
+        self,
+        port: int,
+        config: Optional[TelnetConfig] = None,
+        websocket_port: Optional[int] = None,
+    ) -> None:
+        self._encoding = "utf-8"
+        self._config = config or TelnetConfig()
+        self._acceptor = Acceptor(port, self._config)
+        self._websocket_acceptor: Optional[Acceptor] = None
 
-        NORMAL = 1
-        MESSAGE = 2
-        SUBNEG = 3
+        if websocket_port is not None:
+            self._websocket_acceptor = Acceptor(websocket_port, self._config)
 
-    class CommandCode(int, Enum):
-        """Command codes used by telnet protocol."""
+            # an address is limited to the same number of connections, however it
+            # connects
+            self._websocket_acceptor.admission = self._acceptor.admission
 
-        INTERPRET_AS_MESSAGE = 255
-        ARE_YOU_THERE = 246
-        WILL = 251
-        WONT = 252
-        DO = 253
-        DONT = 254
-        SUBNEGOTIATION_START = 250
-        SUBNEGOTIATION_END = 240
+        self._selector = selectors.DefaultSelector()
 
-    def __init__(self, port: int) -> None:
-        self._port = port
-        self._encoding = "utf-8"
-        self._error_policy = "replace"
-
-        self._listen_socket: Optional[socket.socket] = None
+        # sockets are read one at a time, so every client can share the same buffer.
+        # Whatever is read is parsed before the next socket is
+        self._receive_buffer = bytearray(self.RECEIVE_BUFFER_SIZE)
+        self._receive_view = memoryview(self._receive_buffer)
 
         self._connect_signal = signal("event-connect")
         self._disconnect_signal = signal("event-disconnect")
@@ -66,40 +110,114 @@ class TelnetServer:
 
         self._clients: List[Client] = []
 
+        # clients who closed their own connection, e.g. with the quit command
+        self._closed_clients: List[Client] = []
+        self._idle_deadlines = IdleDeadlines(self._config.idle_timeout)
+        self._scheduler = CommandScheduler()
+
+        self._loop_stats = LoopStats()
+        self._traffic_stats = TrafficStats()
+
     def listen(self) -> None:
         """Configure the socket and begin listening."""
 
-        # create a new tcp socket which will be used to listen for new clients
-        self._listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # the listen sockets are registered with their acceptor attached, which is how
+        # we tell them apart from client sockets when they become readable
+        for acceptor in [self._acceptor, self._websocket_acceptor]:
+            if acceptor:
+                self._selector.register(
+                    acceptor.listen(), selectors.EVENT_READ, acceptor
+                )
 
-        # set a special option on the socket which allows the port to be
-        # immediately without having to wait
-        self._listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    @property
+    def port(self) -> int:
+        """The port the server is listening to.
 
-        # bind the socket to an ip address and port. Port 23 is the standard
-        # telnet port which telnet clients will use, however on some platforms
-        # this requires root permissions, so we use a higher arbitrary port
-        # number instead: 1234. Address 0.0.0.0 means that we will bind to all
-        # of the available network interfaces
-        self._listen_socket.bind(("0.0.0.0", self._port))
+        Returns:
+            int: The port number.
+        """
+
+        return self._acceptor.port
+
+    @property
+    def websocket_port(self) -> Optional[int]:
+        """The port the server is listening to for WebSocket clients.
+
+        Returns:
+            Optional[int]: The port number, or None if it isn't listening for them.
+        """
+
+        return self._websocket_acceptor.port if self._websocket_acceptor else None
+
+    @property
+    def accept_stats(self) -> AcceptStats:
+        """How quickly new connections are being accepted.
 
-        # set to non-blocking mode. This means that when we call 'accept', it
-        # will return immediately without waiting for a connection
-        self._listen_socket.setblocking(False)
+        Returns:
+            AcceptStats: The accept stats.
+        """
 
-        # start listening for connections on the socket
-        self._listen_socket.listen(1)
+        return self._acceptor.stats
 
-    def update(self) -> None:
+    @property
+    def admission_stats(self) -> AdmissionStats:
+        """How many new connections have been turned away, and why.
+
+        Returns:
+            AdmissionStats: The admission stats.
+        """
+
+        return self._acceptor.admission.stats
+
+    @property
+    def loop_stats(self) -> LoopStats:
+        """How long each phase of the game loop has been taking.
+
+        Returns:
+            LoopStats: The loop stats.
+        """
+
+        return self._loop_stats
+
+    @property
+    def traffic_stats(self) -> TrafficStats:
+        """How much input and output has passed between the server and its clients.
+
+        Returns:
+            TrafficStats: The traffic stats.
+        """
+
+        return self._traffic_stats
+
+    def update(self, timeout: float = 0) -> None:
         """Checks for new clients, disconnected clients, and new messages sent from
         clients. It then dispatches any new corresponding events. It should be called
         in a loop to keep the server running.
+
+        Args:
+            timeout (float, optional): How long to wait for a socket to become ready,
+                in seconds. Defaults to 0, which returns immediately.
         """
 
-        # check for new stuff
-        self._check_for_new_connections()
-        self._check_for_disconnected()
-        self._check_for_messages()
+        # clients with commands still waiting shouldn't have to wait on the network
+        # too
+        if self._scheduler:
+            timeout = 0
+
+        # only the sockets that have something for us are returned, so idle clients
+        # cost nothing here. The time spent waiting on them isn't counted as work
+        ready = self._selector.select(timeout)
+
+        with self._loop_stats.measure(LoopPhase.NETWORK):
+            self._check_sockets(ready)
+
+        with self._loop_stats.measure(LoopPhase.INPUT):
+            self._process_commands()
+
+        with self._loop_stats.measure(LoopPhase.FLUSH):
+            self._check_for_idle()
+            self._check_for_closed()
+            self.flush()
 
     def get_connected_clients(self) -> List[Client]:
         """Returns a list of all currently connected clients, as of last call to
@@ -111,204 +229,454 @@ class TelnetServer:
 
         return self._clients
 
+    def flush(self) -> None:
+        """Send as much of each client's queued output as their socket will take,
+        without waiting. Clients with output left over are watched until their socket
+        is ready for more.
+        """
+
+        for client in list(self._clients):
+            if client.is_output_pending:
+                self._flush_client(client)
+
     def shutdown(self) -> None:
         """Closes down the server, disconnecting all clients and closing the listen
-        socket.
+        socket. The server can be started again afterwards, with 'listen'.
         """
 
         # for each client
-        for client in self._clients:
-            # close the socket, disconnecting the client
+        for client in list(self._clients):
+            # close the socket, disconnecting the client. Anything still queued is
+            # sent first, if the socket will take it
             client.disconnect()
+            self._remove_client(client)
+
+        self._closed_clients.clear()
 
         # stop listening for new clients
-        if self._listen_socket:
-            self._listen_socket.close()
-
-    def _check_for_new_connections(self) -> None:
-        # 'select' is used to check whether there is data waiting to be read
-        # from the socket. We pass in 3 lists of sockets, the first being those
-        # to check for readability. It returns 3 lists, the first being
-        # the sockets that are readable. The last parameter is how long to wait
-        # - we pass in 0 so that it returns immediately without waiting
-        rlist, _wlist, _xlist = select([self._listen_socket], [], [], 0)
-
-        # if the socket wasn't in the readable list, there's no data available,
-        # meaning no clients waiting to connect, and so we can exit the method
-        # here
-        if self._listen_socket not in rlist:
-            return
+        for acceptor in [self._acceptor, self._websocket_acceptor]:
+            if acceptor and acceptor.socket:
+                self._selector.unregister(acceptor.socket)
+                acceptor.close()
 
-        # 'accept' returns a new socket and address info which can be used to
-        # communicate with the new client
-        if self._listen_socket:
-            joined_socket, addr = self._listen_socket.accept()
-
-            # set non-blocking mode on the new socket. This means that 'send' and
-            # 'recv' will return immediately without waiting
-            joined_socket.setblocking(False)
-
-            # construct a new Client object to hold info about the newly connected
-            # client.
-            new_client = Client(
-                socket=joined_socket,
-                address=addr[0],
-                encoding=self._encoding,
-                buffer="",
-                last_check=time.time(),
-                login_state=ClientLoginState.PRE_LOGIN,
-                registration=Player(),
-                player=Player(),
-            )
+    def hand_off(self) -> Handoff:
+        """Hand the listen and client sockets off, for a new process to take over
+        with 'restore'. The sockets are left open, but the server stops using them,
+        and can't be used afterwards.
 
-            self._clients.append(new_client)
+        Returns:
+            Handoff: The sockets, and each client's session.
+        """
 
-            self._connect_signal.send(self, payload=EventPayload(new_client))
+        # give everyone the chance to receive what's already queued
+        self.flush()
+
+        client_handoffs = []
 
-    def _check_for_disconnected(self) -> None:
-        # go through all the clients
         for client in self._clients:
-            # if we last checked the client less than 5 seconds ago, skip this
-            # client and move on to the next one
-            if time.time() - client.last_check < 5.0:
+            self._selector.unregister(client.socket)
+            client_handoffs.append(ClientHandoff.from_client(client))
+
+        self._clients.clear()
+
+        for acceptor in [self._acceptor, self._websocket_acceptor]:
+            if acceptor and acceptor.socket:
+                self._selector.unregister(acceptor.socket)
+
+        return Handoff(
+            listen_fileno=self._acceptor.hand_off(),
+            websocket_listen_fileno=(
+                self._websocket_acceptor.hand_off()
+                if self._websocket_acceptor
+                else None
+            ),
+            clients=client_handoffs,
+        )
+
+    def restore(self, handoff: Handoff) -> None:
+        """Take over the sockets handed off by an earlier process, in place of
+        'listen'. Clients carry on from where they left off, without connecting again.
+
+        Args:
+            handoff (Handoff): The sockets, and each client's session.
+        """
+
+        for acceptor, fileno in [
+            (self._acceptor, handoff.listen_fileno),
+            (self._websocket_acceptor, handoff.websocket_listen_fileno),
+        ]:
+            if acceptor:
+                listen_socket = (
+                    acceptor.listen() if fileno is None else acceptor.adopt(fileno)
+                )
+                self._selector.register(listen_socket, selectors.EVENT_READ, acceptor)
+
+        for client_handoff in handoff.clients:
+            client_socket = socket.socket(fileno=client_handoff.fileno)
+            client_socket.set_inheritable(False)
+            self._acceptor.configure(client_socket)
+
+            client = self._add_client(
+                WebSocketClient if client_handoff.websocket else Client,
+                client_socket,
+                client_handoff.address,
+            )
+            client_handoff.restore_to(client)
+
+            if client.commands:
+                self._scheduler.add(client)
+
+            # compression was stopped for the handoff, so it's offered again. The
+            # client's terminal size is asked for again too, in case it changed
+            if not isinstance(client, WebSocketClient):
+                self._offer_options(client)
+
+    def _check_for_new_connections(self, acceptor: Acceptor) -> None:
+        client_type = (
+            WebSocketClient if acceptor is self._websocket_acceptor else Client
+        )
+
+        # everything waiting in the backlog is accepted at once, so a rush of
+        # connections doesn't have to wait on the updates to come
+        for joined_socket, address in acceptor.accept():
+            # a client socket that was closed elsewhere (e.g. the quit command) may
+            # not have been unregistered yet, and the OS is free to hand its file
+            # descriptor to the new socket. Clear out the stale client first
+            stale_key = self._selector.get_map().get(joined_socket.fileno())
+
+            if stale_key:
+                self._handle_disconnect(stale_key.data)
+
+            new_client = self._add_client(client_type, joined_socket, address)
+
+            # browser clients aren't connected until their handshake is done
+            if isinstance(new_client, WebSocketClient):
                 continue
 
-            # send the client an invisible character. It doesn't actually
-            # matter what we send, we're really just checking that data can
-            # still be written to the socket. If it can't, an error will be
-            # raised and we'll know that the client has disconnected.
-            try:
-                # use 'sendall' to send the message string on the socket. 'sendall'
-                # ensures that all of the data is sent in one go
-                client.socket.sendall(bytearray("\x00", self._encoding))
-
-            # If there is a connection problem with the client (e.g. they have
-            # disconnected) a socket error will be raised
-            except socket.error:
+            self._offer_options(new_client)
+            self._connect_signal.send(self, payload=EventPayload(new_client))
+
+    def _add_client(
+        self, client_type: Type[Client], client_socket: socket.socket, address: str
+    ) -> Client:
+        """Construct a new Client object to hold info about a connected client, and
+        start watching their socket.
+
+        Args:
+            client_type (Type[Client]): The kind of client, depending on how they
+                connected.
+            client_socket (socket.socket): The client's socket.
+            address (str): The address the client connected from.
+
+        Returns:
+            Client: The new client.
+        """
+
+        new_client = client_type(
+            socket=client_socket,
+            address=address,
+            encoding=self._encoding,
+            last_activity=time.time(),
+            login_state=ClientLoginState.PRE_LOGIN,
+            registration=Player(),
+            player=Player(),
+            parser=self._create_parser(),
+            outbox=self._create_outbox(),
+            commands=self._create_command_queue(),
+            on_disconnect=self._closed_clients.append,
+        )
+
+        self._clients.append(new_client)
+        self._selector.register(client_socket, selectors.EVENT_READ, new_client)
+        self._idle_deadlines.add(new_client)
+
+        return new_client
+
+    def _check_for_idle(self) -> None:
+        """Disconnect the clients whose idle deadline has passed."""
+
+        for client in self._idle_deadlines.pop_expired(time.time()):
+            client.disconnect()
+
+    def _check_for_closed(self) -> None:
+        """Clean up after the clients who closed their own connection since the last
+        update.
+        """
+
+        while self._closed_clients:
+            client = self._closed_clients.pop()
+
+            # the client may have been cleaned up already, if reading from the closed
+            # socket failed first
+            if client in self._clients:
                 self._handle_disconnect(client)
 
-            # update the last check time
-            client.last_check = time.time()
+    def _check_for_messages(self, client: Client) -> None:
+        try:
+            # read data from the socket straight into the receive buffer, so no new
+            # object is created for it
+            length = client.socket.recv_into(self._receive_buffer)
 
-    def _check_for_messages(self) -> None:
-        # go through all the clients
-        for client in self._clients:
-            # do an initial check to see if the client disconnected, but we just
-            # haven't processed it yet.
-            if client.socket.fileno() < 0:
+            # a readable socket with no data means the client closed the
+            # connection on their end
+            if not length:
                 self._handle_disconnect(client)
-                continue
+                return
+
+            self._traffic_stats.bytes_received += length
+
+            # process the data in place, stripping out any special Telnet messages.
+            # We only get back the lines the client has finished sending
+            if isinstance(client, WebSocketClient):
+                lines = client.parser.feed(
+                    self._receive_websocket(client, self._receive_view[:length])
+                )
+            else:
+                lines = client.parser.feed(self._receive_buffer, length)
 
-            # we use 'select' to test whether there is data waiting to be read
-            # from the client socket. The function takes 3 lists of sockets,
-            # the first being those to test for readability. It returns 3 list
-            # of sockets, the first being those that are actually readable.
-            rlist, _wlist, _xlist = select([client.socket], [], [], 0)
+            self._negotiate_options(client)
 
-            # if the client socket wasn't in the readable list, there is no
-            # new data from the client - we can skip it and move on to the next
-            # one
-            if client.socket not in rlist:
+            # what the client sent may have disconnected them, like a WebSocket close
+            # frame, and then there's no one left to run the rest of it for
+            if client not in self._closed_clients:
+                self._queue_input(client, lines)
+
+        # if there is a problem reading from the socket (e.g. the client
+        # has disconnected) a socket error will be raised
+        except socket.error:
+            self._handle_disconnect(client)
+
+    def _receive_websocket(self, client: WebSocketClient, raw_data: bytes) -> bytes:
+        """Unwrap the data a browser client sent, and let everyone know they've
+        connected once their handshake is done.
+
+        Args:
+            client (WebSocketClient): The client who sent the data.
+            raw_data (bytes): The raw data, as it was read from the socket.
+
+        Returns:
+            bytes: The text of the messages the client sent.
+        """
+
+        was_open = client.is_open
+        text = client.receive(raw_data)
+
+        if client.is_open and not was_open:
+            self._connect_signal.send(self, payload=EventPayload(client))
+
+        return text
+
+    def _create_parser(self) -> TelnetParser:
+        """Create a parser, for a newly connected client.
+
+        Returns:
+            TelnetParser: The parser.
+        """
+
+        return TelnetParser(
+            self._encoding,
+            max_line_length=self._config.max_line_length,
+            max_lines=self._config.max_pending_lines,
+        )
+
+    def _offer_options(self, client: Client) -> None:
+        """Let a newly connected client know which Telnet options we support, and ask
+        them to tell us their terminal size. The client decides which of them to turn
+        on.
+
+        Args:
+            client (Client): The newly connected client.
+        """
+
+        client.send_data(
+            TelnetMessage.negotiation(
+                TelnetMessage.CommandCode.WILL, TelnetMessage.OptionCode.COMPRESS2
+            )
+            + TelnetMessage.negotiation(
+                TelnetMessage.CommandCode.WILL, TelnetMessage.OptionCode.GMCP
+            )
+            + TelnetMessage.negotiation(
+                TelnetMessage.CommandCode.DO, TelnetMessage.OptionCode.WINDOW_SIZE
+            )
+        )
+
+    def _negotiate_options(self, client: Client) -> None:
+        """Respond to any option negotiations the client sent, before handling the
+        input that came with them.
+
+        Args:
+            client (Client): The client who sent the negotiations.
+        """
+
+        for command, option in client.parser.take_negotiations():
+            client.negotiate(command, option)
+
+        for option, data in client.parser.take_subnegotiations():
+            client.subnegotiate(option, data)
+
+    def _create_outbox(self) -> Outbox:
+        """Create an output queue, for a newly connected client.
+
+        Returns:
+            Outbox: The output queue.
+        """
+
+        return Outbox(
+            self._config.output_high_water_mark,
+            self._config.output_overflow,
+            self._traffic_stats,
+        )
+
+    def _create_command_queue(self) -> CommandQueue:
+        """Create a command queue, for a newly connected client.
+
+        Returns:
+            CommandQueue: The command queue.
+        """
+
+        return CommandQueue(
+            self._config.max_queued_commands, self._config.command_overflow
+        )
+
+    def _flush_client(self, client: Client) -> None:
+        """Send as much of the client's queued output as their socket will take, and
+        only watch for the socket becoming writable while there's output left over.
+
+        Args:
+            client (Client): The client to send to.
+        """
+
+        try:
+            # the client's traces are finished once their output is written
+            with tracer.finish(client, "socket write"):
+                client.flush()
+
+        # if there is a connection problem with the client (e.g. they have
+        # disconnected) a socket error will be raised
+        except socket.error:
+            self._handle_disconnect(client)
+            return
+
+        events = selectors.EVENT_READ
+
+        if client.outbox:
+            events |= selectors.EVENT_WRITE
+
+        if self._selector.get_key(client.socket).events != events:
+            self._selector.modify(client.socket, events, client)
+
+    def _queue_input(self, client: Client, lines: List[str]) -> None:
+        """Queue the lines the client sent, to be run once it's their turn.
+
+        Args:
+            client (Client): The client who sent the lines.
+            lines (List[str]): The lines of input.
+        """
+
+        # lines past the most taken from a single read never made it this far, but
+        # the client is still warned about them
+        dropped_lines = client.parser.buffer.take_dropped_lines()
+        self._traffic_stats.dropped_lines += dropped_lines
+
+        if not lines:
+            return
+
+        client.last_activity = time.time()
+
+        dropped = dropped_lines > 0
+
+        for line in lines:
+            if not client.commands.push(line):
+                if client.commands.overflow is CommandOverflow.DISCONNECT:
+                    client.disconnect()
+                    return
+
+                dropped = True
+
+        self._scheduler.add(client)
+
+        # only warn once for everything dropped in the same read
+        if dropped:
+            client.send_message(self.COMMANDS_DROPPED_WARNING)
+
+    def _check_sockets(self, ready: List[Tuple[selectors.SelectorKey, int]]) -> None:
+        """Accept new connections, and read from the clients who sent something.
+
+        Args:
+            ready (List[Tuple[selectors.SelectorKey, int]]): The sockets that are
+                ready, and the events they're ready for.
+        """
+
+        for key, mask in ready:
+            # skip over any client that was disconnected while handling an earlier
+            # socket in this same batch
+            if self._selector.get_map().get(key.fd) is not key:
                 continue
 
-            try:
-                # read data from the socket, using a max length of 4096
-                data = client.socket.recv(4096).decode(
-                    self._encoding, self._error_policy
-                )
+            if isinstance(key.data, Acceptor):
+                self._check_for_new_connections(key.data)
 
-                # process the data, stripping out any special Telnet messages
-                message = self._process_sent_data(client, data)
+            # a socket that became writable is picked up by the flush below
+            elif mask & selectors.EVENT_READ:
+                self._check_for_messages(key.data)
 
-                # if there was a message in the data
-                if message:
-                    # remove any spaces, tabs etc from the start and end of
-                    # the message
-                    message = message.strip()
+    def _process_commands(self) -> None:
+        """Run the commands that are waiting, taking a few from every client in
+        turn.
+        """
 
-                    self._input_signal.send(self, payload=EventPayload(client, message))
+        for client, line in self._scheduler.take(self._config.commands_per_update):
+            self._send_input(client, line)
 
-            # if there is a problem reading from the socket (e.g. the client
-            # has disconnected) a socket error will be raised
-            except socket.error:
-                self._handle_disconnect(client)
+    def _send_input(self, client: Client, line: str) -> None:
+        """Send an input signal, for a line the client sent.
+
+        Args:
+            client (Client): The client who sent the line.
+            line (str): The line of input.
+        """
+
+        self._traffic_stats.inputs += 1
+
+        # remove any spaces, tabs etc from the start and end of the line
+        input_ = line.strip()
+
+        # only the command is traced or logged, as the rest might be something like a
+        # password
+        command = input_.partition(" ")[0]
+
+        # a faulty action is logged and skipped, rather than taking down the loop that
+        # serves every other client
+        try:
+            with tracer.trace("input", client, command=command):
+                self._input_signal.send(self, payload=EventPayload(client, input_))
+
+        except Exception:
+            logger.exception("Error running %r for %s", command, client.address)
+
+    def _remove_client(self, client: Client) -> None:
+        """Stop watching the client's socket, close it, and forget about them.
+
+        Args:
+            client (Client): The disconnected client.
+        """
+
+        self._selector.unregister(client.socket)
+
+        # the client may have dropped the connection without us closing our end, so
+        # make sure its file descriptor is freed. Closing it twice does no harm
+        client.socket.close()
 
-    def _handle_disconnect(self, client: Client) -> None:
-        # remove the client from the clients list
         self._clients.remove(client)
+        self._idle_deadlines.remove(client)
+        self._scheduler.remove(client)
+        tracer.close(client)
 
-        self._disconnect_signal.send(self, payload=EventPayload(client))
+    def _handle_disconnect(self, client: Client) -> None:
+        self._remove_client(client)
 
-    def _process_sent_data(self, client: Client, data: str) -> str:
-        # the Telnet protocol allows special message codes to be inserted into
-        # messages. For our very simple server we don't need to response to
-        # any of these codes, but we must at least detect and skip over them
-        # so that we don't interpret them as text data.
-        # More info on the Telnet protocol can be found here:
-        # http://pcmicro.com/netfoss/telnet.html
-
-        # start with no message and in the normal state
-        message = None
-        state = self.ReadState.NORMAL
-
-        # go through the data a character at a time
-        for char in data:
-            # handle the character differently depending on the state we're in:
-
-            # normal state
-            if state == self.ReadState.NORMAL:
-                # if we received the special 'interpret as message' code,
-                # switch to 'message' state so that we handle the next
-                # character as a message code and not as regular text data
-                if ord(char) == self.CommandCode.INTERPRET_AS_MESSAGE:
-                    state = self.ReadState.MESSAGE
-
-                # some telnet clients send the characters as soon as the user
-                # types them. So if we get a backspace character, this is where
-                # the user has deleted a character and we should delete the
-                # last character from the buffer.
-                elif char == "\x08":
-                    client.buffer = client.buffer[:-1]
-
-                # otherwise it's just a regular character - add it to the
-                # buffer where we're building up the received message
-                else:
-                    client.buffer += char
-
-            # message state
-            elif state == self.ReadState.MESSAGE:
-                # the special 'start of subnegotiation' message code indicates
-                # that the following characters are a list of options until
-                # we're told otherwise. We switch into 'subnegotiation' state
-                # to handle this
-                if ord(char) == self.CommandCode.SUBNEGOTIATION_START:
-                    state = self.ReadState.SUBNEG
-
-                # if the message code is one of the 'will', 'wont', 'do' or
-                # 'dont' messages, the following character will be an option
-                # code so we must remain in the 'message' state
-                elif ord(char) in (
-                    self.CommandCode.WILL,
-                    self.CommandCode.WONT,
-                    self.CommandCode.DO,
-                    self.CommandCode.DONT,
-                ):
-                    state = self.ReadState.MESSAGE
-
-                # for all other message codes, there is no accompanying data so
-                # we can return to 'normal' state.
-                else:
-                    state = self.ReadState.NORMAL
-
-            # subnegotiation state
-            elif state == self.ReadState.SUBNEG:
-                # if we reach an 'end of subnegotiation' message, this ends the
-                # list of options and we can return to 'normal' state.
-                # Otherwise we must remain in this state
-                if ord(char) == self.CommandCode.SUBNEGOTIATION_END:
-                    state = self.ReadState.NORMAL
-
-        # return the contents of 'message' which is either a string or None
-        message = client.buffer
-        client.buffer = ""
-        return message
+        # a browser client who never finished their handshake was never connected
+        if isinstance(client, WebSocketClient) and not client.is_open:
+            return
+
+        self._disconnect_signal.send(self, payload=EventPayload(client))
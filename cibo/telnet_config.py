@@ -0,0 +1,63 @@
+"""Settings for the telnet server, that control how it treats its clients. The
+defaults are suitable for most servers.
+"""
+
+from dataclasses import dataclass
+
+from cibo.utils.command_queue import CommandOverflow
+from cibo.utils.outbox import OutboxOverflow
+
+
+@dataclass
+class TelnetConfig:
+    """Settings for the telnet server, that control how it treats its clients."""
+
+    # how many new connections the OS holds on to, until they're accepted
+    listen_backlog: int = 128
+
+    # the most new connections accepted in a single update
+    accept_budget: int = 64
+
+    # new connections let in from a single address each second, and how many can
+    # arrive at once. A rate of zero lets in any number
+    address_connect_rate: float = 0.5
+    address_connect_burst: int = 5
+
+    # new connections let in from everyone together each second, and how many can
+    # arrive at once. A rate of zero lets in any number
+    connect_rate: float = 50.0
+    connect_burst: int = 200
+
+    # let other processes listen to the same port, with the kernel spreading new
+    # connections across all of them
+    reuse_port: bool = False
+
+    # input lines longer than this many bytes are cut short
+    max_line_length: int = 1024
+
+    # the most input lines taken from a client in a single read. Any more than that
+    # are dropped, and the client is warned
+    max_pending_lines: int = 20
+
+    # the most commands run for a single client in each update. Clients take turns,
+    # one command at a time, so no one waits on someone else's backlog
+    commands_per_update: int = 3
+
+    # how many commands a client can have waiting to be run, before the overflow
+    # policy kicks in
+    max_queued_commands: int = 20
+    command_overflow: CommandOverflow = CommandOverflow.DROP_OLDEST
+
+    # how many bytes of output can be queued for a client, before the overflow policy
+    # kicks in. A client who falls a few times further behind is disconnected either
+    # way
+    output_high_water_mark: int = 262144
+    output_overflow: OutboxOverflow = OutboxOverflow.DROP_LOW_PRIORITY
+
+    # seconds a client can go without sending any input, before they're disconnected.
+    # Zero never disconnects idle clients
+    idle_timeout: float = 1800.0
+
+    # roughly how many seconds of silence from a client's end of the connection it
+    # takes for it to be considered dead, and closed by TCP keepalive
+    link_dead_timeout: float = 60.0
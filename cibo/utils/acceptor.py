@@ -0,0 +1,260 @@
+"""Accepts new connections on the server's listen socket. Everything waiting in the
+listen backlog is accepted in one go, up to a budget, so a rush of clients
+reconnecting at once doesn't leave most of them waiting on the next update.
+
+Connections over the admission limits are turned away as soon as they're accepted,
+before any client is set up for them.
+"""
+
+import socket
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.admission import Admission
+
+
+@dataclass
+class AcceptStats:
+    """How quickly new connections are being accepted."""
+
+    # every connection accepted since the server started
+    accepted: int = 0
+
+    # connections accepted per second, over the most recently completed window
+    rate: float = 0.0
+
+    # how many times there were still connections waiting, once the budget was used
+    budget_exhausted: int = 0
+
+
+class Acceptor:
+    """Accepts new connections on the server's listen socket.
+
+    Args:
+        port (int): Port to listen to. Zero lets the OS pick a free port.
+        config (TelnetConfig): The telnet server's settings.
+    """
+
+    # how many unanswered keepalive probes it takes for a connection to be dropped
+    KEEPALIVE_PROBES = 5
+
+    # how often the accept rate is worked out, in seconds
+    RATE_WINDOW = 1.0
+
+    def __init__(self, port: int, config: TelnetConfig) -> None:
+        self._port = port
+        self._config = config
+
+        self._window_start = time.monotonic()
+        self._window_accepted = 0
+
+        self.socket: Optional[socket.socket] = None
+        self.admission = Admission(config)
+        self.stats = AcceptStats()
+
+    @property
+    def port(self) -> int:
+        """The port being listened to.
+
+        Returns:
+            int: The port number.
+        """
+
+        return self._port
+
+    def listen(self) -> socket.socket:
+        """Create a non-blocking socket, bound to our port and listening for new
+        connections.
+
+        Returns:
+            socket.socket: The listen socket.
+        """
+
+        # create a new tcp socket which will be used to listen for new clients
+        listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        # set a special option on the socket which allows the port to be
+        # immediately without having to wait
+        listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        # every worker process binds the same port, and the kernel balances new
+        # connections across them
+        if self._config.reuse_port:
+            listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+        # bind the socket to an ip address and port. Port 23 is the standard
+        # telnet port which telnet clients will use, however on some platforms
+        # this requires root permissions, so we use a higher arbitrary port
+        # number instead: 1234. Address 0.0.0.0 means that we will bind to all
+        # of the available network interfaces
+        listen_socket.bind(("0.0.0.0", self._port))
+
+        # if we were asked to bind to port 0, the OS picked a free port for us
+        self._port = listen_socket.getsockname()[1]
+
+        # set to non-blocking mode. This means that when we call 'accept', it
+        # will return immediately without waiting for a connection
+        listen_socket.setblocking(False)
+
+        # start listening for connections on the socket. The backlog is how many
+        # connections the OS holds on to for us, until we get around to accepting
+        listen_socket.listen(self._config.listen_backlog)
+
+        self.socket = listen_socket
+
+        return listen_socket
+
+    def adopt(self, fileno: int) -> socket.socket:
+        """Take over a listen socket handed off by an earlier process, rather than
+        creating a new one. Any connections waiting in its backlog are kept.
+
+        Args:
+            fileno (int): The listen socket's file descriptor.
+
+        Returns:
+            socket.socket: The listen socket.
+        """
+
+        listen_socket = socket.socket(fileno=fileno)
+        listen_socket.set_inheritable(False)
+        listen_socket.setblocking(False)
+
+        self._port = listen_socket.getsockname()[1]
+        self.socket = listen_socket
+
+        return listen_socket
+
+    def hand_off(self) -> Optional[int]:
+        """Hand the listen socket off, for a new process to take over. It's left open,
+        but this acceptor stops using it.
+
+        Returns:
+            Optional[int]: The listen socket's file descriptor, or None if the
+                acceptor isn't listening.
+        """
+
+        if not self.socket:
+            return None
+
+        listen_socket = self.socket
+        self.socket = None
+
+        listen_socket.set_inheritable(True)
+
+        return listen_socket.detach()
+
+    def accept(self) -> List[Tuple[socket.socket, str]]:
+        """Accept every connection waiting in the backlog, up to the accept budget.
+        Any left over are accepted on the next call. Connections that aren't admitted
+        are turned away straight away.
+
+        Returns:
+            List[Tuple[socket.socket, str]]: The socket and address of each newly
+                connected client.
+        """
+
+        accepted: List[Tuple[socket.socket, str]] = []
+
+        if not self.socket:
+            return accepted
+
+        for _ in range(self._config.accept_budget):
+            try:
+                # 'accept' returns a new socket and address info which can be used
+                # to communicate with the new client
+                client_socket, address = self.socket.accept()
+
+            # the backlog has been drained
+            except BlockingIOError:
+                break
+
+            if not self.admission.admit(address[0]):
+                self._reject(client_socket)
+                continue
+
+            self.configure(client_socket)
+            accepted.append((client_socket, address[0]))
+
+        else:
+            self.stats.budget_exhausted += 1
+
+        self.record(len(accepted))
+
+        return accepted
+
+    def configure(self, client_socket: socket.socket) -> None:
+        """Set up a newly accepted socket. It's made non-blocking, and the OS probes
+        the connection whenever it goes quiet, so a client whose end has silently gone
+        away is disconnected within the link-dead timeout.
+
+        Args:
+            client_socket (socket.socket): The newly accepted socket.
+        """
+
+        # set non-blocking mode on the new socket. This means that 'send' and 'recv'
+        # will return immediately without waiting
+        client_socket.setblocking(False)
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        # the probe timings can't be set on every platform, in which case the OS
+        # defaults are used
+        if not hasattr(socket, "TCP_KEEPIDLE"):  # pytest: no cover
+            return
+
+        # half the timeout is spent waiting before the first probe, the other half
+        # waiting on the probes themselves
+        idle = max(1, int(self._config.link_dead_timeout / 2))
+        interval = max(1, idle // self.KEEPALIVE_PROBES)
+
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+        client_socket.setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.KEEPALIVE_PROBES
+        )
+
+    def record(self, accepted: int) -> None:
+        """Count newly accepted connections towards the stats.
+
+        Args:
+            accepted (int): How many connections were accepted.
+        """
+
+        self.stats.accepted += accepted
+        self._window_accepted += accepted
+
+        now = time.monotonic()
+        elapsed = now - self._window_start
+
+        if elapsed >= self.RATE_WINDOW:
+            self.stats.rate = self._window_accepted / elapsed
+
+            self._window_start = now
+            self._window_accepted = 0
+
+    def _reject(self, client_socket: socket.socket) -> None:
+        """Turn a connection away, letting them know why if their socket will take it.
+
+        Args:
+            client_socket (socket.socket): The rejected connection's socket.
+        """
+
+        client_socket.setblocking(False)
+
+        try:
+            client_socket.send(Admission.REJECTION_BANNER)
+
+        except OSError:
+            pass
+
+        client_socket.close()
+
+    def close(self) -> None:
+        """Stop listening for new connections. The acceptor can listen again
+        afterwards.
+        """
+
+        if self.socket:
+            self.socket.close()
+            self.socket = None
@@ -0,0 +1,160 @@
+"""Decides whether a new connection is let in, before any work is done setting up a
+client for it. Connections are limited per address and for the server as a whole,
+each with a token bucket, so a reconnect loop from one broken bot can't eat into the
+capacity everyone else relies on.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from cibo.telnet_config import TelnetConfig
+
+
+class TokenBucket:
+    """Lets through a steady rate of events, with room for a short burst.
+
+    Args:
+        rate (float): How many tokens are added back each second.
+        burst (int): The most tokens the bucket can hold.
+        now (float): The current time, as a monotonic timestamp.
+    """
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self._rate = rate
+        self._burst = burst
+
+        self._tokens = float(burst)
+        self._updated = now
+
+    def take(self, now: float) -> bool:
+        """Take a token from the bucket, if there's one to take.
+
+        Args:
+            now (float): The current time, as a monotonic timestamp.
+
+        Returns:
+            bool: Was a token taken or not.
+        """
+
+        self._refill(now)
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+
+        return True
+
+    def is_full(self, now: float) -> bool:
+        """Check if the bucket has refilled completely.
+
+        Args:
+            now (float): The current time, as a monotonic timestamp.
+
+        Returns:
+            bool: Is the bucket full or not.
+        """
+
+        self._refill(now)
+
+        return self._tokens >= self._burst
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+
+@dataclass
+class AdmissionStats:
+    """How many new connections have been turned away, and why."""
+
+    # connections from an address that was connecting too quickly
+    rejected_address: int = 0
+
+    # connections turned away because the server as a whole was too busy
+    rejected_global: int = 0
+
+
+class Admission:
+    """Decides whether a new connection is let in.
+
+    Args:
+        config (TelnetConfig): The telnet server's settings.
+    """
+
+    # sent to connections that are turned away. It's prepared ahead of time, so
+    # turning someone away costs next to nothing
+    REJECTION_BANNER = b"\r\nToo many connections. Please try again shortly.\r\n"
+
+    # how often buckets for addresses that stopped connecting are thrown away
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, config: TelnetConfig) -> None:
+        self._config = config
+
+        now = time.monotonic()
+
+        self._global_bucket: Optional[TokenBucket] = (
+            TokenBucket(config.connect_rate, config.connect_burst, now)
+            if config.connect_rate
+            else None
+        )
+        self._address_buckets: Dict[str, TokenBucket] = {}
+        self._pruned = now
+
+        self.stats = AdmissionStats()
+
+    def admit(self, address: str) -> bool:
+        """Check if a new connection from the address can be let in.
+
+        Args:
+            address (str): The address the connection came from.
+
+        Returns:
+            bool: Can the connection be let in or not.
+        """
+
+        now = time.monotonic()
+
+        if now - self._pruned >= self.PRUNE_INTERVAL:
+            self._prune(now)
+
+        # the address is checked first, so one address connecting too quickly never
+        # uses up everyone else's share
+        if self._config.address_connect_rate:
+            bucket = self._address_buckets.get(address)
+
+            if not bucket:
+                bucket = self._address_buckets[address] = TokenBucket(
+                    self._config.address_connect_rate,
+                    self._config.address_connect_burst,
+                    now,
+                )
+
+            if not bucket.take(now):
+                self.stats.rejected_address += 1
+                return False
+
+        if self._global_bucket and not self._global_bucket.take(now):
+            self.stats.rejected_global += 1
+            return False
+
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Throw away the buckets of addresses that haven't connected in long enough
+        for their bucket to refill, since a new bucket would be no different.
+
+        Args:
+            now (float): The current time, as a monotonic timestamp.
+        """
+
+        self._address_buckets = {
+            address: bucket
+            for address, bucket in self._address_buckets.items()
+            if not bucket.is_full(now)
+        }
+        self._pruned = now
@@ -0,0 +1,91 @@
+"""Holds on to the commands a client has sent, until it's their turn to have them run.
+The queue is bounded, so a client who floods the server with input can only ever have
+so many commands waiting.
+"""
+
+from collections import deque
+from enum import Enum
+from typing import Deque
+
+
+class CommandOverflow(int, Enum):
+    """What to do once a client sends more commands than their queue can hold."""
+
+    DROP_OLDEST = 1
+    DISCONNECT = 2
+    WARN = 3
+
+
+class CommandQueue:
+    """Holds on to the commands a client has sent, until it's their turn to have them
+    run.
+
+    Args:
+        max_commands (int, optional): The most commands that can be waiting. Defaults
+            to 20.
+        overflow (CommandOverflow, optional): What to do once the queue is full.
+            Defaults to CommandOverflow.DROP_OLDEST.
+    """
+
+    def __init__(
+        self,
+        max_commands: int = 20,
+        overflow: CommandOverflow = CommandOverflow.DROP_OLDEST,
+    ) -> None:
+        self._max_commands = max_commands
+        self._overflow = overflow
+
+        self._commands: Deque[str] = deque()
+
+        self.dropped_commands = 0
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    @property
+    def overflow(self) -> CommandOverflow:
+        """What is done once the queue is full.
+
+        Returns:
+            CommandOverflow: The overflow policy.
+        """
+
+        return self._overflow
+
+    def push(self, command: str) -> bool:
+        """Add the command to the end of the queue, unless the queue is full.
+
+        Args:
+            command (str): The line of input.
+
+        Returns:
+            bool: False if the queue overflowed and the command was dropped, in which
+                case the overflow policy decides what happens to the client.
+        """
+
+        if len(self._commands) >= self._max_commands:
+            self.dropped_commands += 1
+
+            if self._overflow is not CommandOverflow.DROP_OLDEST:
+                return False
+
+            # the newest commands are the ones the client is most likely waiting on
+            self._commands.popleft()
+
+        self._commands.append(command)
+
+        return True
+
+    def pop(self) -> str:
+        """Take the oldest command from the queue.
+
+        Returns:
+            str: The line of input.
+        """
+
+        return self._commands.popleft()
+
+    def clear(self) -> None:
+        """Throw away every command that's waiting."""
+
+        self._commands.clear()
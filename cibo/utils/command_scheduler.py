@@ -0,0 +1,65 @@
+"""Decides the order in which clients have their queued commands run. Clients take
+turns, one command at a time, so a client with a long backlog never holds up everyone
+else's commands.
+"""
+
+from typing import Dict, Iterator, Tuple
+
+from cibo.models.client import Client
+
+
+class CommandScheduler:
+    """Decides the order in which clients have their queued commands run.
+
+    Only the clients who have commands waiting are kept track of, so the clients who
+    aren't sending anything cost nothing.
+    """
+
+    def __init__(self) -> None:
+        # keyed by id, since clients themselves can't be hashed. Dicts keep their
+        # order, so clients are served in the order their commands arrived
+        self._clients: Dict[int, Client] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def add(self, client: Client) -> None:
+        """Give the client a turn, now that they have commands waiting.
+
+        Args:
+            client (Client): The client.
+        """
+
+        self._clients.setdefault(id(client), client)
+
+    def remove(self, client: Client) -> None:
+        """Stop giving the client turns, e.g. once they've disconnected.
+
+        Args:
+            client (Client): The client.
+        """
+
+        self._clients.pop(id(client), None)
+
+    def take(self, rounds: int) -> Iterator[Tuple[Client, str]]:
+        """Take the commands to be run next, one from each waiting client in turn.
+
+        Args:
+            rounds (int): The most commands taken from a single client.
+
+        Yields:
+            Tuple[Client, str]: The client, and the command they sent.
+        """
+
+        for _ in range(rounds):
+            if not self._clients:
+                return
+
+            for key, client in list(self._clients.items()):
+                # the queue may have been cleared by a command run earlier in the
+                # round, e.g. if the client quit
+                if client.commands:
+                    yield client, client.commands.pop()
+
+                if not client.commands:
+                    self._clients.pop(key, None)
@@ -0,0 +1,105 @@
+"""Keeps track of when each client will have been idle for too long. Deadlines are
+kept in a heap, ordered by when they expire, so checking for idle clients only ever
+touches the clients whose deadline has actually passed.
+"""
+
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from cibo.models.client import Client
+
+
+class IdleDeadlines:
+    """Keeps track of when each client will have been idle for too long.
+
+    A client's deadline isn't moved each time they send input, which would mean
+    re-sorting the heap. Instead, when a deadline passes, it's checked against the
+    client's last activity, and pushed back if they've been active since.
+
+    Args:
+        timeout (float): Seconds a client can go without any activity. Zero never
+            lets a deadline expire.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self._timeout = timeout
+
+        # entries are ordered by deadline. The sequence number breaks ties, so clients
+        # themselves are never compared
+        self._heap: List[Tuple[float, int, Client]] = []
+        self._sequence = count()
+
+        self._clients: Dict[int, Client] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """When the earliest deadline expires, though the client it belongs to may
+        have been active since.
+
+        Returns:
+            Optional[float]: The deadline as a timestamp, or None if no clients are
+                being tracked.
+        """
+
+        return self._heap[0][0] if self._heap else None
+
+    def add(self, client: Client) -> None:
+        """Start tracking the client, from their last activity.
+
+        Args:
+            client (Client): The client.
+        """
+
+        if not self._timeout:
+            return
+
+        self._clients[id(client)] = client
+        self._push(client, client.last_activity + self._timeout)
+
+    def remove(self, client: Client) -> None:
+        """Stop tracking the client. Their deadline is left in the heap, and ignored
+        once it expires.
+
+        Args:
+            client (Client): The client.
+        """
+
+        self._clients.pop(id(client), None)
+
+    def pop_expired(self, now: float) -> List[Client]:
+        """Take every client who has been idle past their deadline. They're no longer
+        tracked afterwards.
+
+        Args:
+            now (float): The current time, as a timestamp.
+
+        Returns:
+            List[Client]: The idle clients.
+        """
+
+        expired = []
+
+        while self._heap and self._heap[0][0] <= now:
+            _deadline, _sequence, client = heapq.heappop(self._heap)
+
+            if self._clients.get(id(client)) is not client:
+                continue
+
+            deadline = client.last_activity + self._timeout
+
+            # the client was active since the deadline was set, so give them more time
+            if deadline > now:
+                self._push(client, deadline)
+                continue
+
+            self.remove(client)
+            expired.append(client)
+
+        return expired
+
+    def _push(self, client: Client, deadline: float) -> None:
+        heapq.heappush(self._heap, (deadline, next(self._sequence), client))
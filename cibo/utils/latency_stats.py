@@ -0,0 +1,152 @@
+"""Measures how long each action and event takes to process, so we can see which
+commands are slow while the server is running.
+
+Each is timed into a histogram with fixed buckets, so recording a time is cheap and
+the memory used never grows, however long the window is left open. Percentiles are
+estimated from the buckets, which is close enough to spot the slow ones.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# the upper bounds of the buckets, in seconds. Anything slower than the last falls
+# into a bucket of its own
+BUCKETS = [
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+]
+
+
+class LatencyHistogram:
+    """How long something has been taking, counted into fixed buckets."""
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """The average time taken.
+
+        Returns:
+            float: The average, in seconds.
+        """
+
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, elapsed: float, error: bool = False) -> None:
+        """Record how long a run took.
+
+        Args:
+            elapsed (float): The time taken, in seconds.
+            error (bool, optional): If the run raised an error. Defaults to False.
+        """
+
+        self.counts[bisect_left(BUCKETS, elapsed)] += 1
+
+        self.count += 1
+        self.errors += error
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+    def percentile(self, percent: float) -> float:
+        """Estimate the time that the given percentage of runs finished within,
+        assuming the times are spread evenly through each bucket.
+
+        Args:
+            percent (float): The percentile, e.g. 95.
+
+        Returns:
+            float: The estimated time, in seconds. Zero if nothing's been recorded.
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percent / 100
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                # the slowest bucket has no upper bound, so the slowest run stands in
+                if index == len(BUCKETS):
+                    return self.max
+
+                lower = BUCKETS[index - 1] if index else 0.0
+                estimate = lower + (BUCKETS[index] - lower) * (rank - seen) / count
+
+                return min(estimate, self.max)
+
+            seen += count
+
+        return self.max  # pytest: no cover
+
+
+class LatencyStats:
+    """Measures how long each action and event takes to process, within a window
+    that can be reset to start over.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.window_start = time.monotonic()
+
+    @property
+    def window(self) -> float:
+        """How long it's been since the window was last reset.
+
+        Returns:
+            float: The window length, in seconds.
+        """
+
+        return time.monotonic() - self.window_start
+
+    def reset(self) -> None:
+        """Forget everything recorded so far, and start a new window."""
+
+        self.histograms.clear()
+        self.window_start = time.monotonic()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time the code run within the context, including whether it raised.
+
+        Args:
+            name (str): What's being run, e.g. the action class or event signal name.
+        """
+
+        start = time.perf_counter()
+        error = False
+
+        try:
+            yield
+
+        except Exception:
+            error = True
+            raise
+
+        finally:
+            if name not in self.histograms:
+                self.histograms[name] = LatencyHistogram()
+
+            self.histograms[name].record(time.perf_counter() - start, error)
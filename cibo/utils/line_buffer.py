@@ -0,0 +1,117 @@
+"""Holds on to the text a client sends, until a line ending arrives. Completed lines
+are then handed back together, in the order they were sent.
+"""
+
+from typing import List
+
+
+class LineBuffer:
+    """Holds on to the text a client sends, until a line ending arrives.
+
+    A line can end in a carriage return, a line feed, or a carriage return followed by
+    either a line feed or a null byte.
+
+    Args:
+        encoding (str, optional): The character encoding used by the client.
+            Defaults to "utf-8".
+        error_policy (str, optional): How to handle bytes that can't be decoded.
+            Defaults to "replace".
+        max_line_length (int, optional): Lines longer than this many bytes are cut
+            short. Defaults to 1024.
+        max_lines (int, optional): The most lines handed back at once. Any more than
+            that are dropped. Defaults to 20.
+    """
+
+    LINE_ENDINGS = (b"\r", b"\n")
+
+    def __init__(
+        self,
+        encoding: str = "utf-8",
+        error_policy: str = "replace",
+        max_line_length: int = 1024,
+        max_lines: int = 20,
+    ) -> None:
+        self._encoding = encoding
+        self._error_policy = error_policy
+        self._max_line_length = max_line_length
+        self._max_lines = max_lines
+
+        # set when the text ended on a carriage return, in which case a line feed at
+        # the start of the next text belongs to the same line ending
+        self._after_carriage_return = False
+
+        # lines dropped for going past the most handed back at once, since they were
+        # last taken
+        self._dropped_lines = 0
+
+        self.data = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def erase_character(self) -> None:
+        """Remove the last character from the buffer. A multi-byte character ends in
+        continuation bytes, which are removed along with the byte that leads them.
+        Lines that have already ended are left alone.
+        """
+
+        if self.data.endswith(self.LINE_ENDINGS):
+            return
+
+        while self.data and self.data[-1] & 0xC0 == 0x80:
+            self.data.pop()
+
+        if self.data:
+            self.data.pop()
+
+    def take_lines(self) -> List[str]:
+        """Remove each completed line from the buffer.
+
+        Returns:
+            List[str]: The decoded lines, in the order they were sent.
+        """
+
+        # a read that only held Telnet messages leaves the buffer empty, and the line
+        # feed may still be to come
+        if self.data:
+            # the rest of a line ending that was split across reads
+            if self._after_carriage_return and self.data[:1] in (b"\n", b"\x00"):
+                del self.data[:1]
+
+            # anything else that arrived, even if it was only the rest of the line
+            # ending, means the next read starts afresh
+            self._after_carriage_return = self.data.endswith(b"\r")
+
+        # splitting is done in one go, and only treats carriage returns and line feeds
+        # as line endings. A carriage return followed by a null byte is one line ending
+        chunks = self.data.replace(b"\r\x00", b"\r").splitlines(keepends=True)
+        self.data.clear()
+
+        if chunks and not chunks[-1].endswith(self.LINE_ENDINGS):
+            # hold on to no more than a full line's worth of an unfinished line, so a
+            # client can't grow the buffer forever by never ending it
+            self.data += chunks.pop()[: self._max_line_length]
+
+        self._dropped_lines += max(0, len(chunks) - self._max_lines)
+
+        # line endings are single byte characters, so a line never ends partway
+        # through a multi-byte character
+        return [
+            chunk.rstrip(b"\r\n")[: self._max_line_length].decode(
+                self._encoding, self._error_policy
+            )
+            for chunk in chunks[: self._max_lines]
+        ]
+
+    def take_dropped_lines(self) -> int:
+        """Take the count of lines dropped for arriving too many at once, since the
+        last time.
+
+        Returns:
+            int: How many lines were dropped.
+        """
+
+        dropped_lines = self._dropped_lines
+        self._dropped_lines = 0
+
+        return dropped_lines
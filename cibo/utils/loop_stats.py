@@ -0,0 +1,90 @@
+"""Measures how long each phase of the game loop takes, so we can see where the time
+goes and how much headroom is left, before players start to notice any lag.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterator
+
+
+class LoopPhase(str, Enum):
+    """The phases of a pass through the game loop."""
+
+    # accepting new connections, and reading from the sockets that are ready. Time
+    # spent waiting for them to be ready isn't included
+    NETWORK = "network"
+
+    # running the commands clients sent
+    INPUT = "input"
+
+    # running the tick events
+    TICKS = "ticks"
+
+    # cleaning up after disconnected clients, and sending everyone's output
+    FLUSH = "flush"
+
+
+@dataclass
+class PhaseStats:
+    """How long a single phase of the game loop has been taking."""
+
+    # how many times the phase has run, and the total time it took
+    count: int = 0
+    total: float = 0.0
+
+    # the time the most recent run took, and the longest any run has taken
+    last: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """The average time the phase takes.
+
+        Returns:
+            float: The average, in seconds.
+        """
+
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, elapsed: float) -> None:
+        """Record how long a run of the phase took.
+
+        Args:
+            elapsed (float): The time taken, in seconds.
+        """
+
+        self.count += 1
+        self.total += elapsed
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+
+
+class LoopStats:
+    """Measures how long each phase of the game loop takes."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[LoopPhase, PhaseStats] = {
+            phase: PhaseStats() for phase in LoopPhase
+        }
+
+    @contextmanager
+    def measure(self, phase: LoopPhase) -> Iterator[PhaseStats]:
+        """Time the code run within the context, as a run of the phase.
+
+        Args:
+            phase (LoopPhase): The phase being run.
+
+        Yields:
+            PhaseStats: The phase's stats, which include the run once it's finished.
+        """
+
+        stats = self.phases[phase]
+        start = time.perf_counter()
+
+        try:
+            yield stats
+
+        finally:
+            stats.record(time.perf_counter() - start)
@@ -0,0 +1,223 @@
+"""Holds on to the output queued for a client, until their socket is ready to take it.
+That way a client who is slow to read never holds up sending to everyone else.
+
+Once a client falls too far behind, either their low-priority output is dropped or
+they are disconnected, depending on the overflow policy. A client who falls much
+further behind is disconnected either way.
+
+For clients that support MCCP2, the output can also be compressed. Everything queued
+between writes is compressed together, and flushed so the client can decompress it
+straight away.
+"""
+
+import socket
+import zlib
+from enum import Enum
+from typing import Optional
+
+from cibo.utils.traffic_stats import TrafficStats
+
+
+class OutboxOverflow(int, Enum):
+    """What to do once a client's queued output goes past the high-water mark."""
+
+    DISCONNECT = 1
+    DROP_LOW_PRIORITY = 2
+
+
+class Outbox:
+    """Holds on to the output queued for a client, until their socket is ready to
+    take it.
+
+    Args:
+        high_water_mark (int, optional): How many bytes can be waiting to be sent,
+            before the overflow policy kicks in. Defaults to 262144.
+        overflow (OutboxOverflow, optional): What to do once the high-water mark is
+            passed. Defaults to OutboxOverflow.DROP_LOW_PRIORITY.
+        traffic_stats (Optional[TrafficStats], optional): Where to count the bytes
+            sent, shared by every client of the server. Defaults to None.
+    """
+
+    # how many times the high-water mark a client can fall behind by, before they're
+    # disconnected even when only low-priority output is being dropped
+    HARD_LIMIT_FACTOR = 4
+
+    def __init__(
+        self,
+        high_water_mark: int = 262144,
+        overflow: OutboxOverflow = OutboxOverflow.DROP_LOW_PRIORITY,
+        traffic_stats: Optional[TrafficStats] = None,
+    ) -> None:
+        self._high_water_mark = high_water_mark
+        self._overflow = overflow
+        self._traffic_stats = traffic_stats
+
+        self._compressor: Optional["zlib._Compress"] = None
+
+        # output queued since the last write, waiting to be compressed
+        self._uncompressed = bytearray()
+
+        self.data = bytearray()
+        self.dropped_messages = 0
+
+        # how much output went into the compressor, and how much came out
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.data) + len(self._uncompressed)
+
+    @property
+    def is_compressed(self) -> bool:
+        """Check if the output is being compressed.
+
+        Returns:
+            bool: Is the output being compressed or not.
+        """
+
+        return self._compressor is not None
+
+    def start_compression(self, marker: bytes) -> None:
+        """Compress everything queued from now on, in a single zlib stream.
+
+        Args:
+            marker (bytes): Sent uncompressed ahead of the stream, to let the client
+                know it's starting.
+        """
+
+        if self._compressor:
+            return
+
+        self.data += marker
+        self._compressor = zlib.compressobj()
+
+    def stop_compression(self) -> None:
+        """End the compressed stream, so everything queued from now on is sent as it
+        is. The client stops decompressing once they reach the end of the stream.
+        """
+
+        if not self._compressor:
+            return
+
+        self._compress()
+
+        self.data += self._compressor.flush(zlib.Z_FINISH)
+        self._compressor = None
+
+    def queue(self, data: bytes, low_priority: bool = False, backlog: int = 0) -> bool:
+        """Add the data to the end of the queue, unless the client has fallen too far
+        behind.
+
+        Args:
+            data (bytes): The encoded output.
+            low_priority (bool, optional): If the output can be dropped when the
+                client falls behind. Defaults to False.
+            backlog (int, optional): Bytes already handed off elsewhere, but not yet
+                sent. Anything still in the queue is counted separately. Defaults
+                to 0.
+
+        Returns:
+            bool: False if the client overflowed, and should be disconnected.
+        """
+
+        queued = backlog + len(self) + len(data)
+
+        if queued > self._high_water_mark:
+            # output that can't be dropped still has a limit, so a client who never
+            # reads can't grow their queue forever
+            if (
+                self._overflow is OutboxOverflow.DISCONNECT
+                or queued > self._high_water_mark * self.HARD_LIMIT_FACTOR
+            ):
+                return False
+
+            if low_priority:
+                self.dropped_messages += 1
+                return True
+
+        if self._compressor:
+            self._uncompressed += data
+        else:
+            self.data += data
+
+        return True
+
+    def clear(self) -> None:
+        """Throw away everything queued, compressed or not."""
+
+        self._uncompressed.clear()
+        self.data.clear()
+
+    def take(self, count_sent: bool = True) -> bytes:
+        """Take everything in the queue at once, for a stream that does its own
+        buffering.
+
+        Args:
+            count_sent (bool, optional): If the output counts towards the bytes sent.
+                Output that's only being handed off to another process isn't sent
+                yet. Defaults to True.
+
+        Returns:
+            bytes: The output, ready to be sent.
+        """
+
+        self._compress()
+
+        data = bytes(self.data)
+        self.data.clear()
+
+        if count_sent:
+            self._count_sent(len(data))
+
+        return data
+
+    def write_to(self, socket_: socket.socket) -> None:
+        """Send as much of the queue as the socket will take, without waiting. Whatever
+        is left is sent the next time the socket is ready.
+
+        Args:
+            socket_ (socket.socket): The client's non-blocking socket.
+
+        Raises:
+            OSError: The client has disconnected.
+        """
+
+        self._compress()
+
+        try:
+            sent = socket_.send(self.data)
+
+        # the socket's send buffer is full, so nothing could be sent this time
+        except BlockingIOError:
+            return
+
+        del self.data[:sent]
+
+        self._count_sent(sent)
+
+    def _count_sent(self, sent: int) -> None:
+        """Count the bytes towards the server's traffic, if it's keeping count.
+
+        Args:
+            sent (int): The number of bytes sent.
+        """
+
+        if self._traffic_stats:
+            self._traffic_stats.bytes_sent += sent
+
+    def _compress(self) -> None:
+        """Compress the output queued since the last write, and flush the compressor
+        so the client can decompress all of it straight away.
+        """
+
+        if not self._compressor or not self._uncompressed:
+            return
+
+        compressed = self._compressor.compress(self._uncompressed)
+        compressed += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        self.raw_bytes += len(self._uncompressed)
+        self.compressed_bytes += len(compressed)
+
+        self.data += compressed
+        self._uncompressed.clear()
@@ -0,0 +1,89 @@
+"""Builds the Telnet protocol messages sent to clients, to negotiate the options the
+server supports and to pass along option data.
+"""
+
+import json
+from enum import Enum
+from typing import Any
+
+
+class TelnetMessage:
+    """Builds the Telnet protocol messages sent to clients."""
+
+    class CommandCode(int, Enum):
+        """Command codes used by telnet protocol."""
+
+        INTERPRET_AS_MESSAGE = 255
+        ARE_YOU_THERE = 246
+        WILL = 251
+        WONT = 252
+        DO = 253
+        DONT = 254
+        SUBNEGOTIATION_START = 250
+        SUBNEGOTIATION_END = 240
+
+    class OptionCode(int, Enum):
+        """Option codes for the telnet protocol extensions we support."""
+
+        WINDOW_SIZE = 31
+        COMPRESS2 = 86
+        GMCP = 201
+
+    INTERPRET_AS_MESSAGE = bytes([CommandCode.INTERPRET_AS_MESSAGE])
+    SUBNEGOTIATION_START = bytes(
+        [CommandCode.INTERPRET_AS_MESSAGE, CommandCode.SUBNEGOTIATION_START]
+    )
+    SUBNEGOTIATION_END = bytes(
+        [CommandCode.INTERPRET_AS_MESSAGE, CommandCode.SUBNEGOTIATION_END]
+    )
+
+    @classmethod
+    def negotiation(cls, command: CommandCode, option: OptionCode) -> bytes:
+        """Build an option negotiation message.
+
+        Args:
+            command (CommandCode): One of WILL, WONT, DO or DONT.
+            option (OptionCode): The option being negotiated.
+
+        Returns:
+            bytes: The message.
+        """
+
+        return cls.INTERPRET_AS_MESSAGE + bytes([command, option])
+
+    @classmethod
+    def subnegotiation(cls, option: OptionCode, data: bytes = b"") -> bytes:
+        """Build a subnegotiation message.
+
+        Args:
+            option (OptionCode): The option the data is for.
+            data (bytes, optional): The subnegotiation data. Defaults to b"".
+
+        Returns:
+            bytes: The message.
+        """
+
+        # any 255 bytes in the data have to be escaped, so they aren't mistaken for
+        # the end of the subnegotiation
+        data = data.replace(cls.INTERPRET_AS_MESSAGE, cls.INTERPRET_AS_MESSAGE * 2)
+
+        return (
+            cls.SUBNEGOTIATION_START + bytes([option]) + data + cls.SUBNEGOTIATION_END
+        )
+
+    @classmethod
+    def gmcp(cls, package: str, data: Any) -> bytes:
+        """Build a GMCP message, carrying structured data for the client.
+
+        Args:
+            package (str): What the data is, e.g. "Room.Info".
+            data (Any): The data, which must serialize to JSON.
+
+        Returns:
+            bytes: The message.
+        """
+
+        # compact separators, since the message is sent as often as the data changes
+        payload = f"{package} {json.dumps(data, separators=(',', ':'))}"
+
+        return cls.subnegotiation(cls.OptionCode.GMCP, payload.encode("utf-8"))
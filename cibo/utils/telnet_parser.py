@@ -0,0 +1,358 @@
+"""Parses the raw bytes sent by a Telnet client, separating the text they typed from
+any Telnet protocol messages mixed in with it.
+
+The Telnet protocol allows special message codes to be inserted into the data. We must
+at least detect and skip over them so that we don't interpret them as text data. Option
+negotiations are kept, so the server can respond to the options it supports. More info
+on the Telnet protocol can be found here:
+
+    http://pcmicro.com/netfoss/telnet.html
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from cibo.utils.line_buffer import LineBuffer
+from cibo.utils.telnet_message import TelnetMessage
+
+
+class TelnetParser:
+    """Incrementally parses the bytes received from a single client. State is kept
+    between reads, so that messages and multi-byte characters split across more than
+    one read are put back together correctly.
+
+    Plain text and subnegotiations are scanned through in bulk, so only the Telnet
+    message codes themselves are handled a byte at a time. Text is held on to until a
+    line ending arrives.
+
+    Args:
+        encoding (str, optional): The character encoding used by the client.
+            Defaults to "utf-8".
+        error_policy (str, optional): How to handle bytes that can't be decoded.
+            Defaults to "replace".
+        max_line_length (int, optional): Lines longer than this many bytes are cut
+            short. Defaults to 1024.
+        max_lines (int, optional): The most lines handed back from a single read.
+            Any more than that are dropped. Defaults to 20.
+    """
+
+    INTERPRET_AS_MESSAGE = TelnetMessage.INTERPRET_AS_MESSAGE
+    SUBNEGOTIATION_END = TelnetMessage.SUBNEGOTIATION_END
+    BACKSPACE = b"\x08"
+
+    # plain int copies of the codes we check each message against, since comparing
+    # against an Enum member is comparatively slow in a tight loop
+    INTERPRET_AS_MESSAGE_CODE = int(TelnetMessage.CommandCode.INTERPRET_AS_MESSAGE)
+    SUBNEGOTIATION_START_CODE = int(TelnetMessage.CommandCode.SUBNEGOTIATION_START)
+    SUBNEGOTIATION_END_CODE = int(TelnetMessage.CommandCode.SUBNEGOTIATION_END)
+
+    # these message codes are followed by an option code, rather than text
+    OPTION_CODES = frozenset(
+        int(code)
+        for code in (
+            TelnetMessage.CommandCode.WILL,
+            TelnetMessage.CommandCode.WONT,
+            TelnetMessage.CommandCode.DO,
+            TelnetMessage.CommandCode.DONT,
+        )
+    )
+
+    # subnegotiation data past this many bytes is dropped
+    MAX_SUBNEGOTIATION_LENGTH = 8192
+
+    def __init__(
+        self,
+        encoding: str = "utf-8",
+        error_policy: str = "replace",
+        max_line_length: int = 1024,
+        max_lines: int = 20,
+    ) -> None:
+        # the read state we're in is the method that handles the data next. It's
+        # swapped out as we move between text, messages and subnegotiations
+        self._read: Callable[[bytes, memoryview, int], int] = self._read_text
+        self._option_command = 0
+        self._subnegotiation = bytearray()
+
+        self.buffer = LineBuffer(encoding, error_policy, max_line_length, max_lines)
+        self.negotiations: List[Tuple[int, int]] = []
+        self.subnegotiations: List[Tuple[int, bytes]] = []
+
+    def take_negotiations(self) -> List[Tuple[int, int]]:
+        """Take the option negotiations the client has sent, since the last time.
+
+        Returns:
+            List[Tuple[int, int]]: The command and option codes of each negotiation,
+                in the order they were sent.
+        """
+
+        negotiations = self.negotiations
+        self.negotiations = []
+
+        return negotiations
+
+    def take_subnegotiations(self) -> List[Tuple[int, bytes]]:
+        """Take the subnegotiations the client has sent, since the last time.
+
+        Returns:
+            List[Tuple[int, bytes]]: The option code and data of each subnegotiation,
+                in the order they were sent.
+        """
+
+        subnegotiations = self.subnegotiations
+        self.subnegotiations = []
+
+        return subnegotiations
+
+    def feed(self, data: bytes, length: Optional[int] = None) -> List[str]:
+        """Parse the data received from the client, stripping out any Telnet messages.
+
+        Args:
+            data (bytes): The raw data, as it was read from the socket.
+            length (Optional[int], optional): How much of the data to parse, so a
+                receive buffer can be parsed in place. Defaults to None, which parses
+                all of it.
+
+        Returns:
+            List[str]: Each line of text completed by the data, in the order they
+                were sent.
+        """
+
+        # the view is what bounds each read state, so everything past the length is
+        # never looked at
+        with memoryview(data)[:length] as view:
+            position = 0
+
+            while position < len(view):
+                position = self._read(data, view, position)
+
+        return self.buffer.take_lines()
+
+    def _read_text(self, data: bytes, view: memoryview, position: int) -> int:
+        """Copy everything up to the next Telnet message into the buffer, in one go.
+
+        Args:
+            data (bytes): The raw data.
+            view (memoryview): A view of the raw data, so slices aren't copied.
+            position (int): Where in the data to start reading.
+
+        Returns:
+            int: Where in the data to continue reading from.
+        """
+
+        end = len(view)
+
+        while True:
+            message_start = data.find(self.INTERPRET_AS_MESSAGE, position, end)
+            text_end = end if message_start < 0 else message_start
+
+            if text_end > position:
+                self._take_text(data, view, position, text_end)
+
+            if message_start < 0:
+                return text_end
+
+            # negotiations and subnegotiations usually arrive whole, in which case
+            # they're taken here without leaving the text state. Anything else is
+            # left to the message state
+            code = data[message_start + 1] if message_start + 1 < end else -1
+
+            if code in self.OPTION_CODES and message_start + 2 < end:
+                self.negotiations.append((code, data[message_start + 2]))
+                position = message_start + 3
+                continue
+
+            if code == self.SUBNEGOTIATION_START_CODE:
+                position = self._take_whole_subnegotiation(
+                    data, view, message_start + 1
+                )
+
+                if position >= 0:
+                    continue
+
+            self._read = self._read_message
+
+            return message_start + 1
+
+    def _take_text(
+        self, data: bytes, view: memoryview, position: int, text_end: int
+    ) -> None:
+        """Copy the text into the buffer, acting on any backspaces within it.
+
+        Args:
+            data (bytes): The raw data.
+            view (memoryview): A view of the raw data, so slices aren't copied.
+            position (int): Where in the data the text starts.
+            text_end (int): Where in the data the text ends.
+        """
+
+        # some telnet clients send the characters as soon as the user types them. So
+        # if we get a backspace character, this is where the user has deleted a
+        # character and we should delete the last character from the buffer
+        backspace = data.find(self.BACKSPACE, position, text_end)
+
+        while backspace >= 0:
+            self.buffer.data += view[position:backspace]
+            self.buffer.erase_character()
+
+            position = backspace + 1
+            backspace = data.find(self.BACKSPACE, position, text_end)
+
+        self.buffer.data += view[position:text_end]
+
+    def _read_message(self, data: bytes, view: memoryview, position: int) -> int:
+        """Handle the message code that follows an 'interpret as message' code.
+
+        Args:
+            data (bytes): The raw data.
+            view (memoryview): A view of the raw data, which ends where the data
+                does.
+            position (int): Where in the data the message code is.
+
+        Returns:
+            int: Where in the data to continue reading from.
+        """
+
+        code = data[position]
+        self._read = self._read_text
+
+        if code in self.OPTION_CODES:
+            # the option code usually arrives in the same read, in which case we can
+            # take the whole message at once
+            if position + 1 < len(view):
+                self.negotiations.append((code, data[position + 1]))
+                return position + 2
+
+            self._option_command = code
+            self._read = self._read_option
+
+        # the following bytes are a list of options until we're told otherwise
+        elif code == self.SUBNEGOTIATION_START_CODE:
+            subnegotiation_end = self._take_whole_subnegotiation(data, view, position)
+
+            if subnegotiation_end >= 0:
+                return subnegotiation_end
+
+            self._subnegotiation = bytearray()
+            self._read = self._read_subnegotiation
+
+        # a repeated 'interpret as message' code is how the client sends us an actual
+        # 255 byte. For all other message codes, there is no accompanying data
+        elif code == self.INTERPRET_AS_MESSAGE_CODE:
+            self.buffer.data.append(code)
+
+        return position + 1
+
+    def _take_whole_subnegotiation(
+        self, data: bytes, view: memoryview, position: int
+    ) -> int:
+        """Take a subnegotiation in one go, if the whole of it arrived in this read.
+
+        Args:
+            data (bytes): The raw data.
+            view (memoryview): A view of the raw data, which ends where the data
+                does.
+            position (int): Where in the data the subnegotiation start code is.
+
+        Returns:
+            int: Where in the data to continue reading from, or -1 if the rest of the
+                subnegotiation is still to come.
+        """
+
+        subnegotiation_end = data.find(self.SUBNEGOTIATION_END, position, len(view))
+
+        # unless the end we found is actually an escaped 255 byte followed by a 240
+        # byte, we can take all of it at once
+        if subnegotiation_end < 0 or (
+            data[subnegotiation_end - 1] == self.INTERPRET_AS_MESSAGE_CODE
+        ):
+            return -1
+
+        self._take_subnegotiation(
+            bytes(view[position + 1 : subnegotiation_end]).replace(
+                self.INTERPRET_AS_MESSAGE * 2, self.INTERPRET_AS_MESSAGE
+            )
+        )
+
+        return subnegotiation_end + 2
+
+    def _read_option(self, data: bytes, _view: memoryview, position: int) -> int:
+        """Take the option code of a negotiation that was split across reads.
+
+        Args:
+            data (bytes): The raw data.
+            _view (memoryview): Unused.
+            position (int): Where in the data the option code is.
+
+        Returns:
+            int: Where in the data to continue reading from.
+        """
+
+        self.negotiations.append((self._option_command, data[position]))
+        self._read = self._read_text
+
+        return position + 1
+
+    def _read_subnegotiation(self, data: bytes, view: memoryview, position: int) -> int:
+        """Collect the subnegotiation data, up to the next message code, which may end
+        the subnegotiation.
+
+        Args:
+            data (bytes): The raw data.
+            view (memoryview): A view of the raw data, so slices aren't copied.
+            position (int): Where in the data to start reading.
+
+        Returns:
+            int: Where in the data to continue reading from.
+        """
+
+        message_start = data.find(self.INTERPRET_AS_MESSAGE, position, len(view))
+        data_end = len(view) if message_start < 0 else message_start
+
+        if len(self._subnegotiation) < self.MAX_SUBNEGOTIATION_LENGTH:
+            self._subnegotiation += view[position:data_end]
+
+        if message_start < 0:
+            return data_end
+
+        self._read = self._read_subnegotiation_message
+
+        return message_start + 1
+
+    def _read_subnegotiation_message(
+        self, data: bytes, _view: memoryview, position: int
+    ) -> int:
+        """Handle a message code within a subnegotiation. Only an 'end of
+        subnegotiation' code returns us to reading text.
+
+        Args:
+            data (bytes): The raw data.
+            _view (memoryview): Unused.
+            position (int): Where in the data the message code is.
+
+        Returns:
+            int: Where in the data to continue reading from.
+        """
+
+        code = data[position]
+
+        if code == self.SUBNEGOTIATION_END_CODE:
+            self._take_subnegotiation(self._subnegotiation)
+            self._read = self._read_text
+
+        else:
+            # an escaped 255 byte is part of the data
+            if code == self.INTERPRET_AS_MESSAGE_CODE:
+                self._subnegotiation.append(code)
+
+            self._read = self._read_subnegotiation
+
+        return position + 1
+
+    def _take_subnegotiation(self, subnegotiation: bytes) -> None:
+        """Keep a complete subnegotiation, for the server to act on.
+
+        Args:
+            subnegotiation (bytes): The option code, followed by its data.
+        """
+
+        if subnegotiation:
+            self.subnegotiations.append((subnegotiation[0], bytes(subnegotiation[1:])))
@@ -0,0 +1,128 @@
+"""Keeps the game's ticks to a fixed timestep, measured against the monotonic clock
+rather than by sleeping in between them. However long a tick takes, the ticks after
+it stay on schedule.
+
+Once the loop falls behind, the ticks it missed are run back to back to catch up,
+up to a limit. Any further behind than that and the rest are skipped, so a stall
+isn't followed by a flood of ticks.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class TickStats:
+    """How well the ticks are keeping to their schedule."""
+
+    # every tick run since the clock started
+    ticks: int = 0
+
+    # ticks run back to back, to catch up after the loop fell behind
+    caught_up_ticks: int = 0
+
+    # ticks skipped over, because the loop fell too far behind to catch up
+    skipped_ticks: int = 0
+
+    # ticks that took longer to run than the time between ticks
+    overruns: int = 0
+
+    # how late the most recent ticks were, in seconds, and the latest any have been
+    lag: float = 0.0
+    max_lag: float = 0.0
+
+
+class TickClock:
+    """Keeps the game's ticks to a fixed timestep.
+
+    Args:
+        pulse_rate (float, optional): Ticks per second. Defaults to 10.0.
+        max_catch_up (int, optional): The most ticks run back to back once the loop
+            falls behind. Defaults to 5.
+    """
+
+    def __init__(self, pulse_rate: float = 10.0, max_catch_up: int = 5) -> None:
+        self._interval = 1 / pulse_rate
+        self._max_catch_up = max_catch_up
+
+        self._deadline = time.monotonic()
+
+        self.stats = TickStats()
+
+    @property
+    def interval(self) -> float:
+        """The time between ticks.
+
+        Returns:
+            float: The interval, in seconds.
+        """
+
+        return self._interval
+
+    def start(self, now: Optional[float] = None) -> None:
+        """Start the schedule over, with the first tick due straight away.
+
+        Args:
+            now (Optional[float], optional): The monotonic time. Defaults to None,
+                which reads the clock.
+        """
+
+        self._deadline = time.monotonic() if now is None else now
+
+    def time_until_tick(self, now: Optional[float] = None) -> float:
+        """How long until the next tick is due.
+
+        Args:
+            now (Optional[float], optional): The monotonic time. Defaults to None,
+                which reads the clock.
+
+        Returns:
+            float: The time left, in seconds. Zero if a tick is already due.
+        """
+
+        now = time.monotonic() if now is None else now
+
+        return max(0.0, self._deadline - now)
+
+    def take_due(self, now: Optional[float] = None) -> int:
+        """Work out how many ticks should be run now, and move the schedule on past
+        them. The deadlines stay on the same fixed grid, no matter how late they're
+        taken, so the ticks never drift.
+
+        Args:
+            now (Optional[float], optional): The monotonic time. Defaults to None,
+                which reads the clock.
+
+        Returns:
+            int: The number of ticks to run, one after the other.
+        """
+
+        now = time.monotonic() if now is None else now
+
+        if now < self._deadline:
+            return 0
+
+        lag = now - self._deadline
+        missed = int(lag / self._interval) + 1
+        due = min(missed, self._max_catch_up)
+
+        self._deadline += missed * self._interval
+
+        self.stats.ticks += due
+        self.stats.caught_up_ticks += due - 1
+        self.stats.skipped_ticks += missed - due
+        self.stats.lag = lag
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+
+        return due
+
+    def record(self, elapsed: float) -> None:
+        """Record how long a tick took to run.
+
+        Args:
+            elapsed (float): The time taken, in seconds.
+        """
+
+        if elapsed > self._interval:
+            self.stats.overruns += 1
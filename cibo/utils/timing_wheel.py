@@ -0,0 +1,240 @@
+"""A hierarchical timing wheel, that runs callbacks once their timer is up. Used for
+anything that has to happen later, or over and over: cooldowns, respawns, autosaves,
+decay, and so on.
+
+Timers are filed into slots by when they're due, so adding or cancelling one is
+constant time, however many there are. Each tick only looks at the single slot that's
+now due. Timers due far in the future wait in the coarser wheels above, and move down
+into finer ones as their time gets closer.
+
+Everything runs on the game loop's thread, between updates, so callbacks can safely
+touch the clients and the world.
+"""
+
+import logging
+import math
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """A callback waiting on a timing wheel. Keep hold of it, to cancel it later.
+
+    Args:
+        callback (Callable[[], None]): Called once the timer is up.
+        expires (int): The tick the timer is up on.
+        interval (Optional[int], optional): Ticks between each run, for a timer
+            that repeats. Defaults to None, which only runs once.
+    """
+
+    def __init__(
+        self, callback: Callable[[], None], expires: int, interval: Optional[int] = None
+    ) -> None:
+        self.callback = callback
+        self.expires = expires
+        self.interval = interval
+
+        # the wheel slot the timer is waiting in, so it can be taken straight out
+        self._slot: Optional[Dict["Timer", None]] = None
+
+    @property
+    def is_pending(self) -> bool:
+        """Check if the timer is still waiting to run.
+
+        Returns:
+            bool: Is the timer waiting or not.
+        """
+
+        return self._slot is not None
+
+    def cancel(self) -> None:
+        """Stop the timer from running, including any repeats."""
+
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+
+    def wait_in(self, slot: Dict["Timer", None]) -> None:
+        """Move the timer into a wheel slot, to wait there until it's due.
+
+        Args:
+            slot (Dict[Timer, None]): The wheel slot.
+        """
+
+        self.cancel()
+
+        self._slot = slot
+        slot[self] = None
+
+
+class TimingWheel:
+    """A hierarchical timing wheel, that runs callbacks once their timer is up.
+
+    Args:
+        tick_interval (float, optional): The time each tick stands for, in seconds.
+            Defaults to 0.1.
+    """
+
+    # each wheel has this many slots, as a power of two
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+
+    # how many wheels there are. Each slot of a wheel spans a whole turn of the wheel
+    # below it, so the top wheel reaches 64^4 ticks ahead. Timers due any later than
+    # that wait in its furthest slot, until they come into range
+    LEVELS = 4
+
+    def __init__(self, tick_interval: float = 0.1) -> None:
+        self._tick_interval = tick_interval
+
+        # the tick the wheel is on
+        self._now = 0
+
+        # the slots hold their timers as dict keys, which keeps them in the order
+        # they were added, and lets any one of them be taken out in constant time
+        self._wheels: List[List[Dict[Timer, None]]] = [
+            [{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(slot) for wheel in self._wheels for slot in wheel)
+
+    @property
+    def now(self) -> int:
+        """The tick the wheel is on.
+
+        Returns:
+            int: The number of ticks since the wheel started.
+        """
+
+        return self._now
+
+    def to_ticks(self, seconds: float) -> int:
+        """Work out how many ticks a length of time is, rounding up.
+
+        Args:
+            seconds (float): The length of time.
+
+        Returns:
+            int: The number of ticks, at least one.
+        """
+
+        # allow for a little floating point error, so 0.3 seconds is 3 ticks, not 4
+        return max(1, math.ceil(round(seconds / self._tick_interval, 6)))
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        """Run the callback once, after a delay.
+
+        Args:
+            delay (float): How long to wait, in seconds.
+            callback (Callable[[], None]): The callback to run.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+
+        return self.add(Timer(callback, self._now + self.to_ticks(delay)))
+
+    def call_every(self, interval: float, callback: Callable[[], None]) -> Timer:
+        """Run the callback over and over, waiting the interval before each run.
+
+        Args:
+            interval (float): The time between runs, in seconds.
+            callback (Callable[[], None]): The callback to run.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+
+        ticks = self.to_ticks(interval)
+
+        return self.add(Timer(callback, self._now + ticks, ticks))
+
+    def add(self, timer: Timer) -> Timer:
+        """File the timer into the slot it's due in. A timer that's already due runs
+        on the next tick.
+
+        Args:
+            timer (Timer): The timer.
+
+        Returns:
+            Timer: The same timer.
+        """
+
+        timer.expires = max(timer.expires, self._now + 1)
+
+        self._file(timer)
+
+        return timer
+
+    def tick(self) -> None:
+        """Move the wheel on by one tick, and run every timer that's now up."""
+
+        self._now += 1
+
+        # each time a wheel comes round to its start, the next slot of the wheel
+        # above is now close enough to be sorted into the finer wheels
+        for level in range(1, self.LEVELS):
+            if self._now & ((1 << (self.SLOT_BITS * level)) - 1):
+                break
+
+            slot = self._wheels[level][self._slot_index(self._now, level)]
+
+            for timer in list(slot):
+                self._file(timer)
+
+        slot = self._wheels[0][self._slot_index(self._now, 0)]
+
+        # the slot is emptied one timer at a time, so a callback can still cancel
+        # one of the others due alongside it
+        while slot:
+            timer = next(iter(slot))
+
+            if timer.interval:
+                timer.expires += timer.interval
+                self._file(timer)
+
+            else:
+                timer.cancel()
+
+            # a callback that raises is logged, and the rest of the slot still runs
+            try:
+                timer.callback()
+
+            except Exception:
+                logger.exception("Error running timer %r", timer.callback)
+
+    def _file(self, timer: Timer) -> None:
+        """Put the timer in the slot of the finest wheel that reaches its expiry.
+
+        Args:
+            timer (Timer): The timer.
+        """
+
+        # a timer that's further off than the top wheel reaches waits in its
+        # furthest slot, and is filed again once that slot comes round
+        expires = min(
+            timer.expires, self._now + (1 << (self.SLOT_BITS * self.LEVELS)) - 1
+        )
+        ticks_left = expires - self._now
+
+        level = 0
+
+        while ticks_left >= 1 << (self.SLOT_BITS * (level + 1)):
+            level += 1
+
+        timer.wait_in(self._wheels[level][self._slot_index(expires, level)])
+
+    def _slot_index(self, tick: int, level: int) -> int:
+        """Work out which of a wheel's slots a tick falls in.
+
+        Args:
+            tick (int): The tick.
+            level (int): Which wheel, where zero is the finest.
+
+        Returns:
+            int: The slot index.
+        """
+
+        return (tick >> (self.SLOT_BITS * level)) & (self.SLOTS - 1)
@@ -0,0 +1,274 @@
+"""Traces a client's input through the server, from the moment it's run until the
+output it produced is written to their socket. Each trace is made up of spans, timing
+the steps along the way: the event, the command lookup, the action, every database
+query, message render, and message sent.
+
+Only a sample of inputs are traced. The spans are written out by a thread of its own,
+so the game loop never waits on the disk. The file can be opened in a trace viewer,
+such as Perfetto or chrome://tracing, with each trace on a track of its own.
+
+Tracing is off until it's started. Until then, and for any input that isn't sampled,
+opening a span costs next to nothing.
+"""
+
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from queue import SimpleQueue
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, TextIO
+
+
+@dataclass
+class Span:
+    """A single step of a trace, and how long it took."""
+
+    name: str
+    trace_id: int
+    start: float
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    def to_event(self, end: float) -> Dict[str, Any]:
+        """Convert the span into a trace event, that a trace viewer can show.
+
+        Args:
+            end (float): When the span ended, from the performance counter.
+
+        Returns:
+            Dict[str, Any]: The trace event.
+        """
+
+        return {
+            "name": self.name,
+            "cat": "cibo",
+            "ph": "X",
+            "ts": round(self.start * 1_000_000, 3),
+            "dur": round((end - self.start) * 1_000_000, 3),
+            "pid": os.getpid(),
+            "tid": self.trace_id,
+            "args": self.args,
+        }
+
+
+class Tracer:
+    """Traces a sample of client input through the server, writing the spans out to a
+    file in the background.
+    """
+
+    def __init__(self) -> None:
+        self._sample_rate = 0.0
+        self._trace_ids = itertools.count(1)
+
+        self._events: Optional[SimpleQueue] = None
+        self._writer: Optional[threading.Thread] = None
+
+        # the spans that are open on each thread, innermost last
+        self._local = threading.local()
+
+        # the traces still waiting on their output to be written, by who they belong to
+        self._pending: Dict[int, List[Span]] = {}
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check if the tracer has been started.
+
+        Returns:
+            bool: Is the tracer running or not.
+        """
+
+        return self._writer is not None
+
+    @property
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+
+        stack: List[Span] = self._local.stack
+
+        return stack
+
+    def start(self, path: str, sample_rate: float = 0.01) -> None:
+        """Start tracing, writing the spans to the given file. A path ending in
+        ".jsonl" is written as one event per line. Anything else is written as a
+        Chrome trace.
+
+        Args:
+            path (str): The file to write to.
+            sample_rate (float, optional): The fraction of inputs to trace, from 0
+                to 1. Defaults to 0.01.
+        """
+
+        if self._writer:
+            return
+
+        self._sample_rate = sample_rate
+        self._events = SimpleQueue()
+
+        # pylint: disable=consider-using-with
+        # the file is closed by the writer, once it's told to stop
+        file = open(path, "w", encoding="utf-8")
+
+        self._writer = threading.Thread(
+            target=self._write,
+            args=(file, self._events, path.endswith(".jsonl")),
+            daemon=True,
+        )
+        self._writer.start()
+
+    def stop(self) -> None:
+        """Stop tracing, and wait for every span to be written out."""
+
+        if self._writer and self._events:
+            self._pending.clear()
+
+            self._events.put(None)
+            self._writer.join()
+
+        self._writer = None
+        self._events = None
+
+    @contextmanager
+    def trace(self, name: str, owner: Any, **args: Any) -> Iterator[None]:
+        """Open a new trace, if the input is sampled. Spans opened within the context
+        become part of it. The trace is held open afterwards, until it's finished for
+        its owner.
+
+        Args:
+            name (str): The name of the trace's first span.
+            owner (Any): Who the trace is for, e.g. the client who sent the input.
+            **args (Any): Details to show alongside the span.
+        """
+
+        if not self._events or random.random() >= self._sample_rate:
+            yield
+            return
+
+        root = Span(name, next(self._trace_ids), time.perf_counter(), args)
+        self._pending.setdefault(id(owner), []).append(root)
+
+        stack = self._stack
+        stack.append(root)
+
+        try:
+            yield
+
+        finally:
+            stack.pop()
+
+    def span(self, name: str, **args: Any) -> ContextManager[None]:
+        """Time the code run within the context, as a span of the current trace. Does
+        nothing if there isn't one.
+
+        Args:
+            name (str): The span name.
+            **args (Any): Details to show alongside the span.
+
+        Returns:
+            ContextManager[None]: The span.
+        """
+
+        if not self._events or not self._stack:
+            return nullcontext()
+
+        return self._span(name, self._stack[-1].trace_id, args)
+
+    def finish(self, owner: Any, name: str) -> ContextManager[None]:
+        """Time the code run within the context as the last span of the owner's open
+        traces, such as writing their output, then close the traces.
+
+        Args:
+            owner (Any): Who the traces are for.
+            name (str): The span name.
+
+        Returns:
+            ContextManager[None]: The span.
+        """
+
+        if id(owner) not in self._pending:
+            return nullcontext()
+
+        return self._finish(owner, name)
+
+    def close(self, owner: Any) -> None:
+        """Close the owner's open traces, e.g. once they've disconnected.
+
+        Args:
+            owner (Any): Who the traces are for.
+        """
+
+        end = time.perf_counter()
+
+        for root in self._pending.pop(id(owner), []):
+            self._emit(root.to_event(end))
+
+    @contextmanager
+    def _span(self, name: str, trace_id: int, args: Dict[str, Any]) -> Iterator[None]:
+        span = Span(name, trace_id, time.perf_counter(), args)
+
+        stack = self._stack
+        stack.append(span)
+
+        try:
+            yield
+
+        finally:
+            stack.pop()
+            self._emit(span.to_event(time.perf_counter()))
+
+    @contextmanager
+    def _finish(self, owner: Any, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            end = time.perf_counter()
+
+            for root in self._pending.get(id(owner), []):
+                self._emit(Span(name, root.trace_id, start).to_event(end))
+
+            self.close(owner)
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        """Hand the event over to be written out.
+
+        Args:
+            event (Dict[str, Any]): The trace event.
+        """
+
+        if self._events:
+            self._events.put(event)
+
+    def _write(self, file: TextIO, events: SimpleQueue, lines: bool) -> None:
+        """Write the events out as they arrive, until told to stop. Runs on the
+        writer thread.
+
+        Args:
+            file (TextIO): The file to write to.
+            events (SimpleQueue): The events waiting to be written.
+            lines (bool): Write one event per line, rather than a Chrome trace.
+        """
+
+        # a Chrome trace is a JSON array, which is allowed to go unclosed. That way
+        # it can be opened while it's still being written
+        separator = "\n" if lines else ",\n"
+
+        with file:
+            if not lines:
+                file.write("[\n")
+
+            while (event := events.get()) is not None:
+                file.write(json.dumps(event, default=str) + separator)
+
+                # the file is kept up to date whenever the tracer catches up
+                if events.empty():
+                    file.flush()
+
+
+# the one tracer shared by the whole server, so any step can be traced wherever it is
+tracer = Tracer()
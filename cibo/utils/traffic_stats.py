@@ -0,0 +1,18 @@
+"""Counts the input and output passing between the server and its clients."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class TrafficStats:
+    """How much has passed between the server and its clients, since it started."""
+
+    # every line of input run as a command
+    inputs: int = 0
+
+    # lines of input dropped, for arriving too many at once in a single read
+    dropped_lines: int = 0
+
+    # raw bytes read from, and written to, the clients' sockets
+    bytes_received: int = 0
+    bytes_sent: int = 0
@@ -0,0 +1,98 @@
+"""Builds the WebSocket protocol messages sent to browser clients: the reply to their
+opening handshake, and the frames that carry everything sent after it. More info on
+the WebSocket protocol can be found here:
+
+    https://datatracker.ietf.org/doc/html/rfc6455
+"""
+
+from base64 import b64encode
+from enum import Enum
+from hashlib import sha1
+
+
+class WebSocketMessage:
+    """Builds the WebSocket protocol messages sent to browser clients."""
+
+    class OpCode(int, Enum):
+        """Frame op codes used by the WebSocket protocol."""
+
+        CONTINUATION = 0
+        TEXT = 1
+        BINARY = 2
+        CLOSE = 8
+        PING = 9
+        PONG = 10
+
+    class CloseCode(int, Enum):
+        """Status codes sent along with a close frame."""
+
+        NORMAL = 1000
+        GOING_AWAY = 1001
+        PROTOCOL_ERROR = 1002
+        MESSAGE_TOO_BIG = 1009
+
+    # the protocol's fixed key, that proves the handshake reply came from a server
+    # that understands WebSockets
+    HANDSHAKE_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    BAD_REQUEST = (
+        b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+    )
+
+    @classmethod
+    def handshake(cls, key: bytes) -> bytes:
+        """Build the reply that accepts a client's opening handshake.
+
+        Args:
+            key (bytes): The Sec-WebSocket-Key the client sent.
+
+        Returns:
+            bytes: The reply.
+        """
+
+        accept = b64encode(sha1(key + cls.HANDSHAKE_GUID).digest())
+
+        return (
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+
+    @classmethod
+    def frame(cls, opcode: OpCode, payload: bytes = b"") -> bytes:
+        """Build a single, unfragmented frame. Frames sent by the server are never
+        masked.
+
+        Args:
+            opcode (OpCode): What kind of frame it is.
+            payload (bytes, optional): The frame's data. Defaults to b"".
+
+        Returns:
+            bytes: The frame.
+        """
+
+        length = len(payload)
+
+        # the first byte is the op code, with the final fragment bit set
+        if length < 126:
+            header = bytes([0x80 | opcode, length])
+        elif length < 65536:
+            header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+        else:
+            header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+
+        return header + payload
+
+    @classmethod
+    def close(cls, code: CloseCode) -> bytes:
+        """Build a close frame.
+
+        Args:
+            code (CloseCode): Why the connection is being closed.
+
+        Returns:
+            bytes: The frame.
+        """
+
+        return cls.frame(cls.OpCode.CLOSE, code.to_bytes(2, "big"))
@@ -0,0 +1,282 @@
+"""Parses the raw bytes sent by a browser client over a WebSocket. The opening
+handshake is answered, and the text of each message is unwrapped from its frames, so
+it can be handled exactly like the text a Telnet client sends.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from cibo.utils.websocket_message import WebSocketMessage
+
+
+class WebSocketParser:
+    """Incrementally parses the bytes received from a single browser client. Partial
+    handshakes and frames are held on to until the rest of them arrives.
+
+    Anything that needs to be sent back, like the handshake reply or the answer to a
+    ping, is collected in `replies`.
+
+    Args:
+        max_message_length (int, optional): Messages longer than this many bytes
+            close the connection. Defaults to 65536.
+    """
+
+    # a handshake that goes on longer than this without ending is turned away
+    MAX_HANDSHAKE_LENGTH = 8192
+
+    # plain int copies of the op codes, since comparing against an Enum member is
+    # comparatively slow for every frame
+    TEXT_CODE = int(WebSocketMessage.OpCode.TEXT)
+    CONTINUATION_CODE = int(WebSocketMessage.OpCode.CONTINUATION)
+    CLOSE_CODE = int(WebSocketMessage.OpCode.CLOSE)
+    PING_CODE = int(WebSocketMessage.OpCode.PING)
+
+    def __init__(self, max_message_length: int = 65536) -> None:
+        self._max_message_length = max_message_length
+
+        # the fragments of a message that hasn't finished arriving, and whether the
+        # message is text
+        self._message = bytearray()
+        self._message_is_text = False
+
+        self.buffer = bytearray()
+        self.is_open = False
+        self.is_closed = False
+        self.replies = bytearray()
+
+    def feed(self, data: bytes) -> bytes:
+        """Parse the data received from the client.
+
+        Args:
+            data (bytes): The raw data, as it was read from the socket.
+
+        Returns:
+            bytes: The text of each message completed by the data, each ending in a
+                line feed.
+        """
+
+        if self.is_closed:
+            return b""
+
+        self.buffer += data
+
+        if not self.is_open and not self._read_handshake():
+            return b""
+
+        text = bytearray()
+
+        while not self.is_closed and self._read_frame(text):
+            pass
+
+        return bytes(text)
+
+    def take_replies(self) -> bytes:
+        """Take everything that needs to be sent back to the client, since the last
+        time.
+
+        Returns:
+            bytes: The replies, ready to be sent.
+        """
+
+        replies = bytes(self.replies)
+        self.replies.clear()
+
+        return replies
+
+    @property
+    def unfinished_message(self) -> Tuple[bytes, bool]:
+        """The fragments of a message that hasn't finished arriving, and whether the
+        message is text. Setting it lets a fresh parser carry on with the message.
+
+        Returns:
+            Tuple[bytes, bool]: The fragments so far, and whether they're text.
+        """
+
+        return bytes(self._message), self._message_is_text
+
+    @unfinished_message.setter
+    def unfinished_message(self, message: Tuple[bytes, bool]) -> None:
+        fragments, self._message_is_text = message
+        self._message[:] = fragments
+
+    def _read_handshake(self) -> bool:
+        """Answer the client's opening handshake, once all of it has arrived.
+
+        Returns:
+            bool: Was the handshake accepted or not.
+        """
+
+        handshake_end = self.buffer.find(b"\r\n\r\n")
+
+        if handshake_end < 0:
+            if len(self.buffer) > self.MAX_HANDSHAKE_LENGTH:
+                self._reject()
+
+            return False
+
+        headers = self._parse_headers(bytes(self.buffer[:handshake_end]))
+        del self.buffer[: handshake_end + 4]
+
+        if (
+            not headers
+            or headers.get(b"upgrade", b"").lower() != b"websocket"
+            or not headers.get(b"sec-websocket-key")
+        ):
+            self._reject()
+            return False
+
+        self.replies += WebSocketMessage.handshake(headers[b"sec-websocket-key"])
+        self.is_open = True
+
+        return True
+
+    def _parse_headers(self, handshake: bytes) -> Optional[Dict[bytes, bytes]]:
+        """Parse the headers of the client's opening handshake.
+
+        Args:
+            handshake (bytes): The handshake, without the blank line that ends it.
+
+        Returns:
+            Optional[Dict[bytes, bytes]]: The headers, keyed by their lowercase name,
+                or None if the handshake isn't a WebSocket request.
+        """
+
+        request_line, *header_lines = handshake.split(b"\r\n")
+
+        if not request_line.startswith(b"GET "):
+            return None
+
+        headers = {}
+
+        for header_line in header_lines:
+            name, _, value = header_line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+
+        return headers
+
+    def _read_frame(self, text: bytearray) -> bool:
+        """Read the next frame, if all of it has arrived.
+
+        Args:
+            text (bytearray): Where the text of completed messages is added.
+
+        Returns:
+            bool: Was a frame read or not.
+        """
+
+        buffer = self.buffer
+
+        if len(buffer) < 2:
+            return False
+
+        final = buffer[0] & 0x80
+        opcode = buffer[0] & 0x0F
+        length = buffer[1] & 0x7F
+        header_length = 2
+
+        if length == 126:
+            header_length = 4
+            length = int.from_bytes(buffer[2:4], "big")
+        elif length == 127:
+            header_length = 10
+            length = int.from_bytes(buffer[2:10], "big")
+
+        # clients always mask their frames. Anything else isn't a browser
+        if not buffer[1] & 0x80:
+            self._close(WebSocketMessage.CloseCode.PROTOCOL_ERROR)
+            return False
+
+        if len(self._message) + length > self._max_message_length:
+            self._close(WebSocketMessage.CloseCode.MESSAGE_TOO_BIG)
+            return False
+
+        frame_end = header_length + 4 + length
+
+        if len(buffer) < frame_end:
+            return False
+
+        mask = buffer[header_length : header_length + 4]
+        payload = self._unmask(buffer[header_length + 4 : frame_end], mask)
+        del buffer[:frame_end]
+
+        if opcode == self.CLOSE_CODE:
+            # echo the client's close code back, which completes the closing
+            # handshake
+            self.replies += WebSocketMessage.frame(
+                WebSocketMessage.OpCode.CLOSE, payload[:2]
+            )
+            self.is_closed = True
+
+        elif opcode == self.PING_CODE:
+            self.replies += WebSocketMessage.frame(
+                WebSocketMessage.OpCode.PONG, payload
+            )
+
+        # pongs are ignored, and binary messages are unwrapped but never used
+        elif opcode < self.CLOSE_CODE:
+            if opcode != self.CONTINUATION_CODE:
+                self._message_is_text = opcode == self.TEXT_CODE
+
+            self._message += payload
+
+            if final:
+                self._take_message(text)
+
+        return True
+
+    def _take_message(self, text: bytearray) -> None:
+        """Add the finished message to the text, if it is text.
+
+        Args:
+            text (bytearray): Where the text of completed messages is added.
+        """
+
+        if self._message_is_text:
+            text += self._message
+
+            # browser clients send a line per message, usually without the line
+            # ending Telnet clients would send
+            if not self._message.endswith((b"\r", b"\n")):
+                text += b"\n"
+
+        self._message.clear()
+
+    def _reject(self) -> None:
+        """Turn away a handshake that isn't a WebSocket request."""
+
+        self.replies += WebSocketMessage.BAD_REQUEST
+        self.is_closed = True
+
+    def _close(self, code: WebSocketMessage.CloseCode) -> None:
+        """Close the connection, because the client broke the protocol.
+
+        Args:
+            code (WebSocketMessage.CloseCode): Why the connection is being closed.
+        """
+
+        self.replies += WebSocketMessage.close(code)
+        self.is_closed = True
+
+    @staticmethod
+    def _unmask(payload: bytes, mask: bytes) -> bytes:
+        """Unmask a frame's payload, all at once rather than a byte at a time.
+
+        Args:
+            payload (bytes): The masked payload.
+            mask (bytes): The 4-byte mask the client chose.
+
+        Returns:
+            bytes: The unmasked payload.
+        """
+
+        length = len(payload)
+
+        if not length:
+            return b""
+
+        # the mask is repeated across the whole payload, which can then be XORed as
+        # one big integer
+        repeated_mask = (bytes(mask) * (length // 4 + 1))[:length]
+
+        return (
+            int.from_bytes(payload, "big") ^ int.from_bytes(repeated_mask, "big")
+        ).to_bytes(length, "big")
@@ -24,3 +24,14 @@ class TestCommandProcessor(CommandProcessorFactory):
     def test_command_processor_process_missing_args(self):
         with raises(CommandMissingArguments):
             self.command_processor.process(Mock(), "login frank")
+
+    def test_command_processor_process_latency(self):
+        self.command_processor.process(Mock(), "login frank ClevaGuhl!")
+
+        with raises(CommandMissingArguments):
+            self.command_processor.process(Mock(), "login frank")
+
+        histogram = self.server_config.latency_stats.histograms["MockAction"]
+
+        assert histogram.count == 2
+        assert histogram.errors == 1
@@ -34,6 +34,7 @@ class TestInventoryAction(InventoryActionFactory):
 
     def test_action_inventory_process(self, _fixture_database):
         self.client.player = Player.get_by_name("frank")
+        self.client.gmcp_enabled = True
         self.give_item_to_player(2, self.client.player)
 
         self.inventory.process(self.client, "inv", [])
@@ -44,3 +45,16 @@ class TestInventoryAction(InventoryActionFactory):
                 client=self.client,
             )
         )
+        self.comms.send_data.assert_called_with(
+            self.client,
+            "Char.Items.List",
+            {"location": "inv", "items": [{"id": 2, "name": "a metal fork"}]},
+        )
+
+    def test_action_inventory_process_gmcp_disabled(self, _fixture_database):
+        self.client.player = Player.get_by_name("frank")
+
+        self.inventory.process(self.client, "inv", [])
+
+        self.comms.send_to_client.assert_called_once()
+        self.comms.send_data.assert_not_called()
@@ -21,6 +21,7 @@ class TestLookAction(LookActionFactory):
         self.comms.send_prompt.assert_called_once_with(self.client)
 
     def test_action_look_process(self, _fixture_database):
+        self.client.gmcp_enabled = True
         self.mock_clients[0].player.name = "jennifer"
         self.telnet.get_connected_clients.return_value = [self.mock_clients[0]]
 
@@ -33,6 +34,17 @@ class TestLookAction(LookActionFactory):
             )
         )
 
+        self.comms.send_data.assert_called_with(
+            self.client,
+            "Room.Info",
+            {
+                "num": 1,
+                "name": "A Room Marked #1",
+                "area": ANY,
+                "exits": {"n": 2, "e": 3, "s": 4, "w": 5},
+            },
+        )
+
         panel = self.get_message_panel()
 
         assert panel.title == "[blue]A Room Marked #1[/]"
@@ -42,6 +54,14 @@ class TestLookAction(LookActionFactory):
             == "  The walls and floor of this room are a bright, sterile white. You feel as if you are inside a simulation.\n\nLooking around you see:\n• [bright_blue]A metal fork glistens in the dirt.\n• A large jukebox is plugged into the wall.[/]\n• [bright_green][cyan]jennifer[/] is standing here.\n• A faceless businessman sits at his desk.[/]"
         )
 
+    def test_action_look_process_gmcp_disabled(self, _fixture_database):
+        self.telnet.get_connected_clients.return_value = []
+
+        self.look.process(self.client, "look", [])
+
+        self.comms.send_to_client.assert_called_once()
+        self.comms.send_data.assert_not_called()
+
     def test_action_look_process_items_and_npcs(self, _fixture_database):
         self.client.player = Player.get_by_name("frank")
         self.give_item_to_player(2, self.client.player)
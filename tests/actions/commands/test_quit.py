@@ -11,7 +11,7 @@ class TestQuitAction(QuitActionFactory):
         assert not self.quit.required_args()
 
     def test_action_quit_process_logged_in(self):
-        self.quit.process(self.client, "quit", [], 0)
+        self.quit.process(self.client, "quit", [])
 
         assert self.client.login_state is ClientLoginState.PRE_LOGIN
 
@@ -41,7 +41,7 @@ class TestQuitAction(QuitActionFactory):
     def test_action_quit_process_not_logged_in(self):
         self.client.login_state = ClientLoginState.PRE_LOGIN
 
-        self.quit.process(self.client, "quit", [], 0)
+        self.quit.process(self.client, "quit", [])
 
         self.comms.send_to_client.assert_called_once_with(
             MessageRoute(
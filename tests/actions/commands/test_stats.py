@@ -0,0 +1,58 @@
+from pytest import raises
+
+from cibo.exceptions import CommandUnrecognized
+from cibo.models.client import ClientLoginState
+from cibo.models.message import Message, MessageRoute
+from tests.actions.conftest import StatsActionFactory
+
+
+class TestStatsAction(StatsActionFactory):
+    def test_action_stats_aliases(self):
+        assert self.stats.aliases() == ["stats"]
+
+    def test_action_stats_required_args(self):
+        assert not self.stats.required_args()
+
+    def test_action_stats_process_not_logged_in(self):
+        self.client.login_state = ClientLoginState.PRE_LOGIN
+
+        with raises(CommandUnrecognized):
+            self.stats.process(self.client, "stats", [])
+
+    def test_action_stats_process_not_admin(self):
+        self.server_config.admins = []
+
+        with raises(CommandUnrecognized):
+            self.stats.process(self.client, "stats", [])
+
+        self.comms.send_to_client.assert_not_called()
+
+    def test_action_stats_process(self):
+        with self.server_config.latency_stats.measure("Look"):
+            pass
+
+        with self.server_config.latency_stats.measure("event-input"):
+            pass
+
+        self.stats.process(self.client, "stats", [])
+
+        table = self.get_message_panel()
+        columns = [column.header for column in table.columns]
+
+        assert columns == ["name", "count", "errors", "p50", "p95", "p99", "max"]
+        assert sorted(table.columns[0].cells) == ["Look", "event-input"]
+        assert list(table.columns[1].cells) == ["1", "1"]
+
+    def test_action_stats_process_reset(self):
+        with self.server_config.latency_stats.measure("Look"):
+            pass
+
+        self.stats.process(self.client, "stats", ["reset"])
+
+        assert not self.server_config.latency_stats.histograms
+        self.comms.send_to_client.assert_called_with(
+            MessageRoute(
+                Message(body="The stats have been reset.", **self.default_message_args),
+                client=self.client,
+            )
+        )
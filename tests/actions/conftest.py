@@ -15,6 +15,7 @@ from cibo.actions.commands import (
     Quit,
     Register,
     Say,
+    Stats,
 )
 from cibo.actions.connect import Connect
 from cibo.actions.disconnect import Disconnect
@@ -179,3 +180,11 @@ class EverySecondActionFactory(BaseFactory, ActionFactory):
     def fixture_every_second(self, _fixture_action):
         self.every_second = EverySecond(self.server_config)
         yield
+
+
+class StatsActionFactory(BaseFactory, ActionFactory):
+    @fixture(autouse=True)
+    def fixture_stats(self, _fixture_action):
+        self.server_config.admins = ["frank"]
+        self.stats = Stats(self.server_config)
+        yield
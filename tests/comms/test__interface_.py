@@ -11,6 +11,11 @@ class TestCommsInterface(CommsFactory):
 
         self.mock_clients[0].send_prompt.assert_called_once()
 
+    def test_comms_interface_send_data(self):
+        self.comms.send_data(self.mock_clients[0], "Room.Info", {"num": 1})
+
+        self.mock_clients[0].send_gmcp.assert_called_once_with("Room.Info", {"num": 1})
+
     def test_comms_interface_send_to_client(self):
         self.comms.send_to_client(
             MessageRoute(Message("You are tired."), client=self.mock_clients[0])
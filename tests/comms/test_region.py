@@ -7,7 +7,8 @@ class TestCommsRegion(CommsFactory):
         self.region.send(MessageRoute(Message("The ground begins to rumble."), ids=[1]))
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  The ground begins to rumble.                                              \n"
+            "\r  The ground begins to rumble.                                              \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_called_once()
 
@@ -19,7 +20,8 @@ class TestCommsRegion(CommsFactory):
         )
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  The ground begins to rumble.                                              \n"
+            "\r  The ground begins to rumble.                                              \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_not_called()
 
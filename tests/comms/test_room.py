@@ -9,17 +9,30 @@ class TestCommsRoom(CommsFactory):
         self.room.send(MessageRoute(Message("frank leaves."), ids=[1]))
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  frank leaves.                                                             \n"
+            "\r  frank leaves.                                                             \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_called_once()
 
+    def test_comms_room_send_terminal_width(self):
+        self.telnet.get_connected_clients.return_value = self.mock_clients
+        self.mock_clients[1].terminal_width = 36
+
+        self.room.send(MessageRoute(Message("frank leaves."), ids=[1]))
+
+        self.mock_clients[1].send_message.assert_called_once_with(
+            "\r  frank leaves.                     \n",
+            low_priority=True,
+        )
+
     def test_comms_room_send_no_prompt(self):
         self.room.send(
             MessageRoute(Message("frank leaves."), ids=[1], send_prompt=False)
         )
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  frank leaves.                                                             \n"
+            "\r  frank leaves.                                                             \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_not_called()
 
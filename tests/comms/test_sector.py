@@ -7,7 +7,8 @@ class TestCommsSector(CommsFactory):
         self.sector.send(MessageRoute(Message("Someone screams nearby."), ids=[1]))
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  Someone screams nearby.                                                   \n"
+            "\r  Someone screams nearby.                                                   \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_called_once()
 
@@ -17,7 +18,8 @@ class TestCommsSector(CommsFactory):
         )
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  Someone screams nearby.                                                   \n"
+            "\r  Someone screams nearby.                                                   \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_not_called()
 
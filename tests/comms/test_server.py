@@ -7,7 +7,8 @@ class TestCommsServer(CommsFactory):
         self.server.send(MessageRoute(Message("The server is reboting.")))
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  The server is reboting.                                                   \n"
+            "\r  The server is reboting.                                                   \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_called_once()
 
@@ -17,7 +18,8 @@ class TestCommsServer(CommsFactory):
         )
 
         self.mock_clients[0].send_message.assert_called_once_with(
-            "\r  The server is reboting.                                                   \n"
+            "\r  The server is reboting.                                                   \n",
+            low_priority=True,
         )
         self.mock_clients[0].send_prompt.assert_not_called()
 
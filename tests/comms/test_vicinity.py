@@ -28,7 +28,8 @@ class TestCommsVicinity(CommsFactory):
         self.mock_clients[0].send_prompt.assert_called_once()
 
         self.mock_clients[1].send_message.assert_called_once_with(
-            "\r  frank died.                                                               \n"
+            "\r  frank died.                                                               \n",
+            low_priority=True,
         )
         self.mock_clients[1].send_prompt.assert_called_once()
 
@@ -53,7 +54,8 @@ class TestCommsVicinity(CommsFactory):
         )
 
         self.mock_clients[1].send_message.assert_called_once_with(
-            "\r  You hear a horrifying scream.                                             \n"
+            "\r  You hear a horrifying scream.                                             \n",
+            low_priority=True,
         )
         self.mock_clients[1].send_prompt.assert_called_once()
 
@@ -1,13 +1,19 @@
+import json
 import logging
+import socket
+import threading
+import time
 from os import getenv
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from blinker import signal
 from peewee import SqliteDatabase
 from pytest import fixture
 
 from cibo.actions.commands._processor_ import CommandProcessor
 from cibo.entities._interface_ import EntityInterface
-from cibo.models.client import Client, ClientLoginState
+from cibo.metrics import Metrics, MetricsServer
+from cibo.models.client import Client, ClientLoginState, StreamClient
 from cibo.models.data.item import Item as ItemData
 from cibo.models.data.npc import Npc as NpcData
 from cibo.models.data.player import Player
@@ -21,8 +27,26 @@ from cibo.models.region import Region
 from cibo.models.room import Room, RoomExit
 from cibo.models.sector import Sector
 from cibo.models.spawn import Spawn, SpawnType
+from cibo.models.websocket_client import WebSocketClient
+from cibo.server import Server
 from cibo.server_config import ServerConfig
+from cibo.telnet import TelnetServer
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.acceptor import Acceptor
+from cibo.utils.admission import Admission
+from cibo.utils.command_queue import CommandQueue
+from cibo.utils.command_scheduler import CommandScheduler
+from cibo.utils.idle_deadlines import IdleDeadlines
+from cibo.utils.latency_stats import LatencyStats
+from cibo.utils.line_buffer import LineBuffer
+from cibo.utils.loop_stats import LoopStats
+from cibo.utils.outbox import Outbox
 from cibo.utils.password import Password
+from cibo.utils.telnet_parser import TelnetParser
+from cibo.utils.tick_clock import TickClock, TickStats
+from cibo.utils.timing_wheel import TimingWheel
+from cibo.utils.tracer import Tracer
+from cibo.utils.websocket_parser import WebSocketParser
 
 
 class BaseFactory:
@@ -89,8 +113,7 @@ class ClientFactory:
             socket=Mock(),
             address="127.0.0.1",
             encoding="utf-8",
-            buffer="",
-            last_check=2.5,
+            last_activity=2.5,
             login_state=ClientLoginState.PRE_LOGIN,
             registration=None,
             player=Mock(current_room_id=1),
@@ -104,6 +127,7 @@ class ClientFactory:
             "login_state": ClientLoginState.LOGGED_IN,
             "player": Mock(current_room_id=1),
             "prompt": "> ",
+            "terminal_width": 76,
         }
         self.mock_clients = [
             Mock(**default_client_params),
@@ -112,6 +136,57 @@ class ClientFactory:
         yield
 
 
+class StreamClientFactory:
+    @fixture(autouse=True)
+    def fixture_stream_client(self):
+        self.stream_client = StreamClient(
+            socket=Mock(),
+            address="127.0.0.1",
+            encoding="utf-8",
+            last_activity=2.5,
+            login_state=ClientLoginState.PRE_LOGIN,
+            registration=None,
+            player=Mock(current_room_id=1),
+            writer=Mock(**{"transport.get_write_buffer_size.return_value": 0}),
+        )
+        yield
+
+
+class WebSocketFrameFactory:
+    WEBSOCKET_HANDSHAKE = (
+        b"GET /play HTTP/1.1\r\n"
+        b"Host: localhost\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+        b"Sec-WebSocket-Version: 13\r\n\r\n"
+    )
+
+    def create_frame(self, opcode: int, payload: bytes, final: bool = True) -> bytes:
+        # frames sent by a browser are always masked
+        mask = b"\x01\x02\x03\x04"
+        masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+        return bytes([(0x80 if final else 0) | opcode, 0x80 | len(payload)]) + (
+            mask + masked
+        )
+
+
+class WebSocketClientFactory(WebSocketFrameFactory):
+    @fixture(autouse=True)
+    def fixture_websocket_client(self):
+        self.websocket_client = WebSocketClient(
+            socket=Mock(),
+            address="127.0.0.1",
+            encoding="utf-8",
+            last_activity=2.5,
+            login_state=ClientLoginState.PRE_LOGIN,
+            registration=None,
+            player=Mock(current_room_id=1),
+        )
+        yield
+
+
 class CommandProcessorFactory(BaseFactory):
     class MockAction:
         def __init__(self, _server_config):
@@ -143,6 +218,179 @@ class PasswordFactory:
         yield
 
 
+class TelnetParserFactory:
+    @fixture(autouse=True)
+    def fixture_telnet_parser(self):
+        self.parser = TelnetParser("utf-8")
+        yield
+
+
+class WebSocketParserFactory(WebSocketFrameFactory):
+    @fixture(autouse=True)
+    def fixture_websocket_parser(self):
+        self.websocket_parser = WebSocketParser(max_message_length=64)
+        yield
+
+
+class LineBufferFactory:
+    @fixture(autouse=True)
+    def fixture_line_buffer(self):
+        self.line_buffer = LineBuffer(max_line_length=16, max_lines=4)
+        yield
+
+
+class TickClockFactory:
+    @fixture(autouse=True)
+    def fixture_tick_clock(self):
+        self.tick_clock = TickClock(pulse_rate=10.0, max_catch_up=3)
+        self.tick_clock.start(now=100.0)
+        yield
+
+
+class TimingWheelFactory:
+    @fixture(autouse=True)
+    def fixture_timing_wheel(self):
+        self.timing_wheel = TimingWheel(tick_interval=0.1)
+        self.fired = []
+        yield
+
+
+class LoopStatsFactory:
+    @fixture(autouse=True)
+    def fixture_loop_stats(self):
+        self.loop_stats = LoopStats()
+        yield
+
+
+class LatencyStatsFactory:
+    @fixture(autouse=True)
+    def fixture_latency_stats(self):
+        self.latency_stats = LatencyStats()
+        yield
+
+
+class MetricsFactory(ClientFactory):
+    @fixture(autouse=True)
+    def fixture_metrics(self):
+        self.telnet = TelnetServer(port=0)
+        self.server_config = ServerConfig(self.telnet, Mock(), Mock())
+        self.tick_stats = TickStats()
+        self.metrics = Metrics(self.server_config, self.tick_stats)
+        self.metrics_server = MetricsServer(0, self.metrics)
+        yield
+
+        self.metrics_server.stop()
+
+
+class TracerFactory:
+    def read_trace(self):
+        self.tracer.stop()
+
+        with open(self.trace_path, encoding="utf-8") as file:
+            # the trace is left unclosed, so it can be read while it's written
+            return json.loads(file.read().rstrip(",\n") + "]")
+
+    @fixture(autouse=True)
+    def fixture_tracer(self, tmp_path):
+        self.tracer = Tracer()
+        self.trace_path = f"{tmp_path}/trace.json"
+        yield
+
+        self.tracer.stop()
+
+
+class ServerFactory:
+    def _record_event(self, _sender, payload=None):
+        self.events.append((payload, threading.current_thread()))
+
+    def wait_for(self, condition) -> None:
+        deadline = time.monotonic() + 2
+
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert condition()
+
+    def create_server(self, telnet: TelnetServer) -> Server:
+        self.telnet = telnet
+        self.server = Server(ServerConfig(telnet, Mock(), Mock(), pulse_rate=100.0))
+
+        return self.server
+
+    @fixture(autouse=True)
+    def fixture_server(self):
+        self.events = []
+        self.server = None
+
+        signals = [signal("event-input"), signal("event-spawn"), signal("event-tick")]
+
+        for signal_ in signals:
+            signal_.connect(self._record_event)
+
+        # the server's own events aren't needed, just the signals sent to them
+        with patch("cibo.server.EventInterface"):
+            yield
+
+        if self.server:
+            self.server.stop()
+
+        for signal_ in signals:
+            signal_.disconnect(self._record_event)
+
+
+class AdmissionFactory:
+    @fixture(autouse=True)
+    def fixture_admission(self):
+        self.admission = Admission(
+            TelnetConfig(
+                address_connect_rate=1.0,
+                address_connect_burst=2,
+                connect_rate=1.0,
+                connect_burst=3,
+            )
+        )
+        yield
+
+
+class AcceptorFactory:
+    @fixture(autouse=True)
+    def fixture_acceptor(self):
+        self.acceptor = Acceptor(0, TelnetConfig(accept_budget=2))
+        self.acceptor.listen()
+
+        yield
+
+        self.acceptor.close()
+
+
+class CommandQueueFactory:
+    @fixture(autouse=True)
+    def fixture_command_queue(self):
+        self.command_queue = CommandQueue(max_commands=2)
+        yield
+
+
+class CommandSchedulerFactory:
+    @fixture(autouse=True)
+    def fixture_command_scheduler(self):
+        self.command_scheduler = CommandScheduler()
+        yield
+
+
+class IdleDeadlinesFactory:
+    @fixture(autouse=True)
+    def fixture_idle_deadlines(self):
+        self.idle_deadlines = IdleDeadlines(timeout=10)
+        yield
+
+
+class OutboxFactory:
+    @fixture(autouse=True)
+    def fixture_outbox(self):
+        self.outbox = Outbox(high_water_mark=8)
+        yield
+
+
 class EntityInterfaceFactory:
     @fixture(autouse=True)
     def _fixture_entities(self):
@@ -269,3 +517,57 @@ class SpawnFactory(EntityInterfaceFactory):
             Spawn(type_=SpawnType.NPC, entity_id=1, room_id=1, amount=1),
         ]
         yield
+
+
+class TelnetFactory(WebSocketFrameFactory):
+    def connect_client(self) -> socket.socket:
+        client_socket = socket.create_connection(("127.0.0.1", self.telnet.port))
+        self.telnet.update(timeout=1)
+
+        # the options offered on connect
+        self.offered_options = client_socket.recv(9)
+
+        return client_socket
+
+    def connect_websocket_client(self) -> socket.socket:
+        client_socket = socket.create_connection(
+            ("127.0.0.1", self.telnet.websocket_port)
+        )
+        self.telnet.update(timeout=1)
+
+        client_socket.sendall(self.WEBSOCKET_HANDSHAKE)
+        self.telnet.update(timeout=1)
+
+        # the reply to the handshake
+        self.handshake_reply = client_socket.recv(1024)
+
+        return client_socket
+
+    def send_input(self, client_socket: socket.socket, data: bytes) -> None:
+        client_socket.sendall(data)
+        self.telnet.update(timeout=1)
+
+    def _record_event(self, _sender, payload):
+        self.events.append(payload)
+
+    @fixture(autouse=True)
+    def fixture_telnet(self):
+        self.events = []
+        self.telnet = TelnetServer(port=0, websocket_port=0)
+        self.telnet.listen()
+
+        signals = [
+            signal("event-connect"),
+            signal("event-disconnect"),
+            signal("event-input"),
+        ]
+
+        for signal_ in signals:
+            signal_.connect(self._record_event)
+
+        yield
+
+        for signal_ in signals:
+            signal_.disconnect(self._record_event)
+
+        self.telnet.shutdown()
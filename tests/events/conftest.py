@@ -5,6 +5,7 @@ from cibo.events.connect import ConnectEvent
 from cibo.events.disconnect import DisconnectEvent
 from cibo.events.input import InputEvent
 from cibo.events.spawn import SpawnEvent
+from cibo.events.tick import TickEvent
 from cibo.models.client import ClientLoginState
 from cibo.server_config import ServerConfig
 from tests.conftest import (
@@ -24,6 +25,8 @@ class ConnectEventFactory(BaseFactory):
         self.signal = signal("event-connect")
         yield
 
+        self.signal.disconnect(self.connect.receive)
+
 
 class DisconnectEventFactory(BaseFactory, ClientFactory, MessageFactory):
     @fixture(autouse=True)
@@ -33,6 +36,8 @@ class DisconnectEventFactory(BaseFactory, ClientFactory, MessageFactory):
         self.signal = signal("event-disconnect")
         yield
 
+        self.signal.disconnect(self.disconnect.receive)
+
 
 class InputEventFactory(CommandProcessorFactory, ClientFactory, MessageFactory):
     @fixture(autouse=True)
@@ -43,6 +48,8 @@ class InputEventFactory(CommandProcessorFactory, ClientFactory, MessageFactory):
         self.signal = signal("event-input")
         yield
 
+        self.signal.disconnect(self.input.receive)
+
 
 class SpawnEventFactory(BaseFactory, EntityInterfaceFactory, DatabaseFactory):
     @fixture(autouse=True)
@@ -51,3 +58,15 @@ class SpawnEventFactory(BaseFactory, EntityInterfaceFactory, DatabaseFactory):
         self.spawn = SpawnEvent(self.server_config, "event-spawn")
         self.signal = signal("event-spawn")
         yield
+
+        self.signal.disconnect(self.spawn.receive)
+
+
+class TickEventFactory(BaseFactory, ClientFactory):
+    @fixture(autouse=True)
+    def fixture_tick_event(self):
+        self.tick = TickEvent(self.server_config, "event-tick")
+        self.signal = signal("event-tick")
+        yield
+
+        self.signal.disconnect(self.tick.receive)
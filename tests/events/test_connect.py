@@ -12,3 +12,10 @@ class TestConnectEvent(ClientFactory, ConnectEventFactory):
         self.signal.send(self, payload=None)
 
         self.comms.send_to_client.assert_not_called()
+
+    def test_event_connect_latency(self):
+        self.signal.send(self, payload=EventPayload(self.client))
+
+        histogram = self.server_config.latency_stats.histograms["event-connect"]
+
+        assert histogram.count == 1
@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+from tests.events.conftest import TickEventFactory
+
+
+class TestTickEvent(TickEventFactory):
+    def test_event_tick_timers(self):
+        assert len(self.server_config.timers) == 2
+
+    @patch("cibo.events.tick.EverySecond")
+    def test_event_tick_every_second(self, every_second):
+        self.telnet.get_connected_clients.return_value = [self.client]
+
+        for _ in range(10):
+            self.signal.send()
+
+        every_second.return_value.process.assert_called_once_with(self.client, None, [])
+
+    @patch("cibo.events.tick.EveryMinute")
+    def test_event_tick_every_minute(self, every_minute):
+        self.telnet.get_connected_clients.return_value = [self.client]
+
+        for _ in range(599):
+            self.signal.send()
+
+        every_minute.return_value.process.assert_not_called()
+
+        self.signal.send()
+
+        every_minute.return_value.process.assert_called_once_with(self.client, None, [])
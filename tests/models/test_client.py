@@ -1,10 +1,13 @@
 import socket as socket_
 from unittest.mock import Mock
 
+from pytest import raises
+
 from cibo.models.client import ClientLoginState
 from cibo.models.data.player import Player
 from cibo.models.prompt import Prompt
-from tests.conftest import ClientFactory
+from cibo.utils.outbox import Outbox, OutboxOverflow
+from tests.conftest import ClientFactory, StreamClientFactory
 
 
 class TestClient(ClientFactory):
@@ -24,20 +27,180 @@ class TestClient(ClientFactory):
     def test_client_prompt(self):
         assert self.client.prompt == Prompt(body="> ", terminal_width=76)
 
+    def test_client_prompt_terminal_width(self):
+        self.client.terminal_width = 100
+
+        assert self.client.prompt.terminal_width == 100
+
+    def test_client_subnegotiate_window_size(self):
+        self.client.subnegotiate(31, b"\x00\x78\x00\x18")
+
+        assert self.client.terminal_width == 116
+
+    def test_client_subnegotiate_window_size_clamped(self):
+        self.client.subnegotiate(31, b"\x00\x08\x00\x18")
+
+        assert self.client.terminal_width == 20
+
+        self.client.subnegotiate(31, b"\xff\xff\x00\x18")
+
+        assert self.client.terminal_width == 246
+
+    def test_client_subnegotiate_window_size_unknown(self):
+        self.client.subnegotiate(31, b"\x00\x00\x00\x00")
+        self.client.subnegotiate(31, b"\x00")
+
+        assert self.client.terminal_width == 76
+
+    def test_client_is_registered(self):
+        self.client.registration = Player(name="frank")
+
+        assert self.client.is_registered
+
+
+class TestClientNegotiation(ClientFactory):
+    def test_client_negotiate_compression(self):
+        self.client.negotiate(253, 86)
+
+        assert self.client.outbox.is_compressed
+        assert self.client.outbox.data == bytearray(b"\xff\xfaV\xff\xf0")
+
+    def test_client_negotiate_unsupported(self):
+        self.client.negotiate(253, 31)
+
+        assert not self.client.outbox.is_compressed
+
+    def test_client_negotiate_gmcp(self):
+        self.client.negotiate(253, 201)
+
+        assert self.client.gmcp_enabled
+
+        self.client.negotiate(254, 201)
+
+        assert not self.client.gmcp_enabled
+
+    def test_client_send_gmcp(self):
+        self.client.gmcp_enabled = True
+        self.client.send_gmcp("Room.Info", {"num": 1})
+
+        assert self.client.outbox.data == bytearray(
+            b'\xff\xfa\xc9Room.Info {"num":1}\xff\xf0'
+        )
+
+    def test_client_send_gmcp_disabled(self):
+        self.client.send_gmcp("Room.Info", {"num": 1})
+
+        assert not self.client.outbox
+
+
+class TestClientOutput(ClientFactory):
     def test_client_send_prompt(self):
         self.client.send_prompt()
 
-        self.client.socket.sendall.assert_called_once_with(bytearray(b"\r\n> "))
+        assert self.client.prompt_pending
+        assert not self.client.outbox
+
+    def test_client_send_prompt_collapsed(self):
+        self.client.socket.send.side_effect = BlockingIOError
+
+        self.client.send_prompt()
+        self.client.send_message("\rfrank arrives.\n")
+        self.client.send_prompt()
+        self.client.send_prompt()
+        self.client.flush()
+
+        assert self.client.outbox.data == bytearray(b"\rfrank arrives.\n\r\n> ")
+        assert not self.client.prompt_pending
+
+    def test_client_send_prompt_low_priority(self):
+        self.client.send_prompt(low_priority=True)
+        self.client.send_prompt()
+
+        assert not self.client.prompt_low_priority
+
+    def test_client_is_output_pending(self):
+        assert not self.client.is_output_pending
+
+        self.client.send_prompt()
+
+        assert self.client.is_output_pending
 
     def test_client_send_message(self):
         self.client.send_message("Hey guys!")
 
-        self.client.socket.sendall.assert_called_once_with(bytearray(b"Hey guys!"))
+        assert self.client.outbox.data == bytearray(b"Hey guys!")
+        self.client.socket.send.assert_not_called()
+
+    def test_client_send_message_overflow(self):
+        self.client.outbox = Outbox(
+            high_water_mark=4, overflow=OutboxOverflow.DISCONNECT
+        )
+
+        self.client.send_message("Hey guys!")
+
+        assert not self.client.outbox
+        self.client.socket.close.assert_called_once()
+
+    def test_client_send_message_overflow_compressed(self):
+        self.client.outbox = Outbox(
+            high_water_mark=12, overflow=OutboxOverflow.DISCONNECT
+        )
+        self.client.outbox.start_compression(b"")
+
+        self.client.send_message("Hey guys!")
+        self.client.send_message("Hey guys!")
+
+        assert not self.client.outbox
+        self.client.socket.close.assert_called_once()
+
+    def test_client_send_message_high_water_mark(self):
+        self.client.outbox = Outbox(
+            high_water_mark=12, overflow=OutboxOverflow.DISCONNECT
+        )
+
+        # exactly at the mark is still within it
+        self.client.send_message("Hey ")
+        self.client.send_message("guys!")
+        self.client.send_message("!!!")
+
+        assert len(self.client.outbox) == 12
+        self.client.socket.close.assert_not_called()
+
+        self.client.send_message("!")
+
+        self.client.socket.close.assert_called_once()
+
+    def test_client_send_data(self):
+        self.client.send_data(b"\xff\xfbV")
+
+        assert self.client.outbox.data == bytearray(b"\xff\xfbV")
+
+    def test_client_backlog(self):
+        self.client.send_message("Hey guys!")
+
+        assert self.client.backlog == 9
 
-    def test_client_send_message_error(self):
-        self.client.socket.sendall.side_effect = OSError
+    def test_client_flush(self):
+        self.client.socket.send.return_value = 4
 
         self.client.send_message("Hey guys!")
+        self.client.flush()
+
+        self.client.socket.send.assert_called_once()
+        assert self.client.outbox.data == bytearray(b"guys!")
+
+    def test_client_flush_empty(self):
+        self.client.flush()
+
+        self.client.socket.send.assert_not_called()
+
+    def test_client_flush_error(self):
+        self.client.socket.send.side_effect = OSError
+
+        self.client.send_message("Hey guys!")
+
+        with raises(OSError):
+            self.client.flush()
 
     def test_client_disconnect(self):
         self.client.disconnect()
@@ -45,7 +208,98 @@ class TestClient(ClientFactory):
         self.client.socket.shutdown.assert_called_once_with(socket_.SHUT_RDWR)
         self.client.socket.close.assert_called_once()
 
-    def test_client_is_registered(self):
-        self.client.registration = Player(name="frank")
+    def test_client_disconnect_flush(self):
+        self.client.socket.send.return_value = 8
 
-        assert self.client.is_registered
+        self.client.send_message("Goodbye!")
+        self.client.disconnect()
+
+        self.client.socket.send.assert_called_once()
+        assert not self.client.outbox
+        self.client.socket.close.assert_called_once()
+
+    def test_client_disconnect_prompt(self):
+        self.client.send_prompt()
+        self.client.disconnect()
+
+        self.client.socket.send.assert_not_called()
+
+    def test_client_disconnect_commands(self):
+        self.client.commands.push("look")
+        self.client.disconnect()
+
+        assert not self.client.commands
+
+    def test_client_disconnect_callback(self):
+        self.client.on_disconnect = Mock()
+
+        self.client.disconnect()
+
+        self.client.on_disconnect.assert_called_once_with(self.client)
+
+    def test_client_disconnect_error(self):
+        self.client.socket.shutdown.side_effect = OSError
+
+        self.client.disconnect()
+
+        self.client.socket.close.assert_called_once()
+
+
+class TestStreamClient(StreamClientFactory):
+    def test_stream_client_flush(self):
+        self.stream_client.writer.is_closing.return_value = False
+
+        self.stream_client.send_message("Hey guys!")
+        self.stream_client.flush()
+
+        self.stream_client.writer.write.assert_called_once_with(b"Hey guys!")
+        assert not self.stream_client.outbox
+
+    def test_stream_client_flush_closing(self):
+        self.stream_client.writer.is_closing.return_value = True
+
+        self.stream_client.send_message("Hey guys!")
+        self.stream_client.flush()
+
+        self.stream_client.writer.write.assert_not_called()
+        assert not self.stream_client.outbox
+
+    def test_stream_client_backlog(self):
+        self.stream_client.writer.transport.get_write_buffer_size.return_value = 5
+
+        self.stream_client.send_message("Hey guys!")
+
+        assert self.stream_client.backlog == 14
+
+    def test_stream_client_send_message_high_water_mark(self):
+        self.stream_client.writer.transport.get_write_buffer_size.return_value = 5
+        self.stream_client.outbox = Outbox(
+            high_water_mark=14, overflow=OutboxOverflow.DISCONNECT
+        )
+
+        self.stream_client.send_message("Hey guys!")
+
+        self.stream_client.writer.close.assert_not_called()
+
+        self.stream_client.send_message("!")
+
+        self.stream_client.writer.close.assert_called_once()
+
+    def test_stream_client_disconnect(self):
+        self.stream_client.disconnect()
+
+        self.stream_client.writer.close.assert_called_once()
+
+    def test_stream_client_disconnect_prompt(self):
+        self.stream_client.writer.is_closing.return_value = False
+
+        self.stream_client.send_prompt()
+        self.stream_client.disconnect()
+
+        self.stream_client.writer.write.assert_not_called()
+
+    def test_stream_client_disconnect_commands(self):
+        self.stream_client.commands.push("look")
+        self.stream_client.disconnect()
+
+        assert not self.stream_client.commands
@@ -0,0 +1,15 @@
+from cibo.models.message import Message
+
+
+class TestMessage:
+    def test_message_str(self):
+        assert str(Message("frank leaves.", terminal_width=20)) == (
+            "  frank leaves.     \n"
+        )
+
+    def test_message_render(self):
+        message = Message("frank leaves.")
+
+        assert message.render(20) == "  frank leaves.     \n"
+        assert message.render(20) is message.render(20)
+        assert message.render(30) != message.render(20)
@@ -53,3 +53,11 @@ class TestRoom(RoomFactory):
 
         with raises(ExitNotFound):
             self.room.get_direction_exit("w")
+
+    def test_rooms_get_info(self):
+        assert self.room.get_info() == {
+            "num": 1,
+            "name": "A Room Marked #1",
+            "area": "The Backrooms",
+            "exits": {"n": 2, "e": 3, "s": 4, "w": 5},
+        }
@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+from cibo.utils.websocket_message import WebSocketMessage
+from tests.conftest import WebSocketClientFactory
+
+
+class TestWebSocketClient(WebSocketClientFactory):
+    def test_websocket_client_send_message(self):
+        self.websocket_client.send_message("Hello!")
+
+        assert self.websocket_client.outbox.data == b"\x81\x06Hello!"
+
+    def test_websocket_client_receive(self):
+        text = self.websocket_client.receive(
+            self.WEBSOCKET_HANDSHAKE + self.create_frame(1, b"look")
+        )
+
+        assert text == b"look\n"
+        assert self.websocket_client.is_open
+        assert self.websocket_client.outbox.data.startswith(
+            b"HTTP/1.1 101 Switching Protocols"
+        )
+
+    def test_websocket_client_receive_close(self):
+        self.websocket_client.on_disconnect = Mock()
+        self.websocket_client.socket.send.return_value = 0
+        self.websocket_client.receive(self.WEBSOCKET_HANDSHAKE)
+
+        self.websocket_client.receive(self.create_frame(8, b"\x03\xe8"))
+
+        self.websocket_client.on_disconnect.assert_called_once_with(
+            self.websocket_client
+        )
+        self.websocket_client.socket.close.assert_called_once()
+
+    def test_websocket_client_disconnect(self):
+        self.websocket_client.receive(self.WEBSOCKET_HANDSHAKE)
+        self.websocket_client.outbox.data.clear()
+        self.websocket_client.socket.send.return_value = 0
+
+        self.websocket_client.disconnect()
+
+        assert self.websocket_client.outbox.data == WebSocketMessage.close(
+            WebSocketMessage.CloseCode.GOING_AWAY
+        )
+        self.websocket_client.socket.close.assert_called_once()
+
+    def test_websocket_client_disconnect_not_open(self):
+        self.websocket_client.socket.send.return_value = 0
+
+        self.websocket_client.disconnect()
+
+        assert not self.websocket_client.outbox
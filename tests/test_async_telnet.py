@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import patch
+
+from blinker import signal
+from pytest import fixture
+
+from cibo.async_telnet import AsyncTelnetServer
+from cibo.telnet_config import TelnetConfig
+
+
+class TestAsyncTelnetServer:
+    def _record_event(self, _sender, payload):
+        self.events.append(payload)
+
+    @fixture(autouse=True)
+    def fixture_async_telnet(self):
+        self.events = []
+        self.telnet = AsyncTelnetServer(port=0)
+
+        signals = [
+            signal("event-connect"),
+            signal("event-disconnect"),
+            signal("event-input"),
+        ]
+
+        for signal_ in signals:
+            signal_.connect(self._record_event)
+
+        yield
+
+        for signal_ in signals:
+            signal_.disconnect(self._record_event)
+
+    async def _run_session(self, data: bytes) -> None:
+        await self.telnet.start()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.telnet.port)
+        await asyncio.sleep(0.05)
+
+        self.telnet.get_connected_clients()[0].send_message("Hello!")
+        self.telnet.flush()
+        self.received = await reader.readexactly(15)
+
+        writer.write(data)
+        await writer.drain()
+        await asyncio.sleep(0.05)
+
+        writer.close()
+        await asyncio.sleep(0.05)
+
+        self.telnet.shutdown()
+        await self.telnet.wait_closed()
+
+    def test_async_telnet_session(self):
+        asyncio.run(self._run_session(b"look\r\n"))
+
+        assert self.received == b"\xff\xfbV\xff\xfb\xc9\xff\xfd\x1fHello!"
+        assert [event.input_ for event in self.events] == [None, "look", None]
+        assert self.events[0].client is self.events[2].client
+        assert not self.telnet.get_connected_clients()
+
+    async def _run_idle_session(self) -> None:
+        await self.telnet.start()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.telnet.port)
+        self.received = await asyncio.wait_for(reader.read(), timeout=1)
+
+        writer.close()
+
+        self.telnet.shutdown()
+        await self.telnet.wait_closed()
+
+    def test_async_telnet_idle_timeout(self):
+        self.telnet = AsyncTelnetServer(port=0, config=TelnetConfig(idle_timeout=0.05))
+
+        asyncio.run(self._run_idle_session())
+
+        # the stream is closed on the client, once it's been idle for too long
+        assert self.received == b"\xff\xfbV\xff\xfb\xc9\xff\xfd\x1f"
+        assert [event.input_ for event in self.events] == [None, None]
+
+    def test_async_telnet_restart(self):
+        asyncio.run(self._run_session(b"look\r\n"))
+        asyncio.run(self._run_session(b"north\r\n"))
+
+        assert [event.input_ for event in self.events] == [
+            None,
+            "look",
+            None,
+            None,
+            "north",
+            None,
+        ]
+
+    async def _run_crashing_session(self) -> None:
+        await self.telnet.start()
+
+        _, writer = await asyncio.open_connection("127.0.0.1", self.telnet.port)
+
+        for data in (b"look\r\n", b"north\r\n"):
+            writer.write(data)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+
+        writer.close()
+        await asyncio.sleep(0.05)
+
+        self.telnet.shutdown()
+        await self.telnet.wait_closed()
+
+    def test_async_telnet_dispatch_error(self, caplog):
+        # the first batch fails after its command has run, past the flush on connect
+        with patch.object(
+            AsyncTelnetServer, "flush", side_effect=[None, RuntimeError, None]
+        ):
+            asyncio.run(self._run_crashing_session())
+
+        # the dispatcher carries on, and runs the next batch
+        assert [event.input_ for event in self.events] == [None, "look", "north", None]
+        assert "Error dispatching commands" in caplog.text
+
+    def test_async_telnet_update(self):
+        self.telnet.update()
+
+        assert not self.events
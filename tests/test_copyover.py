@@ -0,0 +1,144 @@
+import socket
+from base64 import b64encode
+from unittest.mock import patch
+
+from cibo.copyover import ClientHandoff, Copyover, Handoff
+from cibo.models.data.player import Player
+from cibo.utils.outbox import Outbox
+from cibo.utils.traffic_stats import TrafficStats
+from tests.conftest import ClientFactory, DatabaseFactory, WebSocketClientFactory
+
+
+class TestClientHandoff(ClientFactory, WebSocketClientFactory, DatabaseFactory):
+    def test_client_handoff_from_client(self):
+        local_socket, self.client.socket = socket.socketpair()
+        self.client.parser.feed(b"lo")
+        self.client.commands.push("look")
+        self.client.send_message("Hello!")
+        self.client.outbox.start_compression(b"")
+
+        client_handoff = ClientHandoff.from_client(self.client)
+
+        assert client_handoff.address == "127.0.0.1"
+        assert client_handoff.player_id is None
+        assert not client_handoff.websocket
+        assert client_handoff.unfinished_input == b64encode(b"lo").decode()
+        assert client_handoff.commands == ["look"]
+        assert not self.client.commands
+        assert not self.client.outbox.is_compressed
+
+        # the socket is left open for the new process
+        assert self.client.socket.fileno() == -1
+        assert socket.socket(fileno=client_handoff.fileno).get_inheritable()
+
+        local_socket.close()
+
+    def test_client_handoff_from_client_traffic_stats(self):
+        local_socket, self.client.socket = socket.socketpair()
+        traffic_stats = TrafficStats()
+        self.client.outbox = Outbox(traffic_stats=traffic_stats)
+        self.client.send_message("Hello!")
+
+        client_handoff = ClientHandoff.from_client(self.client)
+
+        # the output is only handed off, so it hasn't been sent yet
+        assert client_handoff.output == b64encode(b"Hello!").decode()
+        assert traffic_stats.bytes_sent == 0
+
+        local_socket.close()
+
+    def test_client_handoff_from_websocket_client(self):
+        text = self.websocket_client.receive(
+            self.WEBSOCKET_HANDSHAKE
+            + self.create_frame(1, b"lo", final=False)
+            + self.create_frame(0, b"ok")
+            + self.create_frame(1, b"no", final=False)
+            + b"\x81"
+        )
+        assert self.websocket_client.parser.feed(text) == ["look"]
+
+        client_handoff = ClientHandoff.from_client(self.websocket_client)
+
+        assert client_handoff.websocket
+        assert client_handoff.websocket_open
+        assert client_handoff.unfinished_frames == b64encode(b"\x81").decode()
+        assert client_handoff.unfinished_message == b64encode(b"no").decode()
+        assert client_handoff.unfinished_message_is_text
+
+    def test_client_handoff_restore_to(self, _fixture_database):
+        client_handoff = ClientHandoff(
+            fileno=-1,
+            address="127.0.0.1",
+            player_id=Player.get_by_name("frank").id_,
+            terminal_width=100,
+            unfinished_input=b64encode(b"lo").decode(),
+            commands=["north"],
+            output=b64encode(b"Hello!").decode(),
+        )
+
+        client_handoff.restore_to(self.client)
+
+        assert self.client.is_logged_in
+        assert self.client.player.name == "frank"
+        assert self.client.terminal_width == 100
+        assert self.client.parser.feed(b"ok\r\n") == ["look"]
+        assert self.client.commands.pop() == "north"
+        assert self.client.outbox.data == bytearray(b"Hello!")
+
+    def test_client_handoff_restore_to_missing_player(self, _fixture_database):
+        ClientHandoff(
+            fileno=-1, address="127.0.0.1", player_id=9999, terminal_width=76
+        ).restore_to(self.client)
+
+        assert not self.client.is_logged_in
+
+    def test_client_handoff_restore_to_websocket_client(self):
+        ClientHandoff(
+            fileno=-1,
+            address="127.0.0.1",
+            player_id=None,
+            terminal_width=76,
+            websocket=True,
+            websocket_open=True,
+            unfinished_frames=b64encode(b"\x80").decode(),
+            unfinished_message=b64encode(b"no").decode(),
+            unfinished_message_is_text=True,
+        ).restore_to(self.websocket_client)
+
+        assert self.websocket_client.is_open
+
+        # the frame carries on from where it was cut off, finishing the message
+        text = self.websocket_client.receive(self.create_frame(0, b"rth")[1:])
+
+        assert self.websocket_client.parser.feed(text) == ["north"]
+
+
+class TestCopyover:
+    def test_copyover_save_load(self, tmp_path):
+        path = str(tmp_path / "copyover.json")
+        handoff = Handoff(
+            listen_fileno=3,
+            websocket_listen_fileno=None,
+            clients=[
+                ClientHandoff(
+                    fileno=4,
+                    address="127.0.0.1",
+                    player_id=1,
+                    terminal_width=76,
+                    commands=["look"],
+                )
+            ],
+        )
+
+        Copyover(path).save(handoff)
+
+        assert Copyover(path).load() == handoff
+        assert not (tmp_path / "copyover.json").exists()
+
+    def test_copyover_pending(self):
+        with patch.dict("os.environ", {Copyover.ENVIRONMENT_VARIABLE: "copyover.json"}):
+            assert Copyover.pending()
+            assert not Copyover.pending()
+
+    def test_copyover_pending_none(self):
+        assert not Copyover.pending()
@@ -0,0 +1,78 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from pytest import raises
+
+from cibo.models.client import ClientLoginState
+from tests.conftest import MetricsFactory
+
+
+class TestMetrics(MetricsFactory):
+    def test_metrics_render_clients(self):
+        self.client.login_state = ClientLoginState.LOGGED_IN
+        self.client.send_message("Hello!")
+        self.telnet.get_connected_clients().append(self.client)
+
+        lines = self.metrics.render().splitlines()
+
+        assert "# TYPE cibo_clients gauge" in lines
+        assert 'cibo_clients{state="pre_login"} 0' in lines
+        assert 'cibo_clients{state="logged_in"} 1' in lines
+        assert "cibo_queued_output_bytes 6" in lines
+        assert "cibo_pending_timers 0" in lines
+
+    def test_metrics_render_stats(self):
+        self.telnet.traffic_stats.inputs = 3
+        self.telnet.traffic_stats.dropped_lines = 2
+        self.tick_stats.ticks = 10
+
+        lines = self.metrics.render().splitlines()
+
+        assert "cibo_inputs_total 3" in lines
+        assert "cibo_dropped_lines_total 2" in lines
+        assert "cibo_ticks_total 10" in lines
+        assert 'cibo_loop_phase_seconds_count{phase="ticks"} 0' in lines
+        assert "# TYPE cibo_db_query_seconds summary" in lines
+        assert "# TYPE cibo_render_seconds summary" in lines
+
+    def test_metrics_render_latency(self):
+        self.server_config.latency_stats.histograms.clear()
+
+        with self.server_config.latency_stats.measure('say "hi"'):
+            pass
+
+        lines = self.metrics.render().splitlines()
+
+        assert 'cibo_process_seconds_bucket{name="say \\"hi\\"",le="+Inf"} 1' in lines
+        assert 'cibo_process_seconds_count{name="say \\"hi\\""} 1' in lines
+        assert 'cibo_process_errors_total{name="say \\"hi\\""} 0' in lines
+
+
+class TestMetricsServer(MetricsFactory):
+    def test_metrics_server_scrape(self):
+        self.metrics_server.start()
+
+        with urlopen(f"http://127.0.0.1:{self.metrics_server.port}/metrics") as reply:
+            assert reply.status == 200
+            assert reply.headers["Content-Type"].startswith("text/plain")
+            assert b"cibo_clients" in reply.read()
+
+    def test_metrics_server_not_found(self):
+        self.metrics_server.start()
+
+        with raises(HTTPError) as ex:
+            with urlopen(f"http://127.0.0.1:{self.metrics_server.port}/"):
+                pass
+
+        assert ex.value.code == 404
+
+    def test_metrics_server_restart(self):
+        self.metrics_server.start()
+        self.metrics_server.start()
+        self.metrics_server.stop()
+
+        assert self.metrics_server.port == 0
+
+        self.metrics_server.start()
+
+        assert self.metrics_server.port
@@ -0,0 +1,113 @@
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+from blinker import signal
+
+from cibo.async_telnet import AsyncTelnetServer
+from cibo.telnet import TelnetServer
+from tests.conftest import ServerFactory
+
+
+class TestServer(ServerFactory):
+    def _send_input(self) -> None:
+        client_socket = socket.create_connection(("127.0.0.1", self.telnet.port))
+        client_socket.sendall(b"look\r\n")
+
+        self.wait_for(
+            lambda: any(
+                payload and payload.input_ == "look" for payload, _ in self.events
+            )
+        )
+
+        client_socket.close()
+
+    def _restart(self) -> None:
+        for _ in range(2):
+            self.events.clear()
+
+            self.server.start()
+            self.wait_for(lambda: self.server.is_running)
+
+            self._send_input()
+
+            self.server.stop()
+
+            assert not self.server.is_running
+
+    def test_server_restart(self):
+        self.create_server(TelnetServer(port=0))
+
+        self._restart()
+
+    def test_server_restart_async(self):
+        self.create_server(AsyncTelnetServer(port=0))
+
+        self._restart()
+
+    def test_server_ticks(self):
+        self.create_server(TelnetServer(port=0))
+
+        self.server.start()
+        self.wait_for(lambda: self.server.tick_stats.ticks >= 3)
+
+        self._send_input()
+
+        server_threads = {thread for _, thread in self.events}
+
+        # the ticks, spawn and input all ran on the server's own loop, between its
+        # updates
+        assert len(server_threads) == 1
+        assert threading.current_thread() not in server_threads
+
+    def test_server_ticks_error(self, caplog):
+        def crash(_sender):
+            raise RuntimeError
+
+        signal("event-tick").connect(crash)
+        self.create_server(TelnetServer(port=0))
+
+        self.server.start()
+        self.wait_for(lambda: self.server.tick_stats.ticks >= 3)
+
+        signal("event-tick").disconnect(crash)
+
+        # the ticks carried on past the error, and so did the loop
+        self._send_input()
+
+        assert "Error running tick" in caplog.text
+
+    def test_server_ticks_flush(self):
+        self.create_server(TelnetServer(port=0))
+        self.server.start()
+        self.wait_for(lambda: self.server.is_running)
+
+        client_socket = socket.create_connection(("127.0.0.1", self.telnet.port))
+        self.wait_for(self.telnet.get_connected_clients)
+        client_socket.recv(9)
+
+        def announce(_sender):
+            for client in self.telnet.get_connected_clients():
+                client.send_message("Tick!")
+
+        # with updates doing nothing, only the ticks themselves can send the output
+        with patch.object(TelnetServer, "update", lambda *_, **__: time.sleep(0.001)):
+            signal("event-tick").connect(announce)
+            client_socket.settimeout(1)
+
+            assert client_socket.recv(5) == b"Tick!"
+
+            signal("event-tick").disconnect(announce)
+
+        client_socket.close()
+
+    def test_server_ticks_async(self):
+        self.create_server(AsyncTelnetServer(port=0))
+
+        self.server.start()
+        self.wait_for(lambda: self.server.tick_stats.ticks >= 3)
+
+        self._send_input()
+
+        assert len({thread for _, thread in self.events}) == 1
@@ -0,0 +1,99 @@
+from multiprocessing.synchronize import Event
+from time import sleep
+
+from pytest import fixture
+
+from cibo.supervisor import Supervisor
+
+
+def wait_for_stop(stop_event: Event) -> None:
+    stop_event.wait()
+
+
+def exit_early(_stop_event: Event) -> None:
+    pass
+
+
+class TestSupervisor:
+    @fixture(autouse=True)
+    def fixture_supervisor(self):
+        self.supervisor = Supervisor(2, wait_for_stop)
+
+        yield
+
+        self.supervisor.stop()
+
+    def test_supervisor_start(self):
+        self.supervisor.start()
+
+        assert self.supervisor.is_running
+
+    def test_supervisor_stop(self):
+        self.supervisor.start()
+        self.supervisor.stop()
+
+        assert not self.supervisor.is_running
+
+    def test_supervisor_monitor(self):
+        self.supervisor.start()
+        self.supervisor.monitor()
+
+        assert not self.supervisor.restarts
+
+    def test_supervisor_monitor_restart(self):
+        supervisor = Supervisor(1, exit_early, restart_delay=0)
+        supervisor.start()
+        sleep(0.5)
+
+        supervisor.monitor()
+        supervisor.stop()
+
+        assert supervisor.restarts == 1
+
+    def test_supervisor_monitor_restart_delay(self):
+        supervisor = Supervisor(1, exit_early, restart_delay=0.5)
+        supervisor.start()
+        sleep(0.5)
+
+        # the worker waits out the delay before it's restarted
+        supervisor.monitor()
+        restarts_before_delay = supervisor.restarts
+        sleep(0.5)
+
+        supervisor.monitor()
+        supervisor.stop()
+
+        assert not restarts_before_delay
+        assert supervisor.restarts == 1
+
+    def test_supervisor_monitor_restart_backoff(self):
+        supervisor = Supervisor(1, exit_early, restart_delay=0.25)
+        supervisor.start()
+        sleep(0.5)
+
+        supervisor.monitor()
+        sleep(0.5)
+
+        supervisor.monitor()
+        sleep(0.5)
+
+        # the worker stopped again straight away, so the delay has doubled
+        supervisor.monitor()
+        restarts_before_delay = supervisor.restarts
+        sleep(0.5)
+
+        supervisor.monitor()
+        supervisor.stop()
+
+        assert restarts_before_delay == 1
+        assert supervisor.restarts == 2
+
+    def test_supervisor_monitor_not_running(self):
+        self.supervisor.monitor()
+
+        assert not self.supervisor.restarts
+
+    def test_supervisor_watch(self):
+        self.supervisor.watch()
+
+        assert not self.supervisor.is_running
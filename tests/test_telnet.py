@@ -0,0 +1,463 @@
+import json
+import socket
+import time
+import zlib
+
+from blinker import signal
+
+from cibo.models.websocket_client import WebSocketClient
+from cibo.telnet import TelnetServer
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.admission import Admission
+from cibo.utils.command_queue import CommandOverflow
+from cibo.utils.loop_stats import LoopPhase
+from cibo.utils.outbox import Outbox
+from cibo.utils.tracer import tracer
+from cibo.utils.websocket_message import WebSocketMessage
+from tests.conftest import TelnetFactory
+
+
+class TestTelnetServer(TelnetFactory):
+    def test_telnet_connect(self):
+        client_socket = self.connect_client()
+
+        assert len(self.telnet.get_connected_clients()) == 1
+        assert self.events[0].client is self.telnet.get_connected_clients()[0]
+
+        client_socket.close()
+
+    def test_telnet_input(self):
+        client_socket = self.connect_client()
+
+        self.send_input(client_socket, b"look\r\n")
+
+        assert self.events[1].input_ == "look"
+
+    def test_telnet_input_pipelined(self):
+        client_socket = self.connect_client()
+
+        self.send_input(client_socket, b"n\r\ne\r\nlook\r\n")
+
+        assert [event.input_ for event in self.events[1:]] == ["n", "e", "look"]
+
+    def test_telnet_input_split(self):
+        client_socket = self.connect_client()
+
+        self.send_input(client_socket, b"lo")
+        self.send_input(client_socket, b"ok\r\n")
+
+        assert [event.input_ for event in self.events[1:]] == ["look"]
+
+    def test_telnet_connect_many(self):
+        client_sockets = [
+            socket.create_connection(("127.0.0.1", self.telnet.port)) for _ in range(5)
+        ]
+        time.sleep(0.01)
+
+        self.telnet.update(timeout=1)
+
+        assert len(self.telnet.get_connected_clients()) == 5
+        assert self.telnet.accept_stats.accepted == 5
+
+        for client_socket in client_sockets:
+            client_socket.close()
+
+    def test_telnet_connect_rejected(self):
+        client_sockets = [
+            socket.create_connection(("127.0.0.1", self.telnet.port)) for _ in range(6)
+        ]
+        time.sleep(0.01)
+
+        self.telnet.update(timeout=1)
+
+        assert len(self.telnet.get_connected_clients()) == 5
+        assert self.telnet.admission_stats.rejected_address == 1
+        assert client_sockets[5].recv(64) == Admission.REJECTION_BANNER
+
+        for client_socket in client_sockets:
+            client_socket.close()
+
+    def test_telnet_disconnect(self):
+        client_socket = self.connect_client()
+        client = self.telnet.get_connected_clients()[0]
+
+        client_socket.close()
+        self.telnet.update(timeout=1)
+
+        assert not self.telnet.get_connected_clients()
+        assert self.events[1].client is client
+        assert signal("event-disconnect").receivers
+        assert client.socket.fileno() == -1
+
+    def test_telnet_disconnect_closed_socket(self):
+        client_socket = self.connect_client()
+        self.telnet.get_connected_clients()[0].disconnect()
+
+        self.telnet.update()
+
+        assert not self.telnet.get_connected_clients()
+        assert client_socket.fileno() > 0
+
+    def test_telnet_update_idle(self):
+        client_socket = self.connect_client()
+
+        self.telnet.update(timeout=0.01)
+
+        assert len(self.events) == 1
+        assert client_socket.fileno() > 0
+
+    def test_telnet_flush(self):
+        client_socket = self.connect_client()
+
+        self.telnet.get_connected_clients()[0].send_message("Hello!")
+        self.telnet.update()
+
+        assert client_socket.recv(6) == b"Hello!"
+
+    def test_telnet_flush_partial(self):
+        client_socket = self.connect_client()
+        client = self.telnet.get_connected_clients()[0]
+        client.outbox = Outbox(high_water_mark=8388608)
+
+        # more than the socket buffers will hold, while the client isn't reading
+        client.send_message("x" * 8388608)
+        self.telnet.update()
+
+        assert client.outbox
+
+        # the rest is sent as the socket becomes writable again
+        while client.outbox:
+            client_socket.recv(1048576)
+            self.telnet.update(timeout=1)
+
+        assert len(self.telnet.get_connected_clients()) == 1
+
+    def test_telnet_flush_disconnected(self):
+        self.connect_client()
+        client = self.telnet.get_connected_clients()[0]
+
+        client.send_message("Hello!")
+        client.socket.close()
+        self.telnet.flush()
+
+        assert not self.telnet.get_connected_clients()
+
+    def test_telnet_flush_coalesced(self):
+        client_socket = self.connect_client()
+        client = self.telnet.get_connected_clients()[0]
+
+        client.send_message("Hello!")
+        client.send_prompt()
+        client.send_message("\r\n")
+        client.send_prompt()
+        self.telnet.update()
+
+        assert client_socket.recv(64) == b"Hello!\r\n\r\n> "
+
+    def test_telnet_offer_options(self):
+        self.connect_client()
+
+        assert self.offered_options == b"\xff\xfbV\xff\xfb\xc9\xff\xfd\x1f"
+
+    def test_telnet_compression(self):
+        client_socket = self.connect_client()
+        client = self.telnet.get_connected_clients()[0]
+
+        self.send_input(client_socket, b"\xff\xfdV")
+        client.send_message("Hello!")
+        self.telnet.update()
+
+        assert client_socket.recv(5) == b"\xff\xfaV\xff\xf0"
+        assert zlib.decompressobj().decompress(client_socket.recv(64)) == b"Hello!"
+
+    def test_telnet_shutdown(self):
+        client_socket = self.connect_client()
+
+        self.telnet.shutdown()
+
+        assert not self.telnet.get_connected_clients()
+        assert not client_socket.recv(64)
+
+        client_socket.close()
+
+        # the server can be started up again, once it's been shut down
+        self.telnet.listen()
+        client_socket = self.connect_client()
+
+        assert len(self.telnet.get_connected_clients()) == 1
+
+        client_socket.close()
+
+    def test_telnet_keepalive(self):
+        self.connect_client()
+        client_socket = self.telnet.get_connected_clients()[0].socket
+
+        assert client_socket.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert client_socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 30
+
+    def test_telnet_idle_timeout(self):
+        telnet = TelnetServer(port=0, config=TelnetConfig(idle_timeout=0.01))
+        telnet.listen()
+
+        client_socket = socket.create_connection(("127.0.0.1", telnet.port))
+        telnet.update(timeout=1)
+        time.sleep(0.02)
+        telnet.update()
+
+        assert not telnet.get_connected_clients()
+        assert self.events[1].client is self.events[0].client
+
+        client_socket.close()
+        telnet.shutdown()
+
+    def test_telnet_window_size(self):
+        client_socket = self.connect_client()
+
+        self.send_input(
+            client_socket, b"\xff\xfb\x1f\xff\xfa\x1f\x00\x78\x00\x18\xff\xf0"
+        )
+
+        assert self.telnet.get_connected_clients()[0].terminal_width == 116
+
+
+class TestTelnetServerCommands(TelnetFactory):
+    def test_telnet_input_fair(self):
+        flooder_socket = self.connect_client()
+        client_socket = self.connect_client()
+
+        flooder_socket.sendall(b"a\r\nb\r\nc\r\nd\r\ne\r\n")
+        client_socket.sendall(b"look\r\n")
+        time.sleep(0.01)
+
+        self.telnet.update(timeout=1)
+
+        # the flooder only gets their share of this update, with the rest left
+        # waiting for the next
+        assert [event.input_ for event in self.events[2:]] == ["a", "look", "b", "c"]
+
+        self.telnet.update(timeout=1)
+
+        assert [event.input_ for event in self.events[6:]] == ["d", "e"]
+
+        flooder_socket.close()
+        client_socket.close()
+
+    def test_telnet_loop_stats(self):
+        self.telnet.update()
+
+        phases = self.telnet.loop_stats.phases
+
+        assert phases[LoopPhase.NETWORK].count == 1
+        assert phases[LoopPhase.INPUT].count == 1
+        assert phases[LoopPhase.FLUSH].count == 1
+        assert not phases[LoopPhase.TICKS].count
+
+    def test_telnet_traffic_stats(self):
+        client_socket = self.connect_client()
+
+        self.send_input(client_socket, b"look\r\nsay hi\r\n")
+        self.telnet.update()
+
+        self.telnet.get_connected_clients()[0].send_message("Hello!")
+        self.telnet.update()
+        client_socket.recv(6)
+
+        traffic_stats = self.telnet.traffic_stats
+
+        assert traffic_stats.inputs == 2
+        assert traffic_stats.bytes_received == 14
+
+        # the options offered on connect, then the message
+        assert traffic_stats.bytes_sent == 9 + 6
+
+    def test_telnet_tracing(self, tmp_path):
+        client_socket = self.connect_client()
+        tracer.start(f"{tmp_path}/trace.jsonl", sample_rate=1.0)
+
+        self.send_input(client_socket, b"login frank secret\r\n")
+        self.telnet.get_connected_clients()[0].send_message("Hello!")
+        self.telnet.update()
+
+        tracer.stop()
+
+        with open(f"{tmp_path}/trace.jsonl", encoding="utf-8") as file:
+            events = [json.loads(line) for line in file]
+
+        # the input's trace is held open until its output is written. Any events
+        # listening for input add spans of their own before that
+        assert [event["name"] for event in events][-2:] == ["socket write", "input"]
+        assert events[-1]["args"] == {"command": "login"}
+
+    def test_telnet_input_too_many_lines(self):
+        telnet = TelnetServer(port=0, config=TelnetConfig(max_pending_lines=2))
+        telnet.listen()
+
+        client_socket = socket.create_connection(("127.0.0.1", telnet.port))
+        telnet.update(timeout=1)
+        client_socket.recv(9)
+
+        client_socket.sendall(b"a\r\nb\r\nc\r\n")
+        telnet.update(timeout=1)
+
+        assert [event.input_ for event in self.events[1:]] == ["a", "b"]
+        assert telnet.traffic_stats.dropped_lines == 1
+        assert client_socket.recv(128).decode() == TelnetServer.COMMANDS_DROPPED_WARNING
+
+        client_socket.close()
+        telnet.shutdown()
+
+    def test_telnet_input_overflow_disconnect(self):
+        telnet = TelnetServer(
+            port=0,
+            config=TelnetConfig(
+                max_queued_commands=2, command_overflow=CommandOverflow.DISCONNECT
+            ),
+        )
+        telnet.listen()
+
+        client_socket = socket.create_connection(("127.0.0.1", telnet.port))
+        telnet.update(timeout=1)
+
+        client_socket.sendall(b"a\r\nb\r\nc\r\n")
+        telnet.update(timeout=1)
+
+        assert not telnet.get_connected_clients()
+        assert [event.input_ for event in self.events] == [None, None]
+
+        client_socket.close()
+        telnet.shutdown()
+
+    def test_telnet_input_overflow_warn(self):
+        telnet = TelnetServer(
+            port=0,
+            config=TelnetConfig(
+                max_queued_commands=2, command_overflow=CommandOverflow.WARN
+            ),
+        )
+        telnet.listen()
+
+        client_socket = socket.create_connection(("127.0.0.1", telnet.port))
+        telnet.update(timeout=1)
+        client_socket.recv(9)
+
+        client_socket.sendall(b"a\r\nb\r\nc\r\n")
+        telnet.update(timeout=1)
+
+        assert [event.input_ for event in self.events[1:]] == ["a", "b"]
+        assert client_socket.recv(128).decode() == TelnetServer.COMMANDS_DROPPED_WARNING
+
+        client_socket.close()
+        telnet.shutdown()
+
+    def test_telnet_input_error(self, caplog):
+        def crash(_sender, payload):
+            if payload.input_ == "crash":
+                raise RuntimeError
+
+        signal("event-input").connect(crash)
+        client_socket = self.connect_client()
+
+        self.send_input(client_socket, b"crash\r\nlook\r\n")
+
+        signal("event-input").disconnect(crash)
+
+        # the faulty command is logged, and the ones after it still run
+        assert self.events[-1].input_ == "look"
+        assert "Error running 'crash'" in caplog.text
+
+        client_socket.close()
+
+
+class TestTelnetServerWebSocket(TelnetFactory):
+    def test_telnet_websocket_session(self):
+        client_socket = self.connect_websocket_client()
+
+        assert self.handshake_reply.startswith(b"HTTP/1.1 101 Switching Protocols")
+        assert isinstance(self.events[0].client, WebSocketClient)
+
+        self.send_input(client_socket, self.create_frame(1, b"look"))
+        self.events[0].client.send_message("Hello!")
+        self.telnet.flush()
+
+        assert self.events[1].input_ == "look"
+        assert client_socket.recv(64) == b"\x81\x06Hello!"
+
+        self.send_input(client_socket, self.create_frame(8, b"\x03\xe8"))
+
+        assert not self.telnet.get_connected_clients()
+        assert self.events[2].client is self.events[0].client
+
+        client_socket.close()
+
+    def test_telnet_websocket_input_then_close(self):
+        client_socket = self.connect_websocket_client()
+
+        self.send_input(
+            client_socket,
+            self.create_frame(1, b"look") + self.create_frame(8, b"\x03\xe8"),
+        )
+
+        # the client closed the WebSocket in the same read, so their input is dropped
+        assert not self.telnet.get_connected_clients()
+        assert [event.input_ for event in self.events[1:]] == [None]
+
+        client_socket.close()
+
+    def test_telnet_websocket_bad_request(self):
+        client_socket = socket.create_connection(
+            ("127.0.0.1", self.telnet.websocket_port)
+        )
+        self.telnet.update(timeout=1)
+
+        self.send_input(client_socket, b"GET / HTTP/1.1\r\n\r\n")
+
+        assert client_socket.recv(128) == WebSocketMessage.BAD_REQUEST
+        assert not self.telnet.get_connected_clients()
+        assert not self.events
+
+        client_socket.close()
+
+    def test_telnet_websocket_port_disabled(self):
+        assert TelnetServer(port=0).websocket_port is None
+
+
+class TestTelnetServerCopyover(TelnetFactory):
+    def test_telnet_copyover(self):
+        client_socket = self.connect_client()
+        websocket_client_socket = self.connect_websocket_client()
+        port = self.telnet.port
+
+        self.send_input(client_socket, b"lo")
+        self.telnet.get_connected_clients()[0].send_message("Hello!")
+
+        handoff = self.telnet.hand_off()
+
+        # the old server is shut down as usual, which no longer touches the sockets
+        self.telnet.shutdown()
+        self.telnet = TelnetServer(port=0, websocket_port=0)
+        self.telnet.restore(handoff)
+
+        assert self.telnet.port == port
+        assert len(self.telnet.get_connected_clients()) == 2
+        assert isinstance(self.telnet.get_connected_clients()[1], WebSocketClient)
+
+        self.send_input(client_socket, b"ok\r\n")
+        self.send_input(websocket_client_socket, self.create_frame(1, b"north"))
+
+        # the output queued before the handoff is sent, followed by the options
+        # offered again
+        assert client_socket.recv(64) == b"Hello!\xff\xfbV\xff\xfb\xc9\xff\xfd\x1f"
+        assert [event.input_ for event in self.events[2:]] == ["look", "north"]
+
+        client_socket.close()
+        websocket_client_socket.close()
+
+    def test_telnet_copyover_not_listening(self):
+        handoff = TelnetServer(port=0).hand_off()
+
+        self.telnet.shutdown()
+        self.telnet = TelnetServer(port=0)
+        self.telnet.restore(handoff)
+
+        assert self.telnet.port
+        assert not self.telnet.get_connected_clients()
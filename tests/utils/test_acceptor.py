@@ -0,0 +1,83 @@
+import socket
+import time
+from unittest.mock import patch
+
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.acceptor import Acceptor
+from tests.conftest import AcceptorFactory
+
+
+class TestAcceptor(AcceptorFactory):
+    def _connect(self, count: int):
+        self.client_sockets = [
+            socket.create_connection(("127.0.0.1", self.acceptor.port))
+            for _ in range(count)
+        ]
+        time.sleep(0.01)
+
+    def test_acceptor_listen(self):
+        assert self.acceptor.port
+        assert not self.acceptor.socket.getblocking()
+
+    def test_acceptor_close(self):
+        self.acceptor.close()
+
+        assert not self.acceptor.socket
+
+        self.acceptor.listen()
+
+        assert self.acceptor.socket
+
+    def test_acceptor_hand_off(self):
+        port = self.acceptor.port
+        fileno = self.acceptor.hand_off()
+        acceptor = Acceptor(0, TelnetConfig())
+
+        acceptor.adopt(fileno)
+
+        assert acceptor.port == port
+        assert not self.acceptor.socket
+        assert not self.acceptor.hand_off()
+        assert not acceptor.socket.get_inheritable()
+
+        acceptor.close()
+
+    def test_acceptor_accept(self):
+        self._connect(2)
+
+        accepted = self.acceptor.accept()
+
+        assert [address for _socket, address in accepted] == ["127.0.0.1"] * 2
+        assert not accepted[0][0].getblocking()
+        assert accepted[0][0].getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert self.acceptor.stats.accepted == 2
+
+    def test_acceptor_accept_budget(self):
+        self._connect(3)
+
+        assert len(self.acceptor.accept()) == 2
+        assert self.acceptor.stats.budget_exhausted == 1
+        assert len(self.acceptor.accept()) == 1
+
+    def test_acceptor_accept_empty(self):
+        assert not self.acceptor.accept()
+        assert not self.acceptor.stats.accepted
+
+    def test_acceptor_record(self):
+        with patch.object(Acceptor, "RATE_WINDOW", 0):
+            self.acceptor.record(5)
+
+        assert self.acceptor.stats.accepted == 5
+        assert self.acceptor.stats.rate > 0
+
+    def test_acceptor_reuse_port(self):
+        first = Acceptor(0, TelnetConfig(reuse_port=True))
+        first.listen()
+
+        second = Acceptor(first.port, TelnetConfig(reuse_port=True))
+        second.listen()
+
+        assert second.port == first.port
+
+        first.close()
+        second.close()
@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from cibo.telnet_config import TelnetConfig
+from cibo.utils.admission import Admission, TokenBucket
+from tests.conftest import AdmissionFactory
+
+
+class TestTokenBucket:
+    def test_token_bucket_take(self):
+        bucket = TokenBucket(rate=1.0, burst=2, now=0.0)
+
+        assert bucket.take(0.0)
+        assert bucket.take(0.0)
+        assert not bucket.take(0.0)
+        assert bucket.take(1.0)
+
+    def test_token_bucket_is_full(self):
+        bucket = TokenBucket(rate=1.0, burst=2, now=0.0)
+        bucket.take(0.0)
+
+        assert not bucket.is_full(0.5)
+        assert bucket.is_full(1.0)
+
+
+class TestAdmission(AdmissionFactory):
+    def test_admission_admit(self):
+        assert self.admission.admit("127.0.0.1")
+        assert self.admission.admit("127.0.0.1")
+
+    def test_admission_admit_rejected_address(self):
+        for _ in range(3):
+            self.admission.admit("127.0.0.1")
+
+        assert self.admission.stats.rejected_address == 1
+        assert self.admission.admit("10.0.0.1")
+
+    def test_admission_admit_rejected_global(self):
+        for address in ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"]:
+            self.admission.admit(address)
+
+        assert self.admission.stats.rejected_global == 1
+
+    def test_admission_admit_unlimited(self):
+        admission = Admission(TelnetConfig(address_connect_rate=0, connect_rate=0))
+
+        assert all(admission.admit("127.0.0.1") for _ in range(500))
+
+    def test_admission_prune(self):
+        with patch("cibo.utils.admission.time.monotonic", return_value=0.0):
+            admission = Admission(TelnetConfig(address_connect_burst=1))
+            admission.admit("127.0.0.1")
+
+        # long enough for the bucket to refill and be thrown away, so the address
+        # starts over with a new one
+        with patch("cibo.utils.admission.time.monotonic", return_value=3600.0):
+            assert admission.admit("127.0.0.1")
+            assert not admission.admit("127.0.0.1")
@@ -0,0 +1,44 @@
+from cibo.utils.command_queue import CommandOverflow, CommandQueue
+from tests.conftest import CommandQueueFactory
+
+
+class TestCommandQueue(CommandQueueFactory):
+    def test_command_queue_push(self):
+        assert self.command_queue.push("look")
+        assert self.command_queue.push("north")
+
+        assert len(self.command_queue) == 2
+        assert self.command_queue.pop() == "look"
+
+    def test_command_queue_push_drop_oldest(self):
+        for command in ["look", "north", "south"]:
+            assert self.command_queue.push(command)
+
+        assert self.command_queue.dropped_commands == 1
+        assert [self.command_queue.pop() for _ in range(2)] == ["north", "south"]
+
+    def test_command_queue_push_disconnect(self):
+        command_queue = CommandQueue(
+            max_commands=1, overflow=CommandOverflow.DISCONNECT
+        )
+
+        assert command_queue.push("look")
+        assert not command_queue.push("north")
+
+        assert command_queue.overflow is CommandOverflow.DISCONNECT
+        assert command_queue.dropped_commands == 1
+        assert command_queue.pop() == "look"
+
+    def test_command_queue_push_warn(self):
+        command_queue = CommandQueue(max_commands=1, overflow=CommandOverflow.WARN)
+
+        command_queue.push("look")
+
+        assert not command_queue.push("north")
+        assert len(command_queue) == 1
+
+    def test_command_queue_clear(self):
+        self.command_queue.push("look")
+        self.command_queue.clear()
+
+        assert not self.command_queue
@@ -0,0 +1,61 @@
+from unittest.mock import Mock
+
+from cibo.utils.command_queue import CommandQueue
+from tests.conftest import CommandSchedulerFactory
+
+
+class TestCommandScheduler(CommandSchedulerFactory):
+    def _create_client(self, commands):
+        client = Mock(commands=CommandQueue())
+
+        for command in commands:
+            client.commands.push(command)
+
+        self.command_scheduler.add(client)
+
+        return client
+
+    def test_command_scheduler_take(self):
+        flooder = self._create_client(["a", "b", "c", "d"])
+        client = self._create_client(["look"])
+
+        assert list(self.command_scheduler.take(3)) == [
+            (flooder, "a"),
+            (client, "look"),
+            (flooder, "b"),
+            (flooder, "c"),
+        ]
+
+        # the flooder still has commands waiting, for the next update
+        assert len(self.command_scheduler) == 1
+
+    def test_command_scheduler_take_empty(self):
+        assert not list(self.command_scheduler.take(3))
+
+    def test_command_scheduler_add_twice(self):
+        client = self._create_client(["look"])
+        self.command_scheduler.add(client)
+
+        assert len(self.command_scheduler) == 1
+
+    def test_command_scheduler_remove(self):
+        client = self._create_client(["look"])
+        self.command_scheduler.remove(client)
+
+        assert not self.command_scheduler
+        assert not list(self.command_scheduler.take(3))
+
+    def test_command_scheduler_take_cleared(self):
+        quitter = self._create_client(["quit", "look"])
+        client = self._create_client(["look", "north"])
+
+        taken = []
+
+        for taken_client, command in self.command_scheduler.take(3):
+            taken.append((taken_client, command))
+
+            # the rest of the queue is thrown away, like the quit command would
+            if command == "quit":
+                quitter.commands.clear()
+
+        assert taken == [(quitter, "quit"), (client, "look"), (client, "north")]
@@ -0,0 +1,50 @@
+from unittest.mock import Mock
+
+from cibo.utils.idle_deadlines import IdleDeadlines
+from tests.conftest import IdleDeadlinesFactory
+
+
+class TestIdleDeadlines(IdleDeadlinesFactory):
+    def test_idle_deadlines_add(self):
+        self.idle_deadlines.add(Mock(last_activity=5.0))
+        self.idle_deadlines.add(Mock(last_activity=2.0))
+
+        assert len(self.idle_deadlines) == 2
+        assert self.idle_deadlines.next_deadline == 12.0
+
+    def test_idle_deadlines_add_disabled(self):
+        idle_deadlines = IdleDeadlines(timeout=0)
+
+        idle_deadlines.add(Mock(last_activity=5.0))
+
+        assert not idle_deadlines
+        assert idle_deadlines.next_deadline is None
+
+    def test_idle_deadlines_pop_expired(self):
+        idle_client = Mock(last_activity=0.0)
+        active_client = Mock(last_activity=5.0)
+
+        self.idle_deadlines.add(idle_client)
+        self.idle_deadlines.add(active_client)
+
+        assert self.idle_deadlines.pop_expired(12.0) == [idle_client]
+        assert len(self.idle_deadlines) == 1
+
+    def test_idle_deadlines_pop_expired_active_since(self):
+        client = Mock(last_activity=0.0)
+        self.idle_deadlines.add(client)
+
+        client.last_activity = 8.0
+
+        assert not self.idle_deadlines.pop_expired(12.0)
+        assert self.idle_deadlines.next_deadline == 18.0
+        assert self.idle_deadlines.pop_expired(18.0) == [client]
+
+    def test_idle_deadlines_remove(self):
+        client = Mock(last_activity=0.0)
+        self.idle_deadlines.add(client)
+
+        self.idle_deadlines.remove(client)
+
+        assert not self.idle_deadlines.pop_expired(12.0)
+        assert self.idle_deadlines.next_deadline is None
@@ -0,0 +1,71 @@
+from pytest import approx, raises
+
+from cibo.utils.latency_stats import LatencyHistogram
+from tests.conftest import LatencyStatsFactory
+
+
+class TestLatencyStats(LatencyStatsFactory):
+    def test_latency_stats_measure(self):
+        with self.latency_stats.measure("Look"):
+            pass
+
+        histogram = self.latency_stats.histograms["Look"]
+
+        assert histogram.count == 1
+        assert not histogram.errors
+        assert histogram.total == histogram.max
+
+    def test_latency_stats_measure_error(self):
+        with raises(ValueError):
+            with self.latency_stats.measure("Look"):
+                raise ValueError
+
+        assert self.latency_stats.histograms["Look"].errors == 1
+
+    def test_latency_stats_reset(self):
+        with self.latency_stats.measure("Look"):
+            pass
+
+        window_start = self.latency_stats.window_start
+        self.latency_stats.reset()
+
+        assert not self.latency_stats.histograms
+        assert self.latency_stats.window_start >= window_start
+        assert self.latency_stats.window >= 0.0
+
+    def test_latency_histogram_record(self):
+        histogram = LatencyHistogram()
+
+        assert histogram.mean == 0.0
+
+        histogram.record(0.001)
+        histogram.record(0.003, error=True)
+
+        assert histogram.count == 2
+        assert histogram.errors == 1
+        assert histogram.max == 0.003
+        assert histogram.mean == 0.002
+
+        # a time on a bucket's upper bound falls into that bucket
+        assert histogram.counts[3] == 1
+        assert histogram.counts[5] == 1
+
+    def test_latency_histogram_percentile(self):
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(50) == 0.0
+
+        for _run in range(100):
+            histogram.record(0.00005)
+
+        histogram.record(0.007)
+
+        # halfway through the first bucket, but never slower than the slowest run
+        assert histogram.percentile(50) == approx(0.0000505)
+        assert histogram.percentile(100) == 0.007
+
+    def test_latency_histogram_percentile_overflow(self):
+        histogram = LatencyHistogram()
+        histogram.record(30.0)
+
+        assert histogram.percentile(99) == 30.0
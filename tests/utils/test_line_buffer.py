@@ -0,0 +1,80 @@
+from tests.conftest import LineBufferFactory
+
+
+class TestLineBuffer(LineBufferFactory):
+    def test_line_buffer_take_lines(self):
+        self.line_buffer.data += b"n\r\ne\r\nlook\r\n"
+
+        assert self.line_buffer.take_lines() == ["n", "e", "look"]
+        assert not self.line_buffer
+
+    def test_line_buffer_take_lines_unfinished(self):
+        self.line_buffer.data += b"n\r\nlo"
+
+        assert self.line_buffer.take_lines() == ["n"]
+        assert self.line_buffer.data == b"lo"
+
+    def test_line_buffer_take_lines_line_endings(self):
+        self.line_buffer.data += b"n\ne\rs\r\x00\r\n"
+
+        assert self.line_buffer.take_lines() == ["n", "e", "s", ""]
+
+    def test_line_buffer_take_lines_split_line_ending(self):
+        self.line_buffer.data += b"n\r"
+        assert self.line_buffer.take_lines() == ["n"]
+
+        self.line_buffer.data += b"\ne\r\n"
+        assert self.line_buffer.take_lines() == ["e"]
+
+    def test_line_buffer_take_lines_split_line_ending_empty_read(self):
+        self.line_buffer.data += b"n\r"
+        assert self.line_buffer.take_lines() == ["n"]
+
+        assert not self.line_buffer.take_lines()
+
+        self.line_buffer.data += b"\ne\r\n"
+        assert self.line_buffer.take_lines() == ["e"]
+
+    def test_line_buffer_take_lines_split_line_ending_empty_line(self):
+        self.line_buffer.data += b"n\r"
+        assert self.line_buffer.take_lines() == ["n"]
+
+        self.line_buffer.data += b"\n"
+        assert not self.line_buffer.take_lines()
+
+        # a line feed on its own, after the line ending has finished, is an empty line
+        self.line_buffer.data += b"\n"
+        assert self.line_buffer.take_lines() == [""]
+
+    def test_line_buffer_take_lines_max_line_length(self):
+        self.line_buffer.data += b"say " + b"a" * 20
+
+        assert not self.line_buffer.take_lines()
+        assert len(self.line_buffer) == 16
+
+        self.line_buffer.data += b"\r\nlook\r\n"
+
+        assert self.line_buffer.take_lines() == ["say aaaaaaaaaaaa", "look"]
+
+    def test_line_buffer_take_lines_max_lines(self):
+        self.line_buffer.data += b"n\r\n" * 6
+
+        assert self.line_buffer.take_lines() == ["n", "n", "n", "n"]
+        assert not self.line_buffer
+
+        assert self.line_buffer.take_dropped_lines() == 2
+        assert self.line_buffer.take_dropped_lines() == 0
+
+    def test_line_buffer_erase_character(self):
+        self.line_buffer.data += "café".encode()
+
+        self.line_buffer.erase_character()
+
+        assert self.line_buffer.data == b"caf"
+
+    def test_line_buffer_take_lines_carriage_return_mid_data(self):
+        self.line_buffer.data += b"n\rlo"
+        assert self.line_buffer.take_lines() == ["n"]
+
+        self.line_buffer.data += b"\nok\r\n"
+        assert self.line_buffer.take_lines() == ["lo", "ok"]
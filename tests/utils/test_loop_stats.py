@@ -0,0 +1,37 @@
+from pytest import raises
+
+from cibo.utils.loop_stats import LoopPhase, PhaseStats
+from tests.conftest import LoopStatsFactory
+
+
+class TestLoopStats(LoopStatsFactory):
+    def test_loop_stats_phases(self):
+        assert set(self.loop_stats.phases) == set(LoopPhase)
+
+    def test_loop_stats_measure(self):
+        with self.loop_stats.measure(LoopPhase.NETWORK) as phase:
+            pass
+
+        assert phase is self.loop_stats.phases[LoopPhase.NETWORK]
+        assert phase.count == 1
+        assert phase.last == phase.total == phase.max
+
+    def test_loop_stats_measure_error(self):
+        with raises(ValueError):
+            with self.loop_stats.measure(LoopPhase.TICKS):
+                raise ValueError
+
+        assert self.loop_stats.phases[LoopPhase.TICKS].count == 1
+
+    def test_phase_stats_record(self):
+        phase = PhaseStats()
+
+        assert phase.mean == 0.0
+
+        phase.record(0.5)
+        phase.record(0.1)
+
+        assert phase.count == 2
+        assert phase.last == 0.1
+        assert phase.max == 0.5
+        assert phase.mean == 0.3
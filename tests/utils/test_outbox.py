@@ -0,0 +1,160 @@
+import zlib
+from unittest.mock import Mock
+
+from pytest import raises
+
+from cibo.utils.outbox import Outbox, OutboxOverflow
+from cibo.utils.traffic_stats import TrafficStats
+from tests.conftest import OutboxFactory
+
+
+class TestOutbox(OutboxFactory):
+    def test_outbox_queue(self):
+        assert self.outbox.queue(b"abc")
+        assert self.outbox.queue(b"def")
+
+        assert self.outbox.data == bytearray(b"abcdef")
+        assert len(self.outbox) == 6
+
+    def test_outbox_queue_overflow_low_priority(self):
+        self.outbox.queue(b"abcdef")
+
+        assert self.outbox.queue(b"ghi", low_priority=True)
+
+        assert self.outbox.data == bytearray(b"abcdef")
+        assert self.outbox.dropped_messages == 1
+
+    def test_outbox_queue_overflow_normal_priority(self):
+        self.outbox.queue(b"abcdef")
+
+        assert self.outbox.queue(b"ghi")
+
+        assert self.outbox.data == bytearray(b"abcdefghi")
+        assert not self.outbox.dropped_messages
+
+    def test_outbox_queue_overflow_backlog(self):
+        self.outbox.queue(b"abc", low_priority=True, backlog=6)
+
+        assert not self.outbox
+
+    def test_outbox_queue_overflow_disconnect(self):
+        outbox = Outbox(high_water_mark=8, overflow=OutboxOverflow.DISCONNECT)
+
+        assert outbox.queue(b"abcdef")
+        assert not outbox.queue(b"ghi")
+
+    def test_outbox_queue_overflow_hard_limit(self):
+        outbox = Outbox(high_water_mark=4)
+
+        # even output that can't be dropped stops at a multiple of the mark
+        assert outbox.queue(b"abcdefghijklmnop")
+        assert not outbox.queue(b"q")
+
+    def test_outbox_queue_high_water_mark(self):
+        outbox = Outbox(high_water_mark=8, overflow=OutboxOverflow.DISCONNECT)
+
+        assert outbox.queue(b"abc", backlog=2)
+        assert outbox.queue(b"def", backlog=2)
+        assert not outbox.queue(b"g", backlog=2)
+
+    def test_outbox_clear(self):
+        self.outbox.queue(b"abc")
+        self.outbox.start_compression(b"")
+        self.outbox.queue(b"def")
+
+        self.outbox.clear()
+
+        assert not self.outbox
+
+    def test_outbox_write_to(self):
+        socket = Mock(**{"send.return_value": 4})
+        self.outbox.queue(b"abcdef")
+
+        self.outbox.write_to(socket)
+
+        socket.send.assert_called_once()
+        assert self.outbox.data == bytearray(b"ef")
+
+    def test_outbox_traffic_stats(self):
+        traffic_stats = TrafficStats()
+        outbox = Outbox(traffic_stats=traffic_stats)
+        socket = Mock(**{"send.return_value": 4})
+
+        outbox.queue(b"abcdef")
+        outbox.write_to(socket)
+        outbox.take()
+
+        assert traffic_stats.bytes_sent == 6
+
+    def test_outbox_traffic_stats_not_counted(self):
+        traffic_stats = TrafficStats()
+        outbox = Outbox(traffic_stats=traffic_stats)
+
+        outbox.queue(b"abcdef")
+
+        assert outbox.take(count_sent=False) == b"abcdef"
+        assert traffic_stats.bytes_sent == 0
+
+    def test_outbox_write_to_would_block(self):
+        socket = Mock(**{"send.side_effect": BlockingIOError})
+        self.outbox.queue(b"abcdef")
+
+        self.outbox.write_to(socket)
+
+        assert self.outbox.data == bytearray(b"abcdef")
+
+    def test_outbox_write_to_disconnected(self):
+        socket = Mock(**{"send.side_effect": ConnectionResetError})
+        self.outbox.queue(b"abcdef")
+
+        with raises(OSError):
+            self.outbox.write_to(socket)
+
+    def test_outbox_start_compression(self):
+        socket = Mock(**{"send.side_effect": BlockingIOError})
+        self.outbox.queue(b"abc")
+
+        self.outbox.start_compression(b"|")
+        self.outbox.queue(b"defdefdef")
+        self.outbox.write_to(socket)
+
+        assert self.outbox.is_compressed
+        assert self.outbox.data.startswith(b"abc|")
+        assert zlib.decompressobj().decompress(self.outbox.data[4:]) == b"defdefdef"
+        assert self.outbox.raw_bytes == 9
+        assert self.outbox.compressed_bytes == len(self.outbox.data) - 4
+
+    def test_outbox_start_compression_twice(self):
+        self.outbox.start_compression(b"|")
+        self.outbox.start_compression(b"|")
+
+        assert self.outbox.data == bytearray(b"|")
+
+    def test_outbox_stop_compression(self):
+        self.outbox.start_compression(b"")
+        self.outbox.queue(b"abc")
+
+        self.outbox.stop_compression()
+        self.outbox.queue(b"def")
+
+        decompressor = zlib.decompressobj()
+
+        assert not self.outbox.is_compressed
+        assert decompressor.decompress(self.outbox.data) == b"abc"
+        assert decompressor.eof
+        assert decompressor.unused_data == b"def"
+
+    def test_outbox_stop_compression_uncompressed(self):
+        self.outbox.queue(b"abc")
+        self.outbox.stop_compression()
+
+        assert self.outbox.data == bytearray(b"abc")
+
+    def test_outbox_take(self):
+        self.outbox.start_compression(b"")
+        self.outbox.queue(b"abc")
+
+        data = self.outbox.take()
+
+        assert zlib.decompressobj().decompress(data) == b"abc"
+        assert not self.outbox
@@ -0,0 +1,23 @@
+from cibo.utils.telnet_message import TelnetMessage
+
+
+class TestTelnetMessage:
+    def test_telnet_message_negotiation(self):
+        assert (
+            TelnetMessage.negotiation(
+                TelnetMessage.CommandCode.WILL, TelnetMessage.OptionCode.COMPRESS2
+            )
+            == b"\xff\xfbV"
+        )
+
+    def test_telnet_message_subnegotiation(self):
+        assert (
+            TelnetMessage.subnegotiation(TelnetMessage.OptionCode.COMPRESS2, b"a\xff")
+            == b"\xff\xfaVa\xff\xff\xff\xf0"
+        )
+
+    def test_telnet_message_gmcp(self):
+        assert (
+            TelnetMessage.gmcp("Room.Info", {"num": 1, "exits": {"n": 2}})
+            == b'\xff\xfa\xc9Room.Info {"num":1,"exits":{"n":2}}\xff\xf0'
+        )
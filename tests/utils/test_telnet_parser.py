@@ -0,0 +1,106 @@
+from tests.conftest import TelnetParserFactory
+
+
+class TestTelnetParser(TelnetParserFactory):
+    def test_telnet_parser_feed(self):
+        assert self.parser.feed(b"look north\r\n") == ["look north"]
+        assert not self.parser.buffer
+
+    def test_telnet_parser_feed_length(self):
+        # a receive buffer, with what's left over from an earlier, longer read
+        buffer = bytearray(b"look\r\n\xff\xfb\x1fnorth\r\n")
+
+        assert self.parser.feed(buffer, 6) == ["look"]
+        assert not self.parser.take_negotiations()
+
+    def test_telnet_parser_feed_length_message(self):
+        buffer = bytearray(b"\xff\xfb\x1f\xff\xfa\x1f\x00\x50\xff\xf0")
+
+        self.parser.feed(buffer, 2)
+
+        assert not self.parser.take_negotiations()
+
+        self.parser.feed(buffer[2:], 7)
+
+        assert self.parser.take_negotiations() == [(251, 31)]
+        assert not self.parser.take_subnegotiations()
+
+    def test_telnet_parser_feed_command(self):
+        assert self.parser.feed(b"lo\xff\xf6ok\r\n") == ["look"]
+
+    def test_telnet_parser_feed_option(self):
+        assert self.parser.feed(b"\xff\xfb\x1flook\xff\xfd\xfb\r\n") == ["look"]
+
+    def test_telnet_parser_take_negotiations(self):
+        self.parser.feed(b"\xff\xfb\x1flook\xff\xfdV\r\n")
+
+        assert self.parser.take_negotiations() == [(251, 31), (253, 86)]
+        assert not self.parser.take_negotiations()
+
+    def test_telnet_parser_take_negotiations_split(self):
+        self.parser.feed(b"\xff\xfd")
+        self.parser.feed(b"V")
+
+        assert self.parser.take_negotiations() == [(253, 86)]
+
+    def test_telnet_parser_take_subnegotiations(self):
+        self.parser.feed(b"\xff\xfa\x1f\x00\x78\x00\x18\xff\xf0look\r\n")
+
+        assert self.parser.take_subnegotiations() == [(31, b"\x00\x78\x00\x18")]
+        assert not self.parser.take_subnegotiations()
+
+    def test_telnet_parser_take_subnegotiations_escaped(self):
+        self.parser.feed(b"\xff\xfa\x1f\x00\xff\xff\x00\x18\xff\xf0")
+
+        assert self.parser.take_subnegotiations() == [(31, b"\x00\xff\x00\x18")]
+
+    def test_telnet_parser_take_subnegotiations_split(self):
+        self.parser.feed(b"\xff\xfa\x1f\x00")
+        self.parser.feed(b"\xff\xff\x00")
+        self.parser.feed(b"\x18\xff\xf0")
+
+        assert self.parser.take_subnegotiations() == [(31, b"\x00\xff\x00\x18")]
+
+    def test_telnet_parser_feed_subnegotiation(self):
+        assert self.parser.feed(
+            b"\xff\xfa\x1f\x00\x50\xff\xff\x00\x18\xff\xf0look\r\n"
+        ) == ["look"]
+
+    def test_telnet_parser_feed_subnegotiation_escaped_end(self):
+        assert self.parser.feed(b"\xff\xfa\x1f\xff\xff\xf0\xff\xf0look\r\n") == ["look"]
+
+    def test_telnet_parser_feed_escaped_byte(self):
+        assert self.parser.feed(b"say \xff\xff\r\n") == ["say �"]
+
+    def test_telnet_parser_feed_split_message(self):
+        assert not self.parser.feed(b"look\xff")
+        assert not self.parser.feed(b"\xfb")
+        assert self.parser.feed(b"\x1f north\r\n") == ["look north"]
+
+    def test_telnet_parser_feed_split_subnegotiation(self):
+        assert not self.parser.feed(b"\xff\xfa\x1f\x00")
+        assert not self.parser.feed(b"\x50\xff")
+        assert self.parser.feed(b"\xf0look\r\n") == ["look"]
+
+    def test_telnet_parser_feed_split_line_ending_negotiation(self):
+        assert self.parser.feed(b"look\r") == ["look"]
+        assert not self.parser.feed(b"\xff\xfb\x1f")
+        assert not self.parser.feed(b"\n")
+
+    def test_telnet_parser_feed_split_character(self):
+        assert not self.parser.feed("say café".encode()[:-1])
+        assert self.parser.feed("é!\r\n".encode()[1:]) == ["say café!"]
+
+
+class TestTelnetParserBackspace(TelnetParserFactory):
+    def test_telnet_parser_feed_backspace(self):
+        assert self.parser.feed(b"lookk\x08 north\r\n") == ["look north"]
+
+    def test_telnet_parser_feed_backspace_multibyte(self):
+        assert self.parser.feed("say café\x08e\r\n".encode()) == ["say cafe"]
+
+    def test_telnet_parser_feed_backspace_empty(self):
+        assert self.parser.feed(b"\x08\x08look\r\n") == ["look"]
+
+    def test_telnet_parser_feed_backspace_line_ended(self):
+        assert self.parser.feed(b"look\r\n\x08") == ["look"]
@@ -0,0 +1,57 @@
+from tests.conftest import TickClockFactory
+
+
+class TestTickClock(TickClockFactory):
+    def test_tick_clock_interval(self):
+        assert self.tick_clock.interval == 0.1
+
+    def test_tick_clock_time_until_tick(self):
+        assert self.tick_clock.time_until_tick(now=100.0) == 0.0
+
+        self.tick_clock.take_due(now=100.0)
+
+        assert round(self.tick_clock.time_until_tick(now=100.04), 6) == 0.06
+
+    def test_tick_clock_take_due(self):
+        assert self.tick_clock.take_due(now=100.0) == 1
+        assert self.tick_clock.take_due(now=100.05) == 0
+        assert self.tick_clock.take_due(now=100.1) == 1
+
+        assert self.tick_clock.stats.ticks == 2
+        assert not self.tick_clock.stats.caught_up_ticks
+
+    def test_tick_clock_take_due_no_drift(self):
+        self.tick_clock.take_due(now=100.0)
+
+        # a tick taken late doesn't push back the one after it
+        assert self.tick_clock.take_due(now=100.13) == 1
+        assert round(self.tick_clock.time_until_tick(now=100.13), 6) == 0.07
+        assert round(self.tick_clock.stats.lag, 6) == 0.03
+
+    def test_tick_clock_take_due_catch_up(self):
+        self.tick_clock.take_due(now=100.0)
+
+        assert self.tick_clock.take_due(now=100.25) == 2
+        assert self.tick_clock.stats.caught_up_ticks == 1
+        assert not self.tick_clock.stats.skipped_ticks
+
+    def test_tick_clock_take_due_skipped(self):
+        self.tick_clock.take_due(now=100.0)
+
+        # only so many missed ticks are caught up on, and the rest are skipped
+        assert self.tick_clock.take_due(now=101.05) == 3
+        assert self.tick_clock.stats.caught_up_ticks == 2
+        assert self.tick_clock.stats.skipped_ticks == 7
+        assert round(self.tick_clock.stats.max_lag, 6) == 0.95
+        assert round(self.tick_clock.time_until_tick(now=101.05), 6) == 0.05
+
+    def test_tick_clock_record(self):
+        self.tick_clock.record(0.05)
+        self.tick_clock.record(0.2)
+
+        assert self.tick_clock.stats.overruns == 1
+
+    def test_tick_clock_start(self):
+        self.tick_clock.start()
+
+        assert self.tick_clock.take_due() == 1
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from cibo.utils.timing_wheel import Timer, TimingWheel
+from tests.conftest import TimingWheelFactory
+
+
+class TestTimingWheel(TimingWheelFactory):
+    def _run(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.timing_wheel.tick()
+
+    def _record(self, name: str):
+        return lambda: self.fired.append((name, self.timing_wheel.now))
+
+    def test_timing_wheel_to_ticks(self):
+        assert self.timing_wheel.to_ticks(0.3) == 3
+        assert self.timing_wheel.to_ticks(0.25) == 3
+        assert self.timing_wheel.to_ticks(0) == 1
+
+    def test_timing_wheel_call_later(self):
+        timer = self.timing_wheel.call_later(0.5, self._record("a"))
+
+        assert timer.is_pending
+        assert len(self.timing_wheel) == 1
+
+        self._run(10)
+
+        assert self.fired == [("a", 5)]
+        assert not timer.is_pending
+        assert not self.timing_wheel
+
+    def test_timing_wheel_call_every(self):
+        timer = self.timing_wheel.call_every(0.3, self._record("a"))
+
+        self._run(10)
+
+        assert self.fired == [("a", 3), ("a", 6), ("a", 9)]
+        assert timer.is_pending
+
+    def test_timing_wheel_cancel(self):
+        timer = self.timing_wheel.call_every(0.1, self._record("a"))
+
+        self._run(2)
+        timer.cancel()
+        timer.cancel()
+        self._run(2)
+
+        assert self.fired == [("a", 1), ("a", 2)]
+        assert not self.timing_wheel
+
+    def test_timing_wheel_cancel_from_callback(self):
+        # a callback can cancel another timer that's due on the same tick
+        timer = Timer(self._record("b"), 1)
+
+        self.timing_wheel.call_later(0.1, self._record("a"))
+        self.timing_wheel.call_later(0.1, timer.cancel)
+        self.timing_wheel.add(timer)
+
+        self._run(1)
+
+        assert self.fired == [("a", 1)]
+        assert not self.timing_wheel
+
+    def test_timing_wheel_callback_error(self, caplog):
+        def crash():
+            raise RuntimeError
+
+        self.timing_wheel.call_every(0.1, crash)
+        self.timing_wheel.call_later(0.1, self._record("a"))
+
+        self._run(2)
+
+        # the rest of the slot still runs, and the failing timer is kept
+        assert self.fired == [("a", 1)]
+        assert len(self.timing_wheel) == 1
+        assert "Error running timer" in caplog.text
+
+    def test_timing_wheel_cascade(self):
+        # far enough off to start out in each of the coarser wheels
+        for ticks in [63, 64, 4095, 4096, 300000]:
+            self.timing_wheel.add(Timer(self._record(str(ticks)), ticks))
+
+        self._run(300000)
+
+        assert self.fired == [
+            ("63", 63),
+            ("64", 64),
+            ("4095", 4095),
+            ("4096", 4096),
+            ("300000", 300000),
+        ]
+
+    def test_timing_wheel_beyond_range(self):
+        # with only two wheels, the furthest reach is 4096 ticks ahead
+        with patch.object(TimingWheel, "LEVELS", 2):
+            timing_wheel = TimingWheel()
+            timing_wheel.add(Timer(lambda: self.fired.append(timing_wheel.now), 10000))
+
+            for _ in range(10000):
+                timing_wheel.tick()
+
+        assert self.fired == [10000]
+
+    def test_timing_wheel_add_overdue(self):
+        self._run(5)
+        self.timing_wheel.add(Timer(self._record("a"), 2))
+
+        self._run(1)
+
+        assert self.fired == [("a", 6)]
+
+    def test_timing_wheel_add_again(self):
+        timer = self.timing_wheel.call_later(0.2, self._record("a"))
+
+        timer.expires = 5
+        self.timing_wheel.add(timer)
+
+        self._run(5)
+
+        assert self.fired == [("a", 5)]
+        assert not self.timing_wheel
@@ -0,0 +1,96 @@
+import json
+
+from cibo.utils.tracer import Span
+from tests.conftest import TracerFactory
+
+
+class TestTracer(TracerFactory):
+    def test_tracer_disabled(self):
+        with self.tracer.trace("input", self):
+            with self.tracer.span("query"):
+                pass
+
+        with self.tracer.finish(self, "socket write"):
+            pass
+
+        assert not self.tracer.is_enabled
+
+    def test_tracer_trace(self):
+        self.tracer.start(self.trace_path, sample_rate=1.0)
+        self.tracer.start(self.trace_path, sample_rate=1.0)
+
+        with self.tracer.trace("input", self, command="look"):
+            with self.tracer.span("Look"):
+                with self.tracer.span("query", sql="SELECT 1"):
+                    pass
+
+        # spans outside of a trace aren't recorded
+        with self.tracer.span("render"):
+            pass
+
+        with self.tracer.finish(self, "socket write"):
+            pass
+
+        events = self.read_trace()
+
+        assert [event["name"] for event in events] == [
+            "query",
+            "Look",
+            "socket write",
+            "input",
+        ]
+        assert len({event["tid"] for event in events}) == 1
+        assert events[0]["args"] == {"sql": "SELECT 1"}
+        assert events[3]["args"] == {"command": "look"}
+
+        # the trace runs from the input until its output was written
+        assert events[3]["ts"] <= events[1]["ts"]
+        assert events[3]["dur"] >= events[2]["ts"] - events[3]["ts"]
+
+    def test_tracer_trace_not_sampled(self):
+        self.tracer.start(self.trace_path, sample_rate=0.0)
+
+        with self.tracer.trace("input", self):
+            with self.tracer.span("query"):
+                pass
+
+        assert not self.read_trace()
+
+    def test_tracer_close(self):
+        self.tracer.start(self.trace_path, sample_rate=1.0)
+
+        with self.tracer.trace("input", self):
+            pass
+
+        with self.tracer.trace("input", self):
+            pass
+
+        self.tracer.close(self)
+
+        events = self.read_trace()
+
+        assert [event["name"] for event in events] == ["input", "input"]
+        assert events[0]["tid"] != events[1]["tid"]
+
+    def test_tracer_jsonl(self):
+        self.trace_path = self.trace_path.replace(".json", ".jsonl")
+        self.tracer.start(self.trace_path, sample_rate=1.0)
+
+        with self.tracer.trace("input", self):
+            pass
+
+        self.tracer.close(self)
+        self.tracer.stop()
+
+        with open(self.trace_path, encoding="utf-8") as file:
+            events = [json.loads(line) for line in file]
+
+        assert events[0]["name"] == "input"
+
+    def test_span_to_event(self):
+        event = Span("query", 3, 1.5, {"sql": "SELECT 1"}).to_event(1.75)
+
+        assert event["ph"] == "X"
+        assert event["ts"] == 1_500_000
+        assert event["dur"] == 250_000
+        assert event["tid"] == 3
@@ -0,0 +1,33 @@
+from cibo.utils.websocket_message import WebSocketMessage
+
+
+class TestWebSocketMessage:
+    def test_websocket_message_handshake(self):
+        # the example handshake from RFC 6455
+        handshake = WebSocketMessage.handshake(b"dGhlIHNhbXBsZSBub25jZQ==")
+
+        assert handshake.startswith(b"HTTP/1.1 101 Switching Protocols\r\n")
+        assert b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n" in handshake
+        assert handshake.endswith(b"\r\n\r\n")
+
+    def test_websocket_message_frame(self):
+        frame = WebSocketMessage.frame(WebSocketMessage.OpCode.TEXT, b"Hello!")
+
+        assert frame == b"\x81\x06Hello!"
+
+    def test_websocket_message_frame_medium(self):
+        frame = WebSocketMessage.frame(WebSocketMessage.OpCode.TEXT, b"a" * 200)
+
+        assert frame[:4] == b"\x81\x7e\x00\xc8"
+        assert len(frame) == 204
+
+    def test_websocket_message_frame_large(self):
+        frame = WebSocketMessage.frame(WebSocketMessage.OpCode.BINARY, b"a" * 70000)
+
+        assert frame[:2] == b"\x82\x7f"
+        assert int.from_bytes(frame[2:10], "big") == 70000
+
+    def test_websocket_message_close(self):
+        close = WebSocketMessage.close(WebSocketMessage.CloseCode.GOING_AWAY)
+
+        assert close == b"\x88\x02\x03\xe9"
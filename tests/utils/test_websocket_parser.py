@@ -0,0 +1,135 @@
+from cibo.utils.websocket_message import WebSocketMessage
+from cibo.utils.websocket_parser import WebSocketParser
+from tests.conftest import WebSocketParserFactory
+
+
+class TestWebSocketParser(WebSocketParserFactory):
+    def test_websocket_parser_handshake(self):
+        assert self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE) == b""
+
+        assert self.websocket_parser.is_open
+        assert self.websocket_parser.take_replies() == WebSocketMessage.handshake(
+            b"dGhlIHNhbXBsZSBub25jZQ=="
+        )
+        assert not self.websocket_parser.replies
+
+    def test_websocket_parser_handshake_split(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE[:20])
+
+        assert not self.websocket_parser.is_open
+
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE[20:])
+
+        assert self.websocket_parser.is_open
+
+    def test_websocket_parser_handshake_with_frame(self):
+        text = self.websocket_parser.feed(
+            self.WEBSOCKET_HANDSHAKE + self.create_frame(1, b"look")
+        )
+
+        assert text == b"look\n"
+
+    def test_websocket_parser_handshake_bad_request(self):
+        self.websocket_parser.feed(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+
+        assert self.websocket_parser.is_closed
+        assert not self.websocket_parser.is_open
+        assert self.websocket_parser.take_replies() == WebSocketMessage.BAD_REQUEST
+
+    def test_websocket_parser_handshake_not_get(self):
+        self.websocket_parser.feed(b"look\r\n\r\n")
+
+        assert self.websocket_parser.is_closed
+
+    def test_websocket_parser_handshake_too_long(self):
+        self.websocket_parser.feed(b"GET / HTTP/1.1\r\n" + b"a" * 8192)
+
+        assert self.websocket_parser.is_closed
+
+    def test_websocket_parser_feed_text(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+
+        text = self.websocket_parser.feed(
+            self.create_frame(1, b"north") + self.create_frame(1, b"look\r\n")
+        )
+
+        assert text == b"north\nlook\r\n"
+
+    def test_websocket_parser_feed_split(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+        frame = self.create_frame(1, b"look")
+
+        assert self.websocket_parser.feed(frame[:1]) == b""
+        assert self.websocket_parser.feed(frame[1:5]) == b""
+        assert self.websocket_parser.feed(frame[5:]) == b"look\n"
+
+    def test_websocket_parser_feed_fragmented(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+
+        text = self.websocket_parser.feed(
+            self.create_frame(1, b"lo", final=False)
+            + self.create_frame(9, b"")
+            + self.create_frame(0, b"ok")
+        )
+
+        assert text == b"look\n"
+
+    def test_websocket_parser_unfinished_message(self):
+        self.websocket_parser.feed(
+            self.WEBSOCKET_HANDSHAKE + self.create_frame(1, b"lo", final=False)
+        )
+
+        assert self.websocket_parser.unfinished_message == (b"lo", True)
+
+        websocket_parser = WebSocketParser()
+        websocket_parser.is_open = True
+        websocket_parser.unfinished_message = self.websocket_parser.unfinished_message
+
+        assert websocket_parser.feed(self.create_frame(0, b"ok")) == b"look\n"
+
+    def test_websocket_parser_feed_binary(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+
+        assert self.websocket_parser.feed(self.create_frame(2, b"\xff\x00")) == b""
+
+    def test_websocket_parser_feed_ping(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+        self.websocket_parser.take_replies()
+
+        self.websocket_parser.feed(self.create_frame(9, b"hi"))
+
+        assert self.websocket_parser.take_replies() == b"\x8a\x02hi"
+
+    def test_websocket_parser_feed_close(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+        self.websocket_parser.take_replies()
+
+        self.websocket_parser.feed(
+            self.create_frame(8, b"\x03\xe8") + self.create_frame(1, b"look")
+        )
+
+        assert self.websocket_parser.is_closed
+        assert self.websocket_parser.take_replies() == b"\x88\x02\x03\xe8"
+        assert self.websocket_parser.feed(self.create_frame(1, b"look")) == b""
+
+    def test_websocket_parser_feed_unmasked(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+        self.websocket_parser.take_replies()
+
+        self.websocket_parser.feed(b"\x81\x04look")
+
+        assert self.websocket_parser.is_closed
+        assert self.websocket_parser.take_replies() == WebSocketMessage.close(
+            WebSocketMessage.CloseCode.PROTOCOL_ERROR
+        )
+
+    def test_websocket_parser_feed_too_big(self):
+        self.websocket_parser.feed(self.WEBSOCKET_HANDSHAKE)
+        self.websocket_parser.take_replies()
+
+        self.websocket_parser.feed(self.create_frame(1, b"a" * 65))
+
+        assert self.websocket_parser.is_closed
+        assert self.websocket_parser.take_replies() == WebSocketMessage.close(
+            WebSocketMessage.CloseCode.MESSAGE_TOO_BIG
+        )